@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# Compares queries/sec of the thread and async resolution engines in sub
+# mode against a local stub DNS server.
+#
+#   python3 benchmarks/bench_dns.py --words 5000 --latency 0.02
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reconhound import ReconHound
+from mock_dns import MockDNSServer
+
+def run_engine(server, wordlist, engine, threads, concurrency):
+    hound = ReconHound()
+    hound.engine = engine
+    hound.concurrency = concurrency
+    hound.nameservers = [server.nameserver]
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        hound.run_subdomain_buster('bench.test', wordlist, threads)
+    return time.perf_counter() - start, len(hound.found_subdomains)
+
+def main():
+    parser = argparse.ArgumentParser(description="ReconHound DNS engine benchmark")
+    parser.add_argument('--words', type=int, default=5000, help="Number of names to resolve (default: 5000)")
+    parser.add_argument('--latency', type=float, default=0.02, help="Simulated resolver latency in seconds (default: 0.02)")
+    parser.add_argument('-t', '--threads', type=int, default=10, help="Threads for the thread engine (default: 10)")
+    parser.add_argument('-c', '--concurrency', type=int, default=1000, help="In-flight limit for the async engine (default: 1000)")
+    args = parser.parse_args()
+
+    words = [f"host{i}" for i in range(args.words)]
+    records = {f"{word}.bench.test": ['10.0.0.1'] for word in words[::100]}
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        f.write('\n'.join(words))
+        wordlist = f.name
+
+    try:
+        with MockDNSServer(records=records, latency=args.latency) as server:
+            print(f"{'engine':<8} {'seconds':>9} {'queries/s':>10} {'found':>7}")
+            for engine in ('thread', 'async'):
+                elapsed, found = run_engine(server, wordlist, engine, args.threads, args.concurrency)
+                print(f"{engine:<8} {elapsed:>9.2f} {args.words / elapsed:>10.0f} {found:>7}")
+    finally:
+        os.unlink(wordlist)
+
+if __name__ == '__main__':
+    main()
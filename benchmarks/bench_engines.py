@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# Compares requests/sec of the thread and async engines in dir mode
+# against a local stand-in HTTP server.
+#
+#   python3 benchmarks/bench_engines.py --words 5000 --latency 0.02
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reconhound import ReconHound
+from mock_http import MockHTTPServer
+
+def run_engine(url, wordlist, engine, threads, concurrency):
+    hound = ReconHound()
+    hound.engine = engine
+    hound.concurrency = concurrency
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        hound.run_directory_buster(url, wordlist, None, threads)
+    return time.perf_counter() - start, len(hound.found_paths)
+
+def main():
+    parser = argparse.ArgumentParser(description="ReconHound engine benchmark")
+    parser.add_argument('--words', type=int, default=5000, help="Number of words to request (default: 5000)")
+    parser.add_argument('--latency', type=float, default=0.02, help="Simulated server latency in seconds (default: 0.02)")
+    parser.add_argument('-t', '--threads', type=int, default=10, help="Threads for the thread engine (default: 10)")
+    parser.add_argument('-c', '--concurrency', type=int, default=500, help="In-flight limit for the async engine (default: 500)")
+    args = parser.parse_args()
+
+    words = [f"word{i}" for i in range(args.words)]
+    hits = words[::100]
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        f.write('\n'.join(words))
+        wordlist = f.name
+
+    try:
+        with MockHTTPServer(latency=args.latency, hits=hits) as server:
+            print(f"{'engine':<8} {'seconds':>9} {'req/s':>10} {'found':>7}")
+            for engine in ('thread', 'async'):
+                elapsed, found = run_engine(server.url, wordlist, engine, args.threads, args.concurrency)
+                print(f"{engine:<8} {elapsed:>9.2f} {args.words / elapsed:>10.0f} {found:>7}")
+    finally:
+        os.unlink(wordlist)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# Measures the CPU time ReconHound spends per request on its own side of the
+# wire: building the probes of a word (URL, headers, body) in each HTTP mode,
+# and the whole client path of a thread-engine scan against a local
+# zero-latency server running in another process. Run it on two checkouts to
+# compare them.
+#
+#   python3 benchmarks/bench_overhead.py --words 20000
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mock_http import MockHTTPServer
+
+# name: (mode, target, extra hound settings)
+BUILDS = {
+    'dir': ('dir', 'http://127.0.0.1:8080/app/', {}),
+    'dir+ext': ('dir', 'http://127.0.0.1:8080/app/', {'extensions': ['.php', '.bak', '.txt']}),
+    'fuzz': ('fuzz', 'http://127.0.0.1:8080/search.php?q=FUZZ&page=1', {'param': 'q'}),
+    'fuzzany': ('fuzzany', 'http://127.0.0.1:8080/api/FUZZ/profile?view=FUZZ', {}),
+    'fuzzany+post': ('fuzzany', 'http://127.0.0.1:8080/login', {
+        'data': 'user=admin&password=FUZZ',
+        'headers': [('X-Attempt', 'FUZZ'), ('Content-Type', 'application/x-www-form-urlencoded')]}),
+    'vhost': ('vhost', 'example.test @ 127.0.0.1', {'base_domain': 'example.test', 'ip_address': '127.0.0.1'}),
+}
+
+def measure_builds(words, repeat):
+    # CPU microseconds per probe returned by build_probes, best of `repeat` runs
+    import reconhound
+
+    results = {}
+    for name, (mode, target, settings) in BUILDS.items():
+        hound = reconhound.ReconHound()
+        hound.current_mode = mode
+        hound.target = target
+        for key, value in settings.items():
+            setattr(hound, key, value)
+        best = None
+        for _ in range(repeat):
+            probes = 0
+            start = time.process_time()
+            for word in words:
+                probes += len(hound.build_probes(word))
+            elapsed = time.process_time() - start
+            best = elapsed / probes if best is None else min(best, elapsed / probes)
+        results[name] = best * 1e6
+    return results
+
+def run_scan(url, wordlist, threads, results):
+    # Child process: one dir scan with three extensions; only this process's CPU is counted
+    import reconhound
+
+    hound = reconhound.ReconHound()
+    hound.http = reconhound.HTTPSessionPool(threads)
+    hound.rate = reconhound.RateController(threads)
+    hound.calibration = False
+    start, cpu = time.perf_counter(), time.process_time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        hound.run_directory_buster(url, wordlist, '.php,.bak,.txt', threads)
+    elapsed, cpu = time.perf_counter() - start, time.process_time() - cpu
+    requests = hound.http.stats.counts['requests']
+    results.put({'requests': requests, 'seconds': elapsed, 'cpu_us': cpu / requests * 1e6})
+
+def measure_scan(url, wordlist, threads):
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=run_scan, args=(url, wordlist, threads, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+def serve(words, ready, stop):
+    server = MockHTTPServer(hits=words[::100]).start()
+    ready.put(server.url)
+    stop.wait()
+    server.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="ReconHound per-request CPU overhead benchmark")
+    parser.add_argument('--words', type=int, default=20000, help="Words per measurement (default: 20000)")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs of each probe-building measurement; the best counts (default: 5)")
+    parser.add_argument('-t', '--threads', type=int, default=20, help="Threads for the scan measurement (default: 20)")
+    parser.add_argument('--no-scan', action='store_true', help="Only measure probe building")
+    args = parser.parse_args()
+
+    words = [f"word{i}" for i in range(args.words)]
+    print(f"{'probe building':<16} {'CPU us/probe':>13}")
+    for name, micros in measure_builds(words, args.repeat).items():
+        print(f"{name:<16} {micros:>13.2f}")
+    if args.no_scan:
+        return
+
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        f.write('\n'.join(words))
+        wordlist = f.name
+    # The server gets its own process so its CPU is not counted against the scan
+    context = multiprocessing.get_context('spawn')
+    ready = context.Queue()
+    stop = context.Event()
+    server = context.Process(target=serve, args=(words, ready, stop), daemon=True)
+    server.start()
+    try:
+        result = measure_scan(ready.get(), wordlist, args.threads)
+    finally:
+        stop.set()
+        server.join(timeout=5)
+        os.unlink(wordlist)
+    print(f"\ndir scan, 3 extensions: {result['requests']} requests in {result['seconds']:.2f}s "
+          f"({result['requests'] / result['seconds']:.0f} req/s), {result['cpu_us']:.1f} CPU us/request")
+
+if __name__ == '__main__':
+    main()
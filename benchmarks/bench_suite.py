@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# Runs every scan mode with both engines against local stand-in HTTP and DNS
+# servers and reports requests/sec, p50/p99 request latency, peak RSS and
+# time to first result. Each scan runs in a fresh interpreter so its peak RSS
+# is its own; the servers stay in this process.
+#
+#   python3 benchmarks/bench_suite.py --words 5000 --latency 0.01 -o results.json
+#   python3 benchmarks/bench_suite.py --baseline results.json   # exit 1 on a regression
+
+import argparse
+import contextlib
+import functools
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mock_dns import MockDNSServer
+from mock_http import MockHTTPServer
+
+MODES = ('dir', 'sub', 'fuzz', 'fuzzany', 'vhost')
+ENGINES = ('thread', 'async')
+DOMAIN = 'bench.test'
+
+class Recorder:
+    """Times the request and lookup calls of one scan and notes its first finding."""
+
+    def __init__(self):
+        self.latencies = []
+        self.first_result = None
+        self.start = None
+        self.lock = threading.Lock()
+
+    def timed(self, function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.latencies.append(time.perf_counter() - start)
+        return wrapper
+
+    def timed_async(self, function):
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await function(*args, **kwargs)
+            finally:
+                self.latencies.append(time.perf_counter() - start)
+        return wrapper
+
+    def found(self, function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with self.lock:
+                if self.first_result is None:
+                    self.first_result = time.perf_counter() - self.start
+            return function(*args, **kwargs)
+        return wrapper
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+def run_scenario(mode, engine, scan, results):
+    # Child process: instruments ReconHound's request paths, runs one scan and
+    # reports its numbers back through `results`
+    import reconhound
+
+    recorder = Recorder()
+    reconhound.ReconHound.send = recorder.timed(reconhound.ReconHound.send)
+    reconhound.ReconHound.query_dns = recorder.timed(reconhound.ReconHound.query_dns)
+    reconhound.AsyncHTTPEngine.fetch = recorder.timed_async(reconhound.AsyncHTTPEngine.fetch)
+    reconhound.AsyncDNSResolver.query = recorder.timed_async(reconhound.AsyncDNSResolver.query)
+    reconhound.ReconHound.record = recorder.found(reconhound.ReconHound.record)
+
+    hound = reconhound.ReconHound()
+    hound.engine = engine
+    hound.concurrency = scan['concurrency']
+    hound.http = reconhound.HTTPSessionPool(scan['threads'])
+    hound.rate = reconhound.RateController(scan['concurrency'] if engine == 'async' else scan['threads'])
+    hound.calibration = scan['calibrate']
+    url, wordlist, threads = scan['url'], scan['wordlist'], scan['threads']
+    recorder.start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == 'dir':
+            hound.run_directory_buster(url, wordlist, None, threads)
+        elif mode == 'sub':
+            hound.nameservers = [tuple(scan['nameserver'])]
+            hound.run_subdomain_buster(DOMAIN, wordlist, threads)
+        elif mode == 'fuzz':
+            hound.run_fuzzer(f"{url}/search?q=FUZZ", 'q', wordlist, threads)
+        elif mode == 'fuzzany':
+            hound.run_fuzzer_anywhere(f"{url}/api/FUZZ/profile", wordlist, threads)
+        elif mode == 'vhost':
+            hound.run_vhost_buster(url.split('://', 1)[1], DOMAIN, wordlist, threads)
+    elapsed = time.perf_counter() - recorder.start
+    latencies = recorder.latencies
+    found = hound.found_subdomains if mode == 'sub' else hound.found_vhosts if mode == 'vhost' else hound.found_paths
+    results.put({
+        'mode': mode,
+        'engine': engine,
+        'requests': len(latencies),
+        'seconds': round(elapsed, 3),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                             / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1),
+        'first_result_s': None if recorder.first_result is None else round(recorder.first_result, 3),
+        'found': len(found),
+    })
+
+def run_isolated(mode, engine, scan):
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=run_scenario, args=(mode, engine, scan, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+def parse_statuses(spec):
+    # "404:90,403:5,500:5" -> {404: 90, 403: 5, 500: 5}
+    statuses = {}
+    for part in spec.split(','):
+        status, _, weight = part.partition(':')
+        statuses[int(status)] = int(weight or 1)
+    return statuses
+
+def parse_size(spec):
+    # "512" or "200-4000"
+    low, _, high = spec.partition('-')
+    return (int(low), int(high or low))
+
+def regressions(results, baseline, tolerance):
+    # Scenarios whose requests/sec fell more than `tolerance` below the baseline run
+    previous = {(entry['mode'], entry['engine']): entry for entry in baseline['results']}
+    slower = []
+    for entry in results:
+        before = previous.get((entry['mode'], entry['engine']))
+        if before and entry['rps'] < before['rps'] * (1 - tolerance):
+            slower.append(f"{entry['mode']}/{entry['engine']}: {before['rps']:.0f} -> {entry['rps']:.0f} req/s")
+    return slower
+
+def main():
+    parser = argparse.ArgumentParser(description="ReconHound benchmark suite")
+    parser.add_argument('--words', type=int, default=5000, help="Words per scan (default: 5000)")
+    parser.add_argument('--latency', type=float, default=0.01, help="Simulated HTTP and DNS latency in seconds (default: 0.01)")
+    parser.add_argument('--modes', default=','.join(MODES), help=f"Comma-separated modes to run (default: {','.join(MODES)})")
+    parser.add_argument('--engines', default=','.join(ENGINES), help="Comma-separated engines to run (default: thread,async)")
+    parser.add_argument('-t', '--threads', type=int, default=20, help="Threads for the thread engine (default: 20)")
+    parser.add_argument('-c', '--concurrency', type=int, default=200, help="In-flight limit for the async engine (default: 200)")
+    parser.add_argument('--hit-every', type=int, default=100, help="Every Nth word exists (default: 100)")
+    parser.add_argument('--statuses', type=parse_statuses, default={404: 1}, help="Status mix for misses, e.g. 404:90,403:5,500:5 (default: 404)")
+    parser.add_argument('--body-size', type=parse_size, default=None, help="Miss body size in bytes, e.g. 512 or 200-4000 (default: 9)")
+    parser.add_argument('--wildcard', action='store_true', help="Answer misses with 200 soft-404 pages and a DNS wildcard")
+    parser.add_argument('--no-calibrate', action='store_true', help="Skip ReconHound's soft-404 calibration")
+    parser.add_argument('-o', '--output', help="Write the results as JSON to this file")
+    parser.add_argument('--baseline', help="JSON from an earlier run; exit 1 if any scenario got slower")
+    parser.add_argument('--tolerance', type=float, default=0.1, help="Allowed req/s drop against --baseline (default: 0.1)")
+    args = parser.parse_args()
+
+    words = [f"word{i}" for i in range(args.words)]
+    hits = words[::args.hit_every]
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        f.write('\n'.join(words))
+        wordlist = f.name
+
+    records = {f"{word}.{DOMAIN}": ['10.0.0.1'] for word in hits}
+    http = MockHTTPServer(latency=args.latency, hits=hits, statuses=args.statuses,
+                          body_size=args.body_size, wildcard=args.wildcard)
+    dns = MockDNSServer(records=records, latency=args.latency,
+                        wildcard=['10.9.9.9'] if args.wildcard else None)
+    config = {key: value for key, value in vars(args).items() if key not in ('output', 'baseline')}
+    config['statuses'] = {str(status): weight for status, weight in args.statuses.items()}
+    config['body_size'] = list(args.body_size) if args.body_size else None
+    config['python'] = platform.python_version()
+    config['cpus'] = os.cpu_count()
+    results = []
+    try:
+        with http, dns:
+            scan = {'url': http.url, 'nameserver': dns.nameserver, 'wordlist': wordlist,
+                    'threads': args.threads, 'concurrency': args.concurrency,
+                    'calibrate': not args.no_calibrate}
+            print(f"{'mode':<8} {'engine':<7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} "
+                  f"{'RSS MB':>7} {'first s':>8} {'found':>6}")
+            for mode in args.modes.split(','):
+                for engine in args.engines.split(','):
+                    entry = run_isolated(mode, engine, scan)
+                    results.append(entry)
+                    print(f"{mode:<8} {engine:<7} {entry['rps']:>9.0f} {entry['p50_ms'] or 0:>8.2f} "
+                          f"{entry['p99_ms'] or 0:>8.2f} {entry['peak_rss_mb']:>7.1f} "
+                          f"{entry['first_result_s'] if entry['first_result_s'] is not None else '-':>8} "
+                          f"{entry['found']:>6}")
+    finally:
+        os.unlink(wordlist)
+
+    report = {'config': config, 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        changed = sorted(key for key in ('words', 'latency', 'threads', 'concurrency', 'hit_every', 'statuses',
+                                         'body_size', 'wildcard', 'no_calibrate', 'cpus')
+                         if baseline['config'].get(key) != config.get(key))
+        if changed:
+            print(f"[!] Baseline was run with different settings: {', '.join(changed)}")
+        slower = regressions(results, baseline, args.tolerance)
+        for line in slower:
+            print(f"[!] Regression: {line}")
+        sys.exit(1 if slower else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# Measures peak memory and time-to-first-request of the streaming wordlist
+# reader against the old read-everything-then-submit-everything approach, and
+# against a list made with `reconhound wordlist compile`. Each variant runs in
+# its own interpreter so peak RSS is not shared.
+#
+#   python3 benchmarks/bench_wordlist.py --lines 3000000
+
+import argparse
+import concurrent.futures
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def legacy_run(hound, wordlist, worker):
+    with open(wordlist, 'r', encoding='utf-8') as f:
+        words = [line.strip() for line in f if line.strip()]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=hound.threads) as executor:
+        for word in words:
+            executor.submit(worker, word)
+
+def streaming_run(hound, wordlist, worker):
+    hound.run_workers(worker, ([(word,)] for word in hound.read_wordlist(wordlist)))
+
+def read_all(variant, wordlist):
+    # Time to produce every word, without handing them to workers
+    from reconhound import ReconHound
+    start = time.perf_counter()
+    if variant == 'legacy':
+        # Read into a list first, then hand the words out from it, as legacy_run does
+        with open(wordlist, 'r', encoding='utf-8') as f:
+            words = [line.strip() for line in f if line.strip()]
+        for _ in words:
+            pass
+    else:
+        for _ in ReconHound().read_wordlist(wordlist):
+            pass
+    return time.perf_counter() - start
+
+def measure(variant, wordlist):
+    from reconhound import ReconHound
+    hound = ReconHound()
+    first = []
+    def worker(word):
+        if not first:
+            first.append(time.perf_counter())
+    start = time.perf_counter()
+    (legacy_run if variant == 'legacy' else streaming_run)(hound, wordlist, worker)
+    total = time.perf_counter() - start
+    # Peak RSS is taken before read_all(), so it is the scan's alone
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {
+        'variant': variant,
+        'time_to_first_request': first[0] - start,
+        'total_seconds': total,
+        'read_seconds': read_all(variant, wordlist),
+        'peak_rss_mb': peak_rss,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="ReconHound wordlist streaming benchmark")
+    parser.add_argument('--lines', type=int, default=3000000, help="Lines in the synthetic wordlist (default: 3000000)")
+    parser.add_argument('--variant', choices=['legacy', 'streaming', 'compiled'], help=argparse.SUPPRESS)
+    parser.add_argument('--wordlist', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(measure(args.variant, args.wordlist)))
+        return
+
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        for i in range(args.lines):
+            f.write(f"synthetic-word-{i}\n")
+        wordlist = f.name
+    compiled = wordlist + '.compiled'
+
+    try:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(ROOT, 'reconhound.py'), 'wordlist', 'compile', wordlist,
+                        '-o', compiled], check=True, capture_output=True)
+        print(f"compiled in {time.perf_counter() - start:.2f}s\n")
+        print(f"{'variant':<10} {'first req (s)':>14} {'total (s)':>10} {'read (s)':>9} {'peak RSS (MB)':>14}")
+        for variant in ('legacy', 'streaming', 'compiled'):
+            path = compiled if variant == 'compiled' else wordlist
+            out = subprocess.run([sys.executable, __file__, '--variant', variant, '--wordlist', path],
+                                 check=True, capture_output=True, text=True).stdout
+            result = json.loads(out)
+            print(f"{variant:<10} {result['time_to_first_request']:>14.3f} "
+                  f"{result['total_seconds']:>10.2f} {result['read_seconds']:>9.2f} {result['peak_rss_mb']:>14.1f}")
+    finally:
+        os.unlink(wordlist)
+        if os.path.exists(compiled):
+            os.unlink(compiled)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# Measures how dir-mode requests/sec scale with --workers against a local
+# stand-in HTTP server. The server itself runs as several processes sharing
+# one port (SO_REUSEPORT, Linux) so it is not the bottleneck.
+#
+#   python3 benchmarks/bench_workers.py --words 20000 --max-workers 8
+
+import argparse
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from mock_http import MockHTTPServer
+
+def serve(port, latency, hits, ready, stop):
+    server = MockHTTPServer(port=port, latency=latency, hits=hits, reuse_port=True).start()
+    ready.put(server.port)
+    stop.wait()
+    server.stop()
+
+def run_scan(url, wordlist, workers, engine, threads, concurrency):
+    command = [sys.executable, os.path.join(ROOT, 'reconhound.py'), 'dir', '-u', url, '-w', wordlist,
+               '--engine', engine, '-t', str(threads), '-c', str(concurrency),
+               '--workers', str(workers), '--no-calibrate']
+    start = time.perf_counter()
+    output = subprocess.run(command, capture_output=True, text=True).stdout
+    return time.perf_counter() - start, output.count('[+] Found:')
+
+def main():
+    parser = argparse.ArgumentParser(description="ReconHound multi-process scaling benchmark")
+    parser.add_argument('--words', type=int, default=20000, help="Number of words to request (default: 20000)")
+    parser.add_argument('--latency', type=float, default=0.005, help="Simulated server latency in seconds (default: 0.005)")
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count(), help="Largest --workers value to try (default: CPU count)")
+    parser.add_argument('--server-procs', type=int, default=os.cpu_count(), help="Mock server processes (default: CPU count)")
+    parser.add_argument('--engine', choices=['thread', 'async'], default='thread', help="Engine used by every worker (default: thread)")
+    parser.add_argument('-t', '--threads', type=int, default=20, help="Threads per worker for the thread engine (default: 20)")
+    parser.add_argument('-c', '--concurrency', type=int, default=200, help="In-flight limit per worker for the async engine (default: 200)")
+    args = parser.parse_args()
+
+    words = [f"word{i}" for i in range(args.words)]
+    hits = words[::100]
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        f.write('\n'.join(words))
+        wordlist = f.name
+
+    context = multiprocessing.get_context('fork')
+    ready = context.Queue()
+    stop = context.Event()
+    servers = [context.Process(target=serve, args=(0, args.latency, hits, ready, stop), daemon=True)]
+    servers[0].start()
+    port = ready.get()
+    for _ in range(args.server_procs - 1):
+        servers.append(context.Process(target=serve, args=(port, args.latency, hits, ready, stop), daemon=True))
+        servers[-1].start()
+        ready.get()
+
+    counts = sorted({1, args.max_workers} | {2 ** i for i in range(1, args.max_workers.bit_length()) if 2 ** i < args.max_workers})
+    try:
+        print(f"{'workers':>7} {'seconds':>9} {'req/s':>10} {'speedup':>8} {'found':>7}")
+        baseline = None
+        for workers in counts:
+            elapsed, found = run_scan(f"http://127.0.0.1:{port}", wordlist, workers, args.engine,
+                                      args.threads, args.concurrency)
+            rps = args.words / elapsed
+            baseline = baseline or rps
+            print(f"{workers:>7} {elapsed:>9.2f} {rps:>10.0f} {rps / baseline:>7.2f}x {found:>7}")
+    finally:
+        stop.set()
+        for server in servers:
+            server.join(timeout=5)
+        os.unlink(wordlist)
+
+if __name__ == '__main__':
+    main()
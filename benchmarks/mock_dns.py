@@ -0,0 +1,125 @@
+# Local stub DNS server used by the ReconHound benchmarks.
+# Answers A/AAAA/CNAME queries over UDP from a fixed record table on a
+# background asyncio thread, with optional latency and a wildcard that can
+# point at a CNAME or rotate through a pool of addresses.
+
+import asyncio
+import ipaddress
+import random
+import socket
+import threading
+
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import dns.rrset
+
+class MockDNSServer:
+    def __init__(self, host='127.0.0.1', port=0, records=None, wildcard=None, latency=0.0,
+                 cnames=None, wildcard_cname=None, rotate=False):
+        self.host = host
+        self.port = port
+        self.records = {name.rstrip('.').lower(): ips for name, ips in (records or {}).items()}
+        self.cnames = {name.rstrip('.').lower(): target for name, target in (cnames or {}).items()}
+        self.wildcard = wildcard
+        self.wildcard_cname = wildcard_cname
+        self.rotate = rotate  # answer each wildcard query with one random address of the pool
+        self.latency = latency
+        self.queries = 0
+        self._loop = None
+        self._transport = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def nameserver(self):
+        return (self.host, self.port)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._transport.close)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _serve(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._transport, _ = self._loop.run_until_complete(self._loop.create_datagram_endpoint(
+            lambda: _DNSProtocol(self), local_addr=(self.host, self.port)))
+        self.port = self._transport.get_extra_info('sockname')[1]
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    def answer(self, name, rdtype):
+        # Returns (rcode, [addresses]) for one name, without following CNAMEs;
+        # override for custom behaviour
+        ips = self.records.get(name)
+        if ips is None and self.wildcard and name not in self.cnames:
+            ips = [random.choice(self.wildcard)] if self.rotate else self.wildcard
+        if ips is None:
+            return dns.rcode.NXDOMAIN, []
+        version = 4 if rdtype == dns.rdatatype.A else 6 if rdtype == dns.rdatatype.AAAA else None
+        return dns.rcode.NOERROR, [ip for ip in ips if ipaddress.ip_address(ip).version == version]
+
+    def cname(self, name):
+        target = self.cnames.get(name)
+        if target is None and self.wildcard_cname and name not in self.records:
+            target = self.wildcard_cname
+        return target
+
+    def build_response(self, wire):
+        query = dns.message.from_wire(wire)
+        response = dns.message.make_response(query)
+        question = query.question[0]
+        name = question.name.to_text().rstrip('.').lower()
+        # Follow CNAMEs the way a recursive resolver would, putting the chain in the answer
+        for _ in range(8):
+            target = self.cname(name)
+            if target is None:
+                break
+            response.answer.append(dns.rrset.from_text(name + '.', 60, 'IN', 'CNAME', target + '.'))
+            if question.rdtype == dns.rdatatype.CNAME:
+                return response.to_wire()
+            name = target
+        rcode, ips = self.answer(name, question.rdtype)
+        response.set_rcode(rcode)
+        if ips:
+            rdtype = dns.rdatatype.to_text(question.rdtype)
+            response.answer.append(dns.rrset.from_text(name + '.', 60, 'IN', rdtype, *ips))
+        return response.to_wire()
+
+class _DNSProtocol(asyncio.DatagramProtocol):
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        sock = transport.get_extra_info('socket')
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+
+    def datagram_received(self, data, addr):
+        self.server.queries += 1
+        try:
+            reply = self.server.build_response(data)
+        except Exception:
+            return
+        if self.server.latency:
+            asyncio.get_running_loop().call_later(self.server.latency, self.transport.sendto, reply, addr)
+        else:
+            self.transport.sendto(reply, addr)
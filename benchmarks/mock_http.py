@@ -0,0 +1,141 @@
+# Local stand-in HTTP server used by the ReconHound benchmarks.
+# Runs an asyncio HTTP/1.1 keep-alive server on a background thread so
+# both the thread and async engines can be pointed at it. Misses can be
+# given a mix of status codes, body sizes, or wildcard (soft-404) answers.
+
+import asyncio
+import threading
+import zlib
+from urllib.parse import parse_qsl, urlsplit
+
+class MockHTTPServer:
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, hits=None, body=b'not found', reuse_port=False,
+                 statuses=None, body_size=None, wildcard=False):
+        self.host = host
+        self.port = port
+        self.reuse_port = reuse_port  # lets several server processes share one port (Linux)
+        self.latency = latency
+        self.hits = set(hits or [])
+        self.body = body
+        # Misses are answered with a status drawn from {status: weight}, padded to
+        # body_size bytes (an int or a (low, high) range) or, with wildcard, with a
+        # 200 page that echoes the path. Choices hash the path, so reruns match.
+        self.statuses = sorted((statuses or {404: 1}).items())
+        self.body_size = body_size
+        self.wildcard = wildcard
+        self.requests = 0
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        if self._loop:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout=5)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+
+    async def _shutdown(self):
+        self._server.close()
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _serve(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, self.port, backlog=4096,
+                                 reuse_port=self.reuse_port or None))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            self._loop.close()
+
+    def respond(self, method, path, headers):
+        # Returns (status, body) or (status, body, extra_headers) for one request;
+        # override for custom behaviour
+        if self.is_hit(path, headers):
+            return 200, b'found'
+        return self.miss(path)
+
+    def is_hit(self, path, headers):
+        # A request hits when its path, a path segment, a query value or the first
+        # label of its Host header is one of the hit words
+        if path.lstrip('/') in self.hits:
+            return True
+        parts = urlsplit(path)
+        words = parts.path.split('/') + [value for _, value in parse_qsl(parts.query)]
+        words.append(headers.get('host', '').split('.')[0])
+        return any(word in self.hits for word in words)
+
+    def miss(self, path):
+        digest = zlib.crc32(path.encode('latin-1'))
+        if self.wildcard:
+            status, body = 200, f"<html><body>Nothing at {path} yet</body></html>".encode('latin-1')
+        else:
+            point = digest % sum(weight for _, weight in self.statuses)
+            for status, weight in self.statuses:
+                if point < weight:
+                    break
+                point -= weight
+            body = self.body
+        if self.body_size:
+            low, high = self.body_size if isinstance(self.body_size, tuple) else (self.body_size,) * 2
+            size = low + (digest >> 8) % (high - low + 1)
+            body = (body + b' ' * size)[:max(size, len(body))]
+        return status, body
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0) or 0)
+                if length:
+                    await reader.readexactly(length)
+                self.requests += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                status, body, *extra = self.respond(method, path, headers)
+                close = headers.get('connection', '').lower() == 'close'
+                extra_headers = ''.join(f"{name}: {value}\r\n" for name, value in (extra[0] if extra else {}).items())
+                head = (f"HTTP/1.1 {status} X\r\nContent-Length: {len(body)}\r\n{extra_headers}"
+                        f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n")
+                writer.write(head.encode('latin-1') + (b'' if method == 'HEAD' else body))
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
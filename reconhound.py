@@ -5,16 +5,2473 @@
 # GitHub: https://github.com/s-r-e-e-r-a-j
 
 import argparse
+import array
+import asyncio
+import bisect
+import cProfile
+import collections
+import csv
+import io
 import requests
 import concurrent.futures
+import contextlib
+import contextvars
+import copy
+import hashlib
+import heapq
+import hmac
+import itertools
 import random
+import re
+import secrets
+import string
 import sys
+import tempfile
 import time
-import hashlib
 import json
+import math
+import mmap
+import multiprocessing
+import os
+import pstats
+import queue
+import shutil
 import signal
-from urllib.parse import urlparse
+import socket
+import ssl
+import struct
+import threading
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, urljoin, urlparse
 import dns.resolver
+import dns.asyncquery
+import dns.exception
+import dns.flags
+import dns.message
+import dns.nameserver
+import dns.rcode
+import dns.rdatatype
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+STATUS_CODES = [200, 204, 301, 302, 307, 401, 403]
+THROTTLE_CODES = (429, 503)
+REQUEST_METHODS = ('get', 'head', 'partial')
+DNS_TYPES = ('A', 'AAAA', 'CNAME')
+
+# What a probe came back with; size is Content-Length when the body was not (fully) read
+ProbeResult = collections.namedtuple('ProbeResult', 'status content size location')
+
+def content_length(headers):
+    try:
+        return int(headers.get('Content-Length'))
+    except (TypeError, ValueError):
+        return None
+current_word = contextvars.ContextVar('current_word', default=None)  # wordlist index being scanned
+RESULT_KEYS = {'dir': 'paths', 'fuzz': 'paths', 'fuzzany': 'paths', 'sub': 'subdomains', 'vhost': 'vhosts'}
+
+class CompiledWordlist:
+    """A wordlist written by `reconhound wordlist compile`, memory-mapped for scanning.
+
+    The file holds the normalized, de-duplicated words back to back, each ending in
+    a newline, followed by an index of count + 1 little-endian uint64 offsets of where
+    each word starts (relative to the data) and where the last one ends. Opening it
+    costs the same whatever its size, any run of words can be sliced out by number
+    (--workers shards, --resume), and words are decoded a block at a time straight
+    from the mapped pages instead of being read, decoded and stripped line by line.
+    Positions (seek, tell, the offsets iter_entries yields) are word numbers.
+    """
+
+    MAGIC = b'RHWLIST1'
+    HEADER = struct.Struct('<8sQQQ')  # magic, word count, data offset, index offset
+    BLOCK = 4096  # words decoded per slice of the map
+
+    def __init__(self, f):
+        self.file = f
+        self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+        try:
+            magic, self.count, self.data, index = self.HEADER.unpack_from(self.map)
+            if magic != self.MAGIC or index + 8 * (self.count + 1) > len(self.map):
+                raise ValueError
+        except (struct.error, ValueError):
+            self.close()
+            raise ValueError(f"'{f.name}' is not a valid compiled wordlist") from None
+        self.offsets = self.view[index:index + 8 * (self.count + 1)].cast('Q')
+        if sys.byteorder != 'little':
+            self.offsets = array.array('Q', self.offsets)
+            self.offsets.byteswap()
+        self.position = 0
+
+    def seek(self, position):
+        self.position = min(position, self.count)
+
+    def tell(self):
+        return self.position
+
+    def blocks(self, end=None):
+        # (first word number, [words]) from the current position up to word `end`. Pages
+        # already decoded are handed back to the page cache, so a long scan's resident
+        # memory stays flat however large the list is
+        end = self.count if end is None else min(end, self.count)
+        offsets, data = self.offsets, self.data
+        release = getattr(mmap, 'MADV_DONTNEED', None)
+        released = data // mmap.PAGESIZE * mmap.PAGESIZE
+        while self.position < end:
+            start, stop = self.position, min(self.position + self.BLOCK, end)
+            block = str(self.view[data + offsets[start]:data + offsets[stop] - 1], 'utf-8')
+            self.position = stop
+            if release is not None:
+                done = (data + offsets[stop]) // mmap.PAGESIZE * mmap.PAGESIZE
+                if done > released:
+                    self.map.madvise(release, released, done - released)
+                    released = done
+            yield start, block.split('\n')
+
+    def words(self, end=None):
+        for _, words in self.blocks(end):
+            yield from words
+
+    def entries(self, end=None):
+        # (position after the word, word), as iter_entries() yields for text files
+        for start, words in self.blocks(end):
+            yield from zip(range(start + 1, start + len(words) + 1), words)
+
+    def close(self):
+        if isinstance(getattr(self, 'offsets', None), memoryview):
+            self.offsets.release()
+        self.view.release()
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_wordlist(path):
+    """Opens a wordlist for iter_words() and iter_entries(): a CompiledWordlist if `path`
+    was written by `reconhound wordlist compile`, otherwise the text file in binary mode."""
+    f = open(path, 'rb')
+    if f.read(len(CompiledWordlist.MAGIC)) == CompiledWordlist.MAGIC:
+        return CompiledWordlist(f)
+    f.seek(0)
+    return f
+
+def compile_wordlist(source, destination, bucket_size=32 << 20):
+    """Writes the words of the wordlist `source`, stripped and decoded the way
+    iter_entries() reads them, to `destination` as a CompiledWordlist with every
+    duplicate after the first dropped. Returns (words read, words written).
+
+    De-duplication must work on lists far larger than memory, so words are first
+    spread over temporary bucket files by hash (about `bucket_size` bytes of input
+    each) tagged with their position, each bucket is de-duplicated on its own, and
+    the survivors are merged back into wordlist order.
+    """
+    record = struct.Struct('<QI')  # position in the source, length of the word
+    directory = os.path.dirname(os.path.abspath(destination))
+    buckets = min(256, 1 + os.path.getsize(source) // bucket_size)
+
+    def read_records(f):
+        while True:
+            head = f.read(record.size)
+            if not head:
+                return
+            position, length = record.unpack(head)
+            yield position, f.read(length)
+
+    with tempfile.TemporaryDirectory(dir=directory) as scratch:
+        paths = [os.path.join(scratch, str(bucket)) for bucket in range(buckets)]
+        files = [open(path, 'wb') for path in paths]
+        read = 0
+        try:
+            for position, word in enumerate(iter_words(open_wordlist(source))):
+                encoded = word.encode('utf-8')
+                files[hash(encoded) % buckets].write(record.pack(position, len(encoded)) + encoded)
+                read += 1
+        finally:
+            for f in files:
+                f.close()
+        for path in paths:
+            # Records are in source order, so the first copy of a word is the one kept
+            seen = set()
+            with open(path, 'rb') as bucket, open(path + '.unique', 'wb') as unique:
+                for position, word in read_records(bucket):
+                    if word not in seen:
+                        seen.add(word)
+                        unique.write(record.pack(position, len(word)) + word)
+            os.remove(path)
+        runs = [open(path + '.unique', 'rb') for path in paths]
+        header = CompiledWordlist.HEADER
+        temporary = destination + '.tmp'
+        try:
+            with open(temporary, 'wb') as out, tempfile.TemporaryFile(dir=scratch) as index:
+                out.write(header.pack(CompiledWordlist.MAGIC, 0, header.size, 0))
+                offsets = array.array('Q', [0])
+                end = written = 0
+                for _, word in heapq.merge(*(read_records(run) for run in runs)):
+                    out.write(word + b'\n')
+                    end += len(word) + 1
+                    offsets.append(end)
+                    written += 1
+                    if len(offsets) >= 65536:
+                        if sys.byteorder != 'little':
+                            offsets.byteswap()
+                        offsets.tofile(index)
+                        offsets = array.array('Q')
+                if sys.byteorder != 'little':
+                    offsets.byteswap()
+                offsets.tofile(index)
+                out.write(b'\0' * (-out.tell() % 8))  # the index is read as aligned uint64s
+                index_offset = out.tell()
+                index.seek(0)
+                shutil.copyfileobj(index, out)
+                out.seek(0)
+                out.write(header.pack(CompiledWordlist.MAGIC, written, header.size, index_offset))
+            os.replace(temporary, destination)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        finally:
+            for run in runs:
+                run.close()
+    return read, written
+
+def iter_entries(f, end=None):
+    """Yields (end_offset, word) for each stripped, non-empty line of a binary wordlist file,
+    stopping at the first line that starts at or after `end`."""
+    if isinstance(f, CompiledWordlist):
+        with f:
+            yield from f.entries(end)
+        return
+    offset = f.tell()
+    with f:
+        for raw in f:
+            if end is not None and offset >= end:
+                break
+            offset += len(raw)
+            try:
+                line = raw.decode('utf-8')
+            except UnicodeDecodeError:
+                # fallback to latin-1 encoding if UTF-8 fails
+                line = raw.decode('latin-1')
+            word = line.strip()
+            if word:
+                yield offset, word
+
+def iter_words(f, shard=None):
+    """Yields stripped, non-empty words from a binary wordlist file, one line at a time.
+
+    With shard=(index, count) only the lines starting in slice `index` of `count`
+    equal byte ranges are read, so --workers processes split the file without
+    counting its lines first. A CompiledWordlist is split by word number instead,
+    so its slices are exactly even.
+    """
+    end = None
+    if isinstance(f, CompiledWordlist):
+        if shard:
+            index, count = shard
+            f.seek(f.count * index // count)
+            end = f.count * (index + 1) // count
+        with f:
+            yield from f.words(end)
+        return
+    if shard:
+        index, count = shard
+        size = os.fstat(f.fileno()).st_size
+        start, end = size * index // count, size * (index + 1) // count
+        if start:
+            # Skip the line that straddles the boundary; the previous slice owns it
+            f.seek(start - 1)
+            f.readline()
+    for _, word in iter_entries(f, end):
+        yield word
+
+def iter_clusterbomb(f, paths, shard=None):
+    """Yields a tuple for every combination of the words of `f` (its shard slice, if
+    given) with those of the wordlists at `paths`, the last one varying fastest.
+
+    The inner wordlists are streamed again for each outer word instead of being
+    held in memory, so the product of large lists is never materialised.
+    """
+    def combine(index, prefix):
+        if index == len(paths):
+            yield prefix
+            return
+        with open_wordlist(paths[index]) as inner:
+            for word in iter_words(inner):
+                yield from combine(index + 1, prefix + (word,))
+
+    for word in iter_words(f, shard):
+        yield from combine(0, (word,))
+
+def iter_pitchfork(f, paths, shard=None):
+    """Yields tuples of the n-th word of every wordlist, stopping with the shortest.
+    With shard=(index, count) every count-th tuple from `index` is yielded."""
+    tuples = zip(iter_words(f), *(iter_words(open_wordlist(path)) for path in paths))
+    return itertools.islice(tuples, shard[0], None, shard[1]) if shard else tuples
+
+ATTACKS = {'clusterbomb': iter_clusterbomb, 'pitchfork': iter_pitchfork}
+
+def bind_wordlists(specs):
+    # -w PATH[:KEYWORD] arguments -> [(keyword, path)]. A single unnamed wordlist fills
+    # FUZZ; several unnamed ones fill FUZZ1, FUZZ2, ... by position
+    bound = []
+    for position, spec in enumerate(specs, 1):
+        path, _, keyword = spec.rpartition(':')
+        if not path or not re.fullmatch(r'FUZZ\w*', keyword):
+            path, keyword = spec, 'FUZZ' if len(specs) == 1 else f'FUZZ{position}'
+        bound.append((keyword, path))
+    return bound
+
+class WordlistAction(argparse.Action):
+    """-w that may be repeated; args.wordlist keeps the first path, args.wordlists every PATH[:KEYWORD]."""
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        specs = (getattr(namespace, 'wordlists', None) or []) + [values]
+        namespace.wordlists = specs
+        namespace.wordlist = bind_wordlists(specs)[0][1]
+
+class RequestTemplate:
+    """A string with placeholder keywords in it, split once into literal segments so
+    filling in a word is a concatenation instead of a search-and-replace.
+
+    Longer keywords are matched first, so FUZZ10 is not read as FUZZ1 followed by '0'.
+    `prefix` is literal text put in front (e.g. the part of a URL that is never filled).
+    """
+
+    def __init__(self, text, keywords, prefix=''):
+        pattern = '|'.join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True))
+        self.parts = re.split(f'({pattern})', text)
+        self.parts[0] = prefix + self.parts[0]
+        # (index in parts, index of the keyword) for every placeholder
+        self.slots = [(index, keywords.index(self.parts[index])) for index in range(1, len(self.parts), 2)]
+        self.static = not self.slots
+
+    def fill(self, word):
+        # word: the value of the only keyword, or a tuple with one value per keyword
+        parts = self.parts
+        if self.static:
+            return parts[0]
+        if len(self.slots) == 1:
+            return parts[0] + (word[self.slots[0][1]] if isinstance(word, tuple) else word) + parts[2]
+        parts = parts.copy()
+        for index, keyword in self.slots:
+            parts[index] = word[keyword] if isinstance(word, tuple) else word
+        return ''.join(parts)
+
+class ProbeTemplate:
+    """What one target's probes share, worked out once instead of for every word.
+
+    The target URL is split around its placeholders (only the query in fuzz mode),
+    and there is a ready header dict per user agent with the -H headers in it. Those
+    dicts are handed out as they are unless a header or the vhost Host varies by
+    word, and a constant --data body is encoded once.
+    """
+
+    def __init__(self, hound):
+        keywords = hound.keywords
+        self.mode = hound.current_mode
+        varies = lambda text: any(keyword in text for keyword in keywords)
+        fixed = {name: value for name, value in hound.headers if not (varies(name) or varies(value))}
+        self.header_sets = [{'User-Agent': agent, **fixed} for agent in hound.user_agents]
+        self.headers = [(RequestTemplate(name, keywords), RequestTemplate(value, keywords))
+                        for name, value in hound.headers if varies(name) or varies(value)]
+        self.copy_headers = bool(self.headers) or self.mode == 'vhost'
+        self.data = None
+        self.body = None
+        if hound.data is not None and varies(hound.data):
+            self.data = RequestTemplate(hound.data, keywords)
+        elif hound.data is not None:
+            self.body = hound.data.encode('utf-8')
+        if self.mode == 'dir':
+            self.url = hound.target.rstrip('/') + '/'
+            self.suffixes = [''] + list(hound.extensions or [])
+        elif self.mode == 'fuzz':
+            parsed = urlparse(hound.target)
+            self.url = RequestTemplate(parsed.query, keywords, f"{parsed.scheme}://{parsed.netloc}{parsed.path}?")
+        elif self.mode == 'fuzzany':
+            self.url = RequestTemplate(hound.target, keywords)
+        elif self.mode == 'vhost':
+            self.url = f"http://{hound.ip_address}/"
+            self.host = '.' + hound.base_domain
+
+    def build(self, word):
+        headers = random.choice(self.header_sets)
+        if self.copy_headers:
+            headers = headers.copy()
+            for name, value in self.headers:
+                headers[name.fill(word)] = value.fill(word)
+        data = self.body if self.data is None else self.data.fill(word).encode('utf-8')
+        if self.mode == 'dir':
+            base = self.url + word
+            return [(base + suffix, headers, base + suffix, data) for suffix in self.suffixes]
+        if self.mode == 'vhost':
+            host = word + self.host
+            headers['Host'] = host
+            return [(self.url, headers, host, data)]
+        url = self.url.fill(word)
+        return [(url, headers, url, data)]
+
+def parse_header(spec):
+    # "Name: value" -> (name, value)
+    name, separator, value = spec.partition(':')
+    if not separator or not name.strip():
+        raise argparse.ArgumentTypeError(f"expected 'Name: value', got '{spec}'")
+    return name.strip(), value.strip()
+
+class ScanCheckpoint:
+    """Tracks how far through the wordlist a scan has got and saves it atomically.
+
+    Words finish out of order, so only the byte offset (word number, for a compiled
+    wordlist) after the longest run of completed words is recorded; a resumed scan re-sends at most the words that
+    were in flight when it stopped.
+    """
+
+    def __init__(self, path, interval=10.0):
+        self.path = path
+        self.interval = interval
+        self.lock = threading.RLock()
+        self.hound = None
+        self.params = None
+        self.offset = 0
+        self.words_done = 0
+        self.next_index = 0
+        self.offsets = {}
+        self.completed = set()
+        self.held = {}
+        self.counts = {'paths': 0, 'subdomains': 0, 'vhosts': 0}
+        self.last_save = time.time()
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def track(self, entries):
+        # Remembers the end offset of every word handed out, in wordlist order
+        for index, (offset, word) in enumerate(entries):
+            self.offsets[index] = offset
+            yield word
+
+    def hold(self, kind, entry):
+        # Findings reach the output file in wordlist order, so the checkpointed file
+        # size never includes hits from words that will be sent again on resume
+        with self.lock:
+            self.held.setdefault(current_word.get(), []).append((kind, entry))
+
+    def complete(self, index):
+        with self.lock:
+            self.completed.add(index)
+            while self.next_index in self.completed:
+                self.completed.remove(self.next_index)
+                self.offset = self.offsets.pop(self.next_index)
+                for kind, entry in self.held.pop(self.next_index, ()):
+                    self.hound.sink.write(entry)
+                    self.counts[kind] += 1
+                self.next_index += 1
+                self.words_done += 1
+            if time.time() - self.last_save >= self.interval:
+                self.save()
+
+    def save(self, complete=False):
+        with self.lock:
+            state = {
+                'params': self.params,
+                'offset': self.offset,
+                'words_done': self.words_done,
+                'complete': complete,
+            }
+            if self.hound.sink:
+                state['counts'] = dict(self.counts)
+                # Findings already live in the output file; remember how much of it is valid
+                state['sink_offset'] = self.hound.sink.position()
+            else:
+                state['counts'] = dict(self.hound.found_counts)
+                state['results'] = {
+                    'paths': self.hound.found_paths,
+                    'subdomains': self.hound.found_subdomains,
+                    'vhosts': self.hound.found_vhosts,
+                }
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, 'w') as f:
+                    json.dump(state, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"[-] Error saving checkpoint: {str(e)}")
+            self.last_save = time.time()
+
+class JSONLSink:
+    """Appends each finding to a JSON Lines file as soon as it is discovered.
+
+    Writes are buffered and a background thread flushes them every
+    `flush_interval` seconds, so the file can be tailed while a scan runs.
+    """
+
+    def __init__(self, path, flush_interval=1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.kind = None
+        self.grouped = False  # batch scans: entries carry a 'target' key
+        self.file = None
+        self.lock = threading.RLock()
+        self.stopped = threading.Event()
+
+    def open(self, kind, offset=None):
+        # offset: resume by truncating the file to the last checkpointed size
+        self.kind = kind
+        if offset is None:
+            self.file = open(self.path, 'wb', buffering=64 * 1024)
+        else:
+            self.file = open(self.path, 'ab', buffering=64 * 1024)
+            self.file.truncate(min(offset, self.file.tell()))
+            self.file.seek(0, os.SEEK_END)
+        threading.Thread(target=self.flush_periodically, daemon=True).start()
+
+    def flush_periodically(self):
+        while not self.stopped.wait(self.flush_interval):
+            with self.lock:
+                if self.file:
+                    self.file.flush()
+
+    def format(self, entry):
+        if not isinstance(entry, dict):
+            entry = {'subdomain': entry}
+        return json.dumps(entry) + '\n'
+
+    def write(self, entry):
+        with self.lock:
+            # Workers still finishing after an interrupt closed the sink are ignored
+            if self.file:
+                self.file.write(self.format(entry).encode('utf-8'))
+
+    def position(self):
+        with self.lock:
+            if not self.file:
+                return 0
+            self.file.flush()
+            return self.file.tell()
+
+    def close(self, final=True):
+        with self.lock:
+            if not self.file:
+                return False
+            self.stopped.set()
+            self.file.close()
+            self.file = None
+            return True
+
+class CSVSink(JSONLSink):
+    """Appends each finding as a CSV row under a fixed header for the kind of finding."""
+
+    # Fuzz findings carry a 'payload' only when some placeholder values are not in the URL,
+    # so the column is always there and left empty for the rows without one
+    FIELDS = {'paths': ['url', 'status', 'size', 'payload'], 'vhosts': ['vhost', 'status', 'size', 'payload'],
+              'subdomains': ['subdomain']}
+
+    def open(self, kind, offset=None):
+        super().open(kind, offset)
+        self.header_written = self.file.tell() > 0
+
+    def format(self, entry):
+        if not isinstance(entry, dict):
+            entry = {'subdomain': entry}
+        fields = self.FIELDS[self.kind]
+        if self.grouped:
+            fields = ['target'] + fields
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fields, restval='', extrasaction='ignore')
+        if not self.header_written:
+            writer.writeheader()
+            self.header_written = True
+        writer.writerow({key: json.dumps(value) if isinstance(value, dict) else value for key, value in entry.items()})
+        return buffer.getvalue()
+
+class JSONSink(JSONLSink):
+    """Streams findings to `<output>.part` and writes the classic indented JSON file on close."""
+
+    def __init__(self, path, flush_interval=1.0):
+        super().__init__(f"{path}.part", flush_interval)
+        self.output_path = path
+
+    def close(self, final=True):
+        if not super().close():
+            return False
+        key = self.kind
+        if self.grouped:
+            self.write_grouped(key)
+        else:
+            self.write_flat(key)
+        # Keep the part file after an interrupt so --resume can continue appending to it
+        if final:
+            os.remove(self.path)
+        return True
+
+    def write_grouped(self, key):
+        # {"targets": {target: {key: [...]}}}, in the order targets first produced a finding
+        groups = {}
+        with open(self.path, 'rb') as part:
+            for line in part:
+                entry = json.loads(line)
+                target = entry.pop('target')
+                if key == 'subdomains':
+                    entry = entry['subdomain']
+                groups.setdefault(target, {key: []})[key].append(entry)
+        with open(self.output_path, 'w') as f:
+            json.dump({'targets': groups}, f, indent=2)
+
+    def write_flat(self, key):
+        with open(self.path, 'rb') as part, open(self.output_path, 'w') as f:
+            # Same layout as json.dump({key: [...]}, f, indent=2), without holding the list in memory
+            f.write(f'{{\n  "{key}": [')
+            first = True
+            for line in part:
+                entry = json.loads(line)
+                if key == 'subdomains':
+                    entry = entry['subdomain']
+                item = json.dumps(entry, indent=2).replace('\n', '\n    ')
+                f.write(f"{'' if first else ','}\n    {item}")
+                first = False
+            f.write(']\n}' if first else '\n  ]\n}')
+
+SINKS = {'json': JSONSink, 'jsonl': JSONLSink, 'csv': CSVSink}
+
+class ShardSink:
+    """Sink of a --workers child process: hands every finding to the parent to merge."""
+
+    def __init__(self, queue):
+        self.queue = queue
+        self.kind = None
+        self.grouped = False
+
+    def open(self, kind, offset=None):
+        self.kind = kind
+
+    def write(self, entry):
+        self.queue.put(('found', self.kind, entry))
+
+    def position(self):
+        return 0
+
+    def close(self, final=True):
+        return False
+
+class RemoteSink(ShardSink):
+    """Sink of a remote worker: streams every finding to the coordinator."""
+
+    def __init__(self, channel):
+        super().__init__(None)
+        self.channel = channel
+
+    def write(self, entry):
+        self.channel.send({'type': 'found', 'kind': self.kind, 'entry': entry})
+
+class MessageChannel:
+    """Newline-delimited JSON messages over a TCP socket; send() is safe from several threads."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.reader = sock.makefile('rb')
+        self.lock = threading.Lock()
+
+    def send(self, message):
+        data = (json.dumps(message) + '\n').encode('utf-8')
+        with self.lock:
+            self.sock.sendall(data)
+
+    def receive(self):
+        # None once the other side has closed the connection
+        line = self.reader.readline()
+        return json.loads(line) if line else None
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+TOKEN_ENV = 'RECONHOUND_TOKEN'
+
+def token_proof(token, role, nonce):
+    # What one side of a coordinator connection sends to show it knows the shared token
+    return hmac.new(token.encode('utf-8'), f"{role}:{nonce}".encode('utf-8'), hashlib.sha256).hexdigest()
+
+class Coordinator:
+    """Hands wordlist chunks to remote workers over TCP and merges what they find.
+
+    A worker first proves it knows the shared `token` by answering a random
+    challenge; connections that can't are closed before they see the scan
+    (whose command line may carry -H or --data secrets) or can report findings.
+    Each worker then gets the scan's command line once, then one chunk of words
+    at a time, and streams back findings followed by a 'done' for the chunk. A
+    worker that disconnects, or sends nothing (not even its heartbeat) for
+    `timeout` seconds, is dropped and its chunk goes back to the front of the queue.
+    """
+
+    def __init__(self, hound, address, scan, words, token, chunk_size=2000, timeout=30.0):
+        self.hound = hound
+        self.scan = scan
+        self.token = token
+        self.words = words
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.next_id = 0
+        self.requeued = collections.deque()
+        self.outstanding = {}
+        self.exhausted = False
+        self.stats = {}  # worker -> latest (connections, rate totals, DNS cache lookups) it reported
+        self.cond = threading.Condition()
+        self.server = socket.create_server(address)
+        self.address = self.server.getsockname()[:2]
+
+    def run(self):
+        threading.Thread(target=self.accept, daemon=True).start()
+        with self.cond:
+            while self.hound.is_running and not self.finished():
+                self.cond.wait(1)
+        self.server.close()
+
+    def finished(self):
+        return self.exhausted and not self.requeued and not self.outstanding
+
+    def accept(self):
+        while True:
+            try:
+                sock, peer = self.server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self.serve, args=(sock, f"{peer[0]}:{peer[1]}"), daemon=True).start()
+
+    def take(self):
+        # Blocks while every remaining chunk is out with another worker, since one
+        # of them may still come back; None once the whole wordlist is done
+        with self.cond:
+            while self.hound.is_running:
+                if self.requeued:
+                    chunk = self.requeued.popleft()
+                    self.outstanding[chunk[0]] = chunk
+                    return chunk
+                if not self.exhausted:
+                    words = [word for _, word in zip(range(self.chunk_size), self.words)]
+                    if words:
+                        chunk = (self.next_id, words)
+                        self.next_id += 1
+                        self.outstanding[chunk[0]] = chunk
+                        return chunk
+                    self.exhausted = True
+                if self.finished():
+                    self.cond.notify_all()
+                    return None
+                self.cond.wait(1)
+            return None
+
+    def serve(self, sock, worker):
+        sock.settimeout(self.timeout)
+        channel = MessageChannel(sock)
+        chunk = None
+        try:
+            nonce = secrets.token_hex(16)
+            channel.send({'type': 'challenge', 'nonce': nonce})
+            hello = channel.receive()
+            if not isinstance(hello, dict) or hello.get('type') != 'hello':
+                return
+            if not hmac.compare_digest(str(hello.get('proof')), token_proof(self.token, 'worker', nonce)):
+                print(f"[!] Worker {worker} rejected: wrong token")
+                return
+            name = hello.get('name') or worker
+            print(f"[+] Worker connected: {name} ({worker})")
+            # The worker checks this proof too, so it only ever runs scans of a coordinator holding the token
+            channel.send({'type': 'scan', 'heartbeat': self.timeout / 3,
+                          'proof': token_proof(self.token, 'coordinator', hello.get('nonce')), **self.scan})
+            while True:
+                chunk = self.take()
+                if chunk is None:
+                    channel.send({'type': 'stop'})
+                    return
+                channel.send({'type': 'chunk', 'id': chunk[0], 'words': chunk[1]})
+                while True:
+                    message = channel.receive()
+                    if message is None:
+                        raise ConnectionError("connection closed")
+                    if message['type'] == 'found':
+                        self.hound.merge(message['kind'], message['entry'])
+                    elif message['type'] == 'ping':
+                        self.hound.metrics.shards[worker] = message['metrics']
+                    elif message['type'] == 'done':
+                        break
+                with self.cond:
+                    self.hound.metrics.shards[worker] = message['metrics']
+                    self.stats[worker] = (message['connections'], message['totals'], message['lookups'])
+                    del self.outstanding[chunk[0]]
+                    chunk = None
+                    self.cond.notify_all()
+        except (OSError, ValueError) as e:
+            print(f"[!] Worker {worker} lost ({e})")
+        finally:
+            if chunk is not None:
+                with self.cond:
+                    del self.outstanding[chunk[0]]
+                    self.requeued.append(chunk)
+                    self.cond.notify_all()
+                print(f"[!] Chunk {chunk[0]} ({len(chunk[1])} words) queued for another worker")
+            channel.close()
+
+def finding_label(entry):
+    # What makes a finding unique: its target (batch scans) and URL, vhost or subdomain
+    if not isinstance(entry, dict):
+        return None, entry
+    label = entry.get('url') or entry.get('vhost') or entry.get('subdomain')
+    if entry.get('payload'):
+        # Placeholders in headers or the body make one URL several findings
+        label += ' [' + ', '.join(f"{keyword}={value}" for keyword, value in entry['payload'].items()) + ']'
+    return entry.get('target'), label
+
+def finding_line(entry):
+    target, label = finding_label(entry)
+    if isinstance(entry, dict) and 'status' in entry:
+        return f"[+] Found: {label} (Status: {entry['status']})"
+    return f"[+] Found: {label}"
+
+def error_class(exc):
+    # Coarse kind of a failed request or query, as counted by ScanMetrics
+    if isinstance(exc, (requests.Timeout, asyncio.TimeoutError, dns.exception.Timeout, socket.timeout)):
+        return 'timeout'
+    if isinstance(exc, (requests.exceptions.SSLError, ssl.SSLError)) or (
+            aiohttp is not None and isinstance(exc, aiohttp.ClientSSLError)):
+        return 'tls'
+    if isinstance(exc, (requests.ConnectionError, ConnectionError)) or (
+            aiohttp is not None and isinstance(exc, aiohttp.ClientConnectionError)):
+        return 'connection'
+    if isinstance(exc, dns.exception.DNSException):
+        return 'dns'
+    return 'other'
+
+def count_lines(path):
+    # Wordlist size for progress and ETA; read in large blocks, so it is quick even for huge lists
+    f = open_wordlist(path)
+    if isinstance(f, CompiledWordlist):
+        with f:
+            return f.count
+    lines = 0
+    last = b'\n'
+    with f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            lines += block.count(b'\n')
+            last = block[-1:]
+    return lines + (last != b'\n')
+
+class LatencyHistogram:
+    """Request durations in fixed buckets (seconds), as Prometheus histograms count them."""
+
+    BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf)
+
+    def __init__(self, counts=None, total=0.0):
+        self.counts = list(counts or [0] * len(self.BUCKETS))
+        self.total = total
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+        self.total += seconds
+
+    def merge(self, other):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total += other.total
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def quantile(self, q):
+        # Interpolated within the bucket holding the q-th observation
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                low = self.BUCKETS[index - 1] if index else 0.0
+                high = self.BUCKETS[index]
+                if high == math.inf:
+                    return low
+                return low + (high - low) * (rank - seen) / count
+            seen += count
+        return 0.0
+
+class ScanMetrics:
+    """Thread-safe counters and per-phase latency histograms for one scan.
+
+    Phases are 'dns' (name lookups: every query in sub mode, the async engine's
+    host lookups otherwise), 'connect' (new TCP connections; the thread engine
+    includes its host lookup, the async engine its TLS handshake), 'tls',
+    'server' (request sent until response headers), 'download' (reading the
+    body) and 'total'. Responses are counted by status code (rcode in sub mode)
+    and failures by error_class(). --workers processes and remote workers send
+    snapshot() here, where they are kept in `shards` and added up by combined().
+    """
+
+    PHASES = ('dns', 'connect', 'tls', 'server', 'download', 'total')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.counts = collections.Counter()
+        self.statuses = collections.Counter()
+        self.errors = collections.Counter()
+        self.phases = {phase: LatencyHistogram() for phase in self.PHASES}
+        self.in_flight = 0
+        self.lines = None  # wordlist lines, once count_lines() is done
+        self.passes = 0  # times the wordlist will be scanned (targets, plus directories found by -R)
+        self.shards = {}
+        self.reporting = False  # a progress line, metrics file or endpoint is reading these
+
+    def expect(self, passes=1):
+        with self.lock:
+            self.passes += passes
+
+    def count_wordlist(self, paths, combine=math.prod):
+        # paths: every wordlist of the scan; combine turns their lengths into the number
+        # of words (math.prod for a clusterbomb attack, min for pitchfork)
+        def count():
+            try:
+                self.lines = combine(count_lines(path) for path in paths)
+            except OSError:
+                pass
+        threading.Thread(target=count, daemon=True).start()
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counts[name] += amount
+
+    def started(self):
+        with self.lock:
+            self.counts['requests'] += 1
+            self.in_flight += 1
+
+    def finished(self, status=None, error=None):
+        with self.lock:
+            self.in_flight -= 1
+            if error is not None:
+                self.errors[error_class(error)] += 1
+            else:
+                self.statuses[str(status)] += 1
+
+    def observe(self, phase, seconds):
+        with self.lock:
+            self.phases[phase].observe(seconds)
+
+    def add_setup(self, seconds):
+        # Connect/TLS time spent by this thread's current request, which its
+        # response time should not count as server time
+        self.local.setup = getattr(self.local, 'setup', 0.0) + seconds
+
+    def take_setup(self):
+        setup = getattr(self.local, 'setup', 0.0)
+        self.local.setup = 0.0
+        return setup
+
+    def observe_request(self, start, headers, end, setup=0.0):
+        # One completed request: perf_counter() when it was sent, when the headers
+        # arrived and when the body was read
+        with self.lock:
+            self.phases['server'].observe(max(headers - start - setup, 0.0))
+            self.phases['download'].observe(end - headers)
+            self.phases['total'].observe(end - start)
+
+    def snapshot(self):
+        # combined(), in a form that can be pickled or sent as JSON to a coordinator
+        combined = self.combined()
+        combined['phases'] = {phase: [h.counts, h.total] for phase, h in combined['phases'].items()}
+        for key in ('counts', 'statuses', 'errors'):
+            combined[key] = dict(combined[key])
+        del combined['expected']
+        return combined
+
+    def combined(self):
+        # This process's numbers plus the latest snapshot of every worker. Findings
+        # are only taken from here, where the workers' findings are merged into
+        with self.lock:
+            counts = collections.Counter(self.counts)
+            statuses = collections.Counter(self.statuses)
+            errors = collections.Counter(self.errors)
+            phases = {phase: LatencyHistogram(h.counts, h.total) for phase, h in self.phases.items()}
+            combined = {'in_flight': self.in_flight, 'passes': self.passes}
+        for shard in list(self.shards.values()):
+            counts.update({name: count for name, count in shard['counts'].items() if name != 'findings'})
+            statuses.update(shard['statuses'])
+            errors.update(shard['errors'])
+            for phase, values in shard['phases'].items():
+                phases[phase].merge(LatencyHistogram(*values))
+            combined['in_flight'] += shard['in_flight']
+            combined['passes'] += shard['passes']
+        combined.update(counts=counts, statuses=statuses, errors=errors, phases=phases)
+        combined['expected'] = None if self.lines is None else self.lines * combined['passes']
+        return combined
+
+    def progress(self, previous, elapsed):
+        # One status line; `previous` is the combined() of the last line, `elapsed` the seconds since
+        current = self.combined()
+        words = current['counts']['words']
+        rate = (current['counts']['requests'] - previous['counts']['requests']) / elapsed if previous else 0
+        word_rate = (words - previous['counts']['words']) / elapsed if previous else 0
+        expected = current['expected']
+        parts = [f"{words} words"]
+        if expected:
+            parts[0] = f"{words}/{expected} words ({min(words / expected, 1) * 100:.1f}%)"
+        parts.append(f"{rate:.0f} req/s")
+        if expected and word_rate:
+            remaining = max(expected - words, 0) / word_rate
+            parts.append(f"ETA {int(remaining // 3600):d}:{int(remaining % 3600 // 60):02d}:{int(remaining % 60):02d}")
+        parts.append(f"{current['in_flight']} in flight")
+        parts.append(f"{current['counts']['findings']} found")
+        if current['errors']:
+            parts.append(f"{sum(current['errors'].values())} errors")
+        return current, "[~] " + " | ".join(parts)
+
+    def summary(self):
+        # End-of-scan lines: per-phase latency, response codes and errors
+        current = self.combined()
+        lines = []
+        phases = [f"{phase} p50 {h.quantile(0.5) * 1000:.1f}ms p99 {h.quantile(0.99) * 1000:.1f}ms"
+                  for phase, h in current['phases'].items() if h.count]
+        if phases:
+            lines.append(f"Latency: {', '.join(phases)}")
+        if current['statuses']:
+            lines.append("Responses: " + ", ".join(f"{status}: {count}" for status, count
+                                                   in current['statuses'].most_common()))
+        if current['errors']:
+            lines.append("Errors: " + ", ".join(f"{kind}: {count}" for kind, count
+                                                in current['errors'].most_common()))
+        return lines
+
+    def prometheus(self):
+        # Prometheus text exposition format
+        current = self.combined()
+        out = []
+
+        def metric(name, kind, help_text, samples):
+            out.append(f"# HELP reconhound_{name} {help_text}")
+            out.append(f"# TYPE reconhound_{name} {kind}")
+            for labels, value in samples:
+                label = '{' + ','.join(f'{k}="{v}"' for k, v in labels.items()) + '}' if labels else ''
+                out.append(f"reconhound_{name}{label} {value}")
+
+        counts = current['counts']
+        metric('requests_total', 'counter', "HTTP requests or DNS queries sent", [({}, counts['requests'])])
+        metric('responses_total', 'counter', "Responses by HTTP status or DNS rcode",
+               [({'code': code}, count) for code, count in sorted(current['statuses'].items())])
+        metric('errors_total', 'counter', "Failed requests or queries by kind",
+               [({'kind': kind}, count) for kind, count in sorted(current['errors'].items())])
+        metric('words_total', 'counter', "Wordlist entries completed", [({}, counts['words'])])
+        if current['expected'] is not None:
+            metric('words_expected', 'gauge', "Wordlist entries the scan will try", [({}, current['expected'])])
+        metric('findings_total', 'counter', "Findings reported", [({}, counts['findings'])])
+        metric('in_flight', 'gauge', "Requests or queries currently in flight", [({}, current['in_flight'])])
+        samples = []
+        for phase, histogram in current['phases'].items():
+            cumulative = 0
+            for bound, count in zip(LatencyHistogram.BUCKETS, histogram.counts):
+                cumulative += count
+                samples.append(({'phase': phase, 'le': '+Inf' if bound == math.inf else bound}, cumulative))
+        out.append("# HELP reconhound_phase_seconds Time spent per request phase")
+        out.append("# TYPE reconhound_phase_seconds histogram")
+        for labels, value in samples:
+            out.append(f'reconhound_phase_seconds_bucket{{phase="{labels["phase"]}",le="{labels["le"]}"}} {value}')
+        for phase, histogram in current['phases'].items():
+            out.append(f'reconhound_phase_seconds_sum{{phase="{phase}"}} {histogram.total}')
+            out.append(f'reconhound_phase_seconds_count{{phase="{phase}"}} {histogram.count}')
+        return '\n'.join(out) + '\n'
+
+class StatusLineStream:
+    """Stdout wrapper that clears the progress line before output and redraws it after."""
+
+    def __init__(self, stream, reporter):
+        self.stream = stream
+        self.reporter = reporter
+
+    def write(self, text):
+        with self.reporter.lock:
+            self.reporter.clear()
+            written = self.stream.write(text)
+            if text.endswith('\n'):
+                self.stream.flush()
+                self.reporter.draw()
+            return written
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+class MetricsReporter:
+    """Every `interval` seconds, redraws the progress line and rewrites the metrics file.
+
+    On a terminal the progress line stays at the bottom of stderr; otherwise it is
+    printed as a plain line each time. With a port, /metrics on localhost serves
+    the same numbers as the file, in Prometheus text format.
+    """
+
+    def __init__(self, metrics, interval=2.0, progress=False, path=None, port=None):
+        self.metrics = metrics
+        self.interval = interval
+        self.progress = progress
+        self.path = path
+        self.port = port
+        self.lock = threading.RLock()
+        self.line = None
+        self.shown = False
+        self.terminal = progress and sys.stderr.isatty()
+        self.stopped = threading.Event()
+        self.server = None
+        self.stdout = None
+
+    def start(self):
+        self.metrics.reporting = True
+        if self.port is not None:
+            metrics = self.metrics
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split('?')[0] != '/metrics':
+                        self.send_error(404)
+                        return
+                    body = metrics.prometheus().encode()
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *args):
+                    pass
+
+            self.server = ThreadingHTTPServer(('127.0.0.1', self.port), Handler)
+            self.server.daemon_threads = True
+            threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        if self.terminal and sys.stdout.isatty():
+            self.stdout = sys.stdout
+            sys.stdout = StatusLineStream(sys.stdout, self)
+        threading.Thread(target=self.run, daemon=True).start()
+        return self
+
+    def run(self):
+        previous = self.metrics.combined()
+        last = time.monotonic()
+        while not self.stopped.wait(self.interval):
+            now = time.monotonic()
+            if self.progress:
+                previous, line = self.metrics.progress(previous, now - last)
+                self.show(line)
+            last = now
+            self.write_file()
+
+    def show(self, line):
+        with self.lock:
+            if self.terminal:
+                self.clear()
+                self.line = line
+                self.draw()
+            else:
+                print(line, file=sys.stderr, flush=True)
+
+    def clear(self):
+        if self.shown:
+            sys.stderr.write('\r\033[K')
+            self.shown = False
+
+    def draw(self):
+        if self.line and not self.stopped.is_set():
+            sys.stderr.write(self.line)
+            sys.stderr.flush()
+            self.shown = True
+
+    def write_file(self):
+        if not self.path:
+            return
+        # Written next to the target and renamed over it, so a scraper never reads half a file
+        temp = f"{self.path}.tmp"
+        try:
+            with open(temp, 'w') as f:
+                f.write(self.metrics.prometheus())
+            os.replace(temp, self.path)
+        except OSError as e:
+            print(f"[-] Error writing metrics to {self.path}: {e}", file=sys.stderr)
+            self.path = None
+
+    def stop(self):
+        if self.stopped.is_set():
+            return
+        self.stopped.set()
+        with self.lock:
+            self.clear()
+            sys.stderr.flush()
+        if self.stdout is not None:
+            sys.stdout = self.stdout
+        self.write_file()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+@contextlib.contextmanager
+def profiled(path):
+    """Runs the body under cProfile and saves the stats to `path`, with a text report in `path`.txt.
+
+    Worker threads started inside get a profiler each; their stats are added to
+    the main thread's. (Python 3.12+ profiles every thread from the one profiler.)
+    """
+    profilers = []
+
+    def profile_thread(frame, event, arg):
+        profiler = cProfile.Profile()
+        profilers.append(profiler)
+        profiler.enable()
+
+    main = cProfile.Profile()
+    if sys.version_info < (3, 12):
+        threading.setprofile(profile_thread)
+    main.enable()
+    try:
+        yield
+    finally:
+        main.disable()
+        threading.setprofile(None)
+        stats = pstats.Stats(main)
+        for profiler in profilers:
+            stats.add(profiler)
+        try:
+            stats.dump_stats(path)
+            with open(f"{path}.txt", 'w') as f:
+                pstats.Stats(path, stream=f).sort_stats('cumulative').print_stats(50)
+            print(f"[+] Profile saved to {path} (report: {path}.txt)")
+        except OSError as e:
+            print(f"[-] Error saving profile: {e}")
+
+class ConnectionStats:
+    """Thread-safe counters for requests, new connections and TLS handshakes.
+
+    Connect and TLS handshake times go to `metrics` (a ScanMetrics), when set.
+    """
+
+    def __init__(self, metrics=None):
+        self.lock = threading.Lock()
+        self.counts = {'requests': 0, 'connections': 0, 'tls_handshakes': 0, 'tls_resumed': 0}
+        self.metrics = metrics
+        self.local = threading.local()
+
+    def increment(self, name, amount=1):
+        with self.lock:
+            self.counts[name] += amount
+
+    def observe(self, phase, seconds):
+        if self.metrics is not None:
+            self.metrics.observe(phase, seconds)
+            self.metrics.add_setup(seconds)
+
+    def summary(self):
+        requests_sent = self.counts['requests']
+        connections = self.counts['connections']
+        if not requests_sent:
+            return None
+        reused = max(requests_sent - connections, 0) / requests_sent * 100
+        line = f"{requests_sent} requests over {connections} connections ({reused:.1f}% reused)"
+        if self.counts['tls_handshakes']:
+            line += f", TLS sessions resumed: {self.counts['tls_resumed']}/{self.counts['tls_handshakes']}"
+        return line
+
+class SessionCachingSSLSocket(ssl.SSLSocket):
+    def close(self):
+        # TLS 1.3 tickets arrive after the handshake, so the session is captured on close
+        if self.server_hostname and hasattr(self.context, 'tls_sessions'):
+            session = self.session
+            if session is not None and session.has_ticket:
+                self.context.tls_sessions[self.server_hostname] = session
+        super().close()
+
+class ResumingSSLContext(ssl.SSLContext):
+    """SSL context that offers the last TLS session seen for a host on new connections."""
+    sslsocket_class = SessionCachingSSLSocket
+
+    def setup(self, stats):
+        self.stats = stats
+        self.tls_sessions = {}
+        return self
+
+    def wrap_socket(self, sock, *args, server_hostname=None, session=None, **kwargs):
+        if session is None:
+            session = self.tls_sessions.get(server_hostname)
+        start = time.perf_counter()
+        ssl_sock = super().wrap_socket(sock, *args, server_hostname=server_hostname, session=session, **kwargs)
+        self.stats.local.tls = time.perf_counter() - start
+        self.stats.observe('tls', self.stats.local.tls)
+        self.stats.increment('tls_handshakes')
+        if ssl_sock.session_reused:
+            self.stats.increment('tls_resumed')
+        return ssl_sock
+
+def counting_pool(base, stats):
+    class CountingConnection(base.ConnectionCls):
+        def connect(self):
+            stats.increment('connections')
+            stats.local.tls = 0.0
+            start = time.perf_counter()
+            super().connect()
+            # The TLS handshake inside connect() is timed on its own
+            stats.observe('connect', time.perf_counter() - start - stats.local.tls)
+
+    class CountingPool(base):
+        ConnectionCls = CountingConnection
+    return CountingPool
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools share one SSL context and count new connections."""
+
+    def __init__(self, stats, ssl_context, **kwargs):
+        self.stats = stats
+        self.ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        pool_kwargs['ssl_context'] = self.ssl_context
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': counting_pool(HTTPConnectionPool, self.stats),
+            'https': counting_pool(HTTPSConnectionPool, self.stats),
+        }
+
+class HTTPSessionPool:
+    """Keep-alive requests sessions, either one per worker thread or one shared pool."""
+
+    def __init__(self, pool_size=10, mode='thread', metrics=None):
+        self.pool_size = pool_size
+        self.mode = mode
+        self.stats = ConnectionStats(metrics)
+        self.ssl_context = ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT).setup(self.stats)
+        self.ssl_context.load_verify_locations(requests.certs.where())
+        self.local = threading.local()
+        self.origins = {}  # scheme://host[:port] -> settings()
+        self.shared = self.new_session(pool_size) if mode == 'shared' else None
+
+    def new_session(self, maxsize):
+        session = requests.Session()
+        # requests would look up proxies, the CA bundle and ~/.netrc in the environment
+        # for every request; settings() does that once per host instead
+        session.trust_env = False
+        adapter = PooledAdapter(self.stats, self.ssl_context, pool_connections=max(self.pool_size, 10),
+                                pool_maxsize=maxsize, pool_block=self.mode == 'shared')
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def session(self):
+        if self.shared is not None:
+            return self.shared
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            # A worker thread only ever has one request in flight per host
+            session = self.local.session = self.new_session(1)
+        return session
+
+    def settings(self, url):
+        # The environment's proxy, CA bundle and netrc credentials for the host of url
+        end = url.find('/', url.find('//') + 2)
+        origin = url if end < 0 else url[:end]
+        settings = self.origins.get(origin)
+        if settings is None:
+            environment = requests.Session().merge_environment_settings(origin, {}, None, None, None)
+            settings = {'proxies': environment['proxies'], 'verify': environment['verify']}
+            auth = requests.utils.get_netrc_auth(origin)
+            if auth:
+                settings['auth'] = auth
+            self.origins[origin] = settings
+        return settings
+
+    def request(self, method, url, **kwargs):
+        self.stats.increment('requests')
+        return self.session().request(method, url, **self.settings(url), **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+# Spreads the 8 bits of a byte into 8 separate 16-bit counter lanes (see simhash)
+SIMHASH_SPREAD = [sum(1 << (16 * bit) for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+def simhash(tokens):
+    """64-bit simhash of a set of tokens (at most 65535)."""
+    # Instead of looping over 64 bits per token, each byte of a token's hash adds
+    # its bits into eight packed 16-bit counters, one accumulator per byte position.
+    c0 = c1 = c2 = c3 = c4 = c5 = c6 = c7 = 0
+    spread = SIMHASH_SPREAD
+    for token in tokens:
+        value = hash(token)
+        c0 += spread[value & 255]
+        c1 += spread[value >> 8 & 255]
+        c2 += spread[value >> 16 & 255]
+        c3 += spread[value >> 24 & 255]
+        c4 += spread[value >> 32 & 255]
+        c5 += spread[value >> 40 & 255]
+        c6 += spread[value >> 48 & 255]
+        c7 += spread[value >> 56 & 255]
+    half = len(tokens) // 2
+    result = 0
+    for byte, counters in enumerate((c0, c1, c2, c3, c4, c5, c6, c7)):
+        for bit in range(8):
+            if (counters >> (16 * bit)) & 0xFFFF > half:
+                result |= 1 << (8 * byte + bit)
+    return result
+
+class ResponseFingerprinter:
+    """Index of soft-404 / wildcard response fingerprints built from random probes.
+
+    Each response is reduced to its status, word and line counts, length and a 64-bit
+    simhash, after masking reflections of the requested word and adding any
+    redirect Location. A response is junk if its (status, words, lines) shape was
+    seen with a similar length, or if its simhash is within `max_distance` bits of a
+    baseline with the same status. Both checks are constant-time dict lookups; the
+    simhash is split into four 16-bit bands, and any hash within 3 bits of a baseline
+    shares at least one band with it exactly. Masking cannot tell a reflection from
+    the same word used as ordinary text ("a" in a page), so a response that does not
+    match with the word masked is checked once more as it came back.
+    """
+
+    def __init__(self, max_distance=3, length_tolerance=0.05):
+        self.max_distance = max_distance
+        self.length_tolerance = length_tolerance
+        self.shapes = {}
+        self.bands = [{} for _ in range(4)]
+        self.count = 0
+
+    @staticmethod
+    def normalize(content, word=None, location=None):
+        if location:
+            content = content + b'\nLocation: ' + location.encode('latin-1', 'replace')
+        for value in (word if isinstance(word, tuple) else (word,)):
+            if value:
+                for reflected in {value, quote(value)}:
+                    # A one-byte mask rather than nothing keeps the word and line counts intact
+                    content = content.replace(reflected.encode('utf-8', 'replace'), b'\0')
+        return content
+
+    @staticmethod
+    def digest(tokens):
+        return simhash(set(tokens[:4096]))
+
+    def add(self, status, content, word=None, location=None, size=None):
+        # size: the real body size when only part of it (or none, for HEAD) was read
+        content = self.normalize(content, word, location)
+        tokens = content[:65536].split()
+        length = len(content) if size is None else size
+        shape = self.shapes.setdefault((status, len(tokens), content.count(b'\n', 0, 65536)), [length, length])
+        shape[0] = min(shape[0], length)
+        shape[1] = max(shape[1], length)
+        if tokens:
+            digest = self.digest(tokens)
+            for band, index in enumerate(self.bands):
+                index.setdefault((digest >> (16 * band)) & 0xFFFF, []).append((status, digest))
+        self.count += 1
+
+    def matches(self, status, content, word=None, location=None, size=None):
+        if self.match(status, self.normalize(content, word, location), size):
+            return True
+        return bool(word) and self.match(status, self.normalize(content, None, location), size)
+
+    def match(self, status, content, size=None):
+        tokens = content[:65536].split()
+        length = len(content) if size is None else size
+        shape = self.shapes.get((status, len(tokens), content.count(b'\n', 0, 65536)))
+        if shape:
+            tolerance = max(32, shape[1] * self.length_tolerance)
+            if shape[0] - tolerance <= length <= shape[1] + tolerance:
+                return True
+        if not tokens:
+            # No body to compare (HEAD, or an empty page): every simhash would be 0, so
+            # the status and size shape alone decide
+            return False
+        # The simhash is only computed when the cheap shape check did not match
+        digest = self.digest(tokens)
+        for band, index in enumerate(self.bands):
+            for baseline_status, baseline in index.get((digest >> (16 * band)) & 0xFFFF, ()):
+                if baseline_status == status and (baseline ^ digest).bit_count() <= self.max_distance:
+                    return True
+        return False
+
+def parse_retry_after(value, limit=120):
+    """Returns the Retry-After delay in seconds (capped at `limit`), or None."""
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(delay, 0), limit)
+
+class RateController:
+    """AIMD concurrency controller with an optional requests-per-second ceiling.
+
+    In adaptive mode the in-flight limit doubles after each healthy window of
+    responses until the first sign of trouble, then grows by one per window
+    (additive increase). Throttling (429/503) halves it, and a window with too many
+    errors or a latency well above the best seen cuts it by a quarter
+    (multiplicative decrease). A Retry-After header pauses all new requests until it
+    expires, whether or not adaptive mode is on.
+    """
+
+    def __init__(self, max_concurrency=None, adaptive=False, max_rps=None, min_concurrency=1):
+        self.max_concurrency = max_concurrency or math.inf
+        self.min_concurrency = min_concurrency
+        self.adaptive = adaptive and max_concurrency is not None
+        if self.adaptive:
+            self.limit = float(max(min_concurrency, min(max_concurrency, 10)))
+        else:
+            self.limit = math.inf
+        self.max_rps = max_rps
+        self.tokens = max_rps or 0
+        self.token_time = time.monotonic()
+        self.in_flight = 0
+        self.paused_until = 0
+        self.slow_start = True
+        self.last_decrease = 0
+        self.base_latency = None
+        self.latency = None
+        self.window_responses = 0
+        self.window_errors = 0
+        self.totals = {'throttled': 0, 'errors': 0}
+        self.cond = threading.Condition()
+        self.waiters = collections.deque()  # (loop, future) of async tasks waiting for a free slot
+
+    def try_start(self):
+        # Called with the lock held; returns 0 once a request may start, else how long to wait
+        now = time.monotonic()
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.in_flight + 1 > self.limit:
+            return None
+        if self.max_rps:
+            self.tokens = min(self.max_rps, self.tokens + (now - self.token_time) * self.max_rps)
+            self.token_time = now
+            if self.tokens < 1:
+                return (1 - self.tokens) / self.max_rps
+            self.tokens -= 1
+        self.in_flight += 1
+        return 0
+
+    def acquire(self):
+        with self.cond:
+            while True:
+                wait = self.try_start()
+                if wait == 0:
+                    return
+                self.cond.wait(wait)
+
+    async def acquire_async(self):
+        # Tasks held back by the concurrency limit sleep until release() hands them a
+        # slot; pauses and the rps ceiling have a known end and are simply slept out
+        loop = asyncio.get_running_loop()
+        while True:
+            with self.cond:
+                wait = self.try_start()
+                if wait is None:
+                    woken = loop.create_future()
+                    self.waiters.append((loop, woken))
+            if wait == 0:
+                return
+            if wait is None:
+                await woken
+            else:
+                await asyncio.sleep(wait)
+
+    def wake(self, count):
+        # Called with the lock held: wakes up to `count` async waiters, oldest first
+        while count > 0 and self.waiters:
+            loop, woken = self.waiters.popleft()
+            loop.call_soon_threadsafe(self.woken, woken)
+            count -= 1
+
+    def woken(self, future):
+        if future.done():
+            # Its task was cancelled before the wakeup arrived; pass the slot on
+            with self.cond:
+                self.wake(1)
+        else:
+            future.set_result(None)
+
+    def release(self, latency=None, status=None, error=False, retry_after=None):
+        with self.cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+            throttled = status in THROTTLE_CODES
+            if throttled:
+                self.totals['throttled'] += 1
+            if error:
+                self.totals['errors'] += 1
+            if self.adaptive:
+                self.adjust(now, latency, throttled, error)
+            self.cond.notify_all()
+            free = self.limit - self.in_flight
+            if free >= 1:
+                self.wake(len(self.waiters) if free == math.inf else int(free))
+
+    def adjust(self, now, latency, throttled, error):
+        if throttled:
+            # At most one halving per second, so one burst of 429s doesn't collapse the limit
+            if now - self.last_decrease >= 1.0:
+                self.decrease(now, 0.5)
+            return
+        self.window_responses += 1
+        if error:
+            self.window_errors += 1
+        elif latency is not None:
+            self.latency = latency if self.latency is None else 0.9 * self.latency + 0.1 * latency
+            self.base_latency = latency if self.base_latency is None else min(self.base_latency, latency)
+        if self.window_responses < max(int(self.limit), 1):
+            return
+        congested = self.latency is not None and self.latency > 3 * self.base_latency
+        if self.window_errors > 0.1 * self.window_responses or congested:
+            self.decrease(now, 0.75)
+        elif self.slow_start:
+            self.limit = min(self.max_concurrency, self.limit * 2)
+        else:
+            self.limit = min(self.max_concurrency, self.limit + 1)
+        self.window_responses = self.window_errors = 0
+
+    def decrease(self, now, factor):
+        self.limit = max(self.min_concurrency, self.limit * factor)
+        self.slow_start = False
+        self.last_decrease = now
+        self.window_responses = self.window_errors = 0
+
+    def summary(self):
+        if not (self.adaptive or self.max_rps or any(self.totals.values())):
+            return None
+        line = f"{self.totals['throttled']} throttled, {self.totals['errors']} errors"
+        if self.adaptive:
+            line += f", final concurrency {int(self.limit)}"
+        return line
+
+class WordJobs:
+    """Job source for a single-target scan: (hound, index, word) for every word, in order."""
+
+    def __init__(self, hound, words):
+        self.hound = hound
+        self.words = enumerate(words)
+
+    async def next_async(self):
+        for index, word in self.words:
+            return self.hound, index, word
+        return None
+
+    def done(self, job):
+        self.hound.word_done(job[1])
+
+class WordProgress:
+    """Counts down the work items of the words in flight and reports each word to
+    `done` once the last of its items has finished (or at once if it has none)."""
+
+    def __init__(self, done):
+        self.done = done
+        self.remaining = {}
+        self.lock = threading.Lock()
+
+    def start(self, key, items):
+        if not items:
+            self.done(key)
+            return
+        with self.lock:
+            self.remaining[key] = items
+
+    def finish(self, key):
+        with self.lock:
+            self.remaining[key] -= 1
+            if self.remaining[key]:
+                return
+            del self.remaining[key]
+        self.done(key)
+
+class SeenSet:
+    """Thread-safe exact set of URLs already requested."""
+
+    def __init__(self):
+        self.items = set()
+        self.lock = threading.Lock()
+
+    def add(self, item):
+        # True if item was new
+        with self.lock:
+            if item in self.items:
+                return False
+            self.items.add(item)
+            return True
+
+class BloomFilter:
+    """Fixed-size stand-in for SeenSet on huge recursive scans.
+
+    Memory stays at about 1.8 bytes per expected item; in exchange roughly
+    `error` of new items are wrongly reported as seen (and skipped) once
+    `capacity` items have been added. Seen items are never reported as new.
+    """
+
+    def __init__(self, capacity, error=0.001):
+        self.size = max(64, int(-capacity * math.log(error) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.lock = threading.Lock()
+
+    def add(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8', 'surrogateescape'), digest_size=16).digest()
+        # Double hashing: k bit positions from two 64-bit halves of one digest
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        new = False
+        with self.lock:
+            for i in range(self.hashes):
+                bit = (h1 + i * h2) % self.size
+                if not self.bits[bit >> 3] & (1 << (bit & 7)):
+                    self.bits[bit >> 3] |= 1 << (bit & 7)
+                    new = True
+        return new
+
+class DirectoryFrontier:
+    """Feeds directories found by a recursive dir scan back into the running scan.
+
+    Each directory is queued once, calibrated on its own (soft-404 pages often
+    differ per directory) on a small background pool, and then added to the
+    TargetScheduler with its depth as priority, so shallower directories start
+    first and all of them share the scan's worker pool.
+    """
+
+    REDIRECTS = (301, 302, 303, 307, 308)
+
+    def __init__(self, max_depth, seen, hounds, threads=10):
+        self.max_depth = max_depth
+        self.seen = seen
+        self.hounds = hounds
+        self.scheduler = None
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(threads, 4)))
+
+    @staticmethod
+    def key(url):
+        # Directories share the seen set with probe URLs; keep their entries apart
+        return 'dir ' + url.rstrip('/') + '/'
+
+    def directory(self, url, result):
+        # The URL of the directory a hit points at, if it looks like one: a redirect
+        # to the same path plus '/', or a probe whose word itself ended in '/'
+        if result.status in self.REDIRECTS and result.location:
+            location = urljoin(url, result.location)
+            if location.split('?')[0] == url + '/':
+                return url + '/'
+            return None
+        if url.endswith('/'):
+            return url
+        return None
+
+    def discover(self, hound, url, result):
+        directory = self.directory(url, result)
+        if directory is None or hound.depth >= self.max_depth or not self.seen.add(self.key(directory)):
+            return
+        child = hound.descend(directory)
+        self.hounds.append(child)
+        self.scheduler.expect()
+        self.executor.submit(self.calibrate, child)
+
+    def calibrate(self, hound):
+        try:
+            hound.calibrate()
+        finally:
+            self.scheduler.add(hound, hound.depth)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+class TargetScheduler:
+    """Interleaves the words of many targets into one stream of (hound, index, word) jobs.
+
+    Targets are served round-robin, at most `window` of them at a time, and a
+    target with `per_target` words in flight is skipped until one finishes, so
+    every worker stays busy without all of them hitting the same host. Targets
+    can be added while the scan runs (recursive dir scans); queued targets
+    start in priority order.
+    """
+
+    def __init__(self, hounds, open_words, per_target=10, window=64):
+        self.queued = []  # heap of (priority, order, hound)
+        self.order = 0
+        self.active = collections.deque()
+        self.open_words = open_words
+        self.per_target = per_target
+        self.window = window
+        self.words = {}
+        self.in_flight = {}
+        self.running = 0  # jobs handed out and not done yet
+        self.expected = 0  # targets announced with expect() but not added yet
+        self.cond = threading.Condition()
+        self.loop = None
+        self.released = None  # asyncio.Event, created by the first async caller
+        self.finished = False
+        for hound in hounds:
+            self.push(hound, 0)
+
+    def push(self, hound, priority):
+        heapq.heappush(self.queued, (priority, self.order, hound))
+        self.order += 1
+
+    def expect(self):
+        # A target is on its way (e.g. still calibrating); don't finish before it arrives
+        with self.cond:
+            self.expected += 1
+
+    def add(self, hound, priority=0):
+        with self.cond:
+            self.expected -= 1
+            self.push(hound, priority)
+        self.wake()
+
+    def take(self):
+        # Returns the next job, or None when every active target is at its cap
+        # (or, with self.finished set, when there is nothing left to do at all)
+        with self.cond:
+            while True:
+                while self.queued and len(self.active) < self.window:
+                    hound = heapq.heappop(self.queued)[2]
+                    self.words[hound] = enumerate(self.open_words(hound))
+                    self.in_flight[hound] = 0
+                    self.active.append(hound)
+                if not self.active:
+                    # Jobs still running may yet add targets
+                    self.finished = not (self.running or self.expected)
+                    return None
+                exhausted = False
+                for _ in range(len(self.active)):
+                    hound = self.active.popleft()
+                    if self.in_flight[hound] >= self.per_target:
+                        self.active.append(hound)
+                        continue
+                    entry = next(self.words[hound], None)
+                    if entry is None:
+                        # Out of words; its slot in the window goes to the next queued target
+                        del self.words[hound]
+                        exhausted = True
+                        continue
+                    self.active.append(hound)
+                    self.in_flight[hound] += 1
+                    self.running += 1
+                    return (hound,) + entry
+                if not exhausted:
+                    return None
+
+    def next(self):
+        # Blocking take() for the thread engine
+        with self.cond:
+            while True:
+                job = self.take()
+                if job is not None or self.finished:
+                    return job
+                self.cond.wait()
+
+    async def next_async(self):
+        if self.released is None:
+            self.loop = asyncio.get_running_loop()
+            self.released = asyncio.Event()
+        while True:
+            job = self.take()
+            if job is not None or self.finished:
+                return job
+            self.released.clear()
+            await self.released.wait()
+
+    def done(self, job):
+        job[0].metrics.count('words')
+        with self.cond:
+            self.in_flight[job[0]] -= 1
+            self.running -= 1
+        self.wake()
+
+    def wake(self):
+        with self.cond:
+            self.cond.notify_all()
+        if self.released is not None:
+            # add() is called from calibration threads, not the event loop
+            self.loop.call_soon_threadsafe(self.released.set)
+
+class AsyncHTTPEngine:
+    """Sends HTTP probes from an asyncio event loop with a fixed in-flight limit."""
+
+    def __init__(self, hound, concurrency=500, timeout=5):
+        self.hound = hound
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+    def run(self, jobs):
+        asyncio.run(self._run(jobs))
+
+    async def _run(self, jobs):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=0, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        stats = self.hound.http.stats
+        metrics = self.hound.metrics
+        trace = aiohttp.TraceConfig()
+        # Phase timestamps go into the dict fetch() passes as trace_request_ctx
+        async def on_request_start(session, context, params):
+            stats.increment('requests')
+        async def on_dns_resolvehost_start(session, context, params):
+            context.trace_request_ctx['dns'] = time.perf_counter()
+        async def on_dns_resolvehost_end(session, context, params):
+            timing = context.trace_request_ctx
+            timing['dns'] = time.perf_counter() - timing['dns']
+            metrics.observe('dns', timing['dns'])
+        async def on_connection_create_start(session, context, params):
+            context.trace_request_ctx['connect'] = time.perf_counter()
+        async def on_connection_create_end(session, context, params):
+            stats.increment('connections')
+            timing = context.trace_request_ctx
+            metrics.observe('connect', time.perf_counter() - timing['connect'] - timing.get('dns', 0.0))
+        async def on_request_headers_sent(session, context, params):
+            context.trace_request_ctx['sent'] = time.perf_counter()
+        async def on_request_end(session, context, params):
+            context.trace_request_ctx['headers'] = time.perf_counter()
+        trace.on_request_start.append(on_request_start)
+        trace.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+        trace.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+        trace.on_connection_create_start.append(on_connection_create_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_request_headers_sent.append(on_request_headers_sent)
+        trace.on_request_end.append(on_request_end)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, trace_configs=[trace]) as session:
+            # Every worker pulls from the same word iterator, so at most
+            # `concurrency` requests are in flight at any time.
+            backlog = collections.deque()
+            progress = WordProgress(jobs.done)
+            workers = [asyncio.create_task(self._worker(session, jobs, backlog, progress))
+                       for _ in range(self.concurrency)]
+            await asyncio.gather(*workers)
+
+    async def _worker(self, session, jobs, backlog, progress):
+        # The probes of a word after its first go into a backlog every worker drains
+        # before taking a new word, so extension variants are sent side by side
+        while self.hound.is_running:
+            if backlog:
+                job, probe = backlog.popleft()
+            else:
+                job = await jobs.next_async()
+                if job is None:
+                    return
+                probes = job[0].build_probes(job[2])
+                progress.start(job, len(probes))
+                if not probes:
+                    continue
+                probe = probes[0]
+                backlog.extend((job, other) for other in probes[1:])
+            hound, index, word = job
+            current_word.set(index)
+            url, headers, label, data = probe
+            result = await self.fetch(session, hound, url, headers, data)
+            if result is not None:
+                hound.handle_response(label, result, word)
+            progress.finish(job)
+
+    async def fetch(self, session, hound, url, headers, data=None):
+        # Async counterpart of ReconHound.fetch: returns a ProbeResult or None. Method, body
+        # limit and retries come from the hound the probe belongs to, since in a batch each
+        # target may have fallen back from HEAD on its own
+        rate = hound.rate
+        metrics = hound.metrics
+        method = hound.request_method
+        for attempt in range(hound.retries + 1):
+            await rate.acquire_async()
+            start = time.monotonic()
+            sent = time.perf_counter()
+            timing = {}
+            metrics.started()
+            try:
+                verb = 'POST' if data is not None else 'HEAD' if method == 'head' else 'GET'
+                async with session.request(verb, url, headers=headers, data=data,
+                                           allow_redirects=False, trace_request_ctx=timing) as response:
+                    if method == 'head':
+                        content = b''
+                    elif method == 'partial':
+                        content = b''
+                        while len(content) < hound.max_body:
+                            chunk = await response.content.read(hound.max_body - len(content))
+                            if not chunk:
+                                break
+                            content += chunk
+                    else:
+                        content = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                metrics.finished(error=e)
+                rate.release(error=True)
+                if attempt < hound.retries:
+                    await asyncio.sleep(0.5 * 2 ** attempt)
+                    continue
+                return None
+            except Exception as e:
+                # As in ReconHound.fetch: not worth retrying, but the slot must be released
+                metrics.finished(error=e)
+                rate.release(error=True)
+                return None
+            end = time.perf_counter()
+            # Time before the request went out (queueing for a connection, DNS, connect) is not server time
+            metrics.observe_request(sent, timing.get('headers', end), end, timing.get('sent', sent) - sent)
+            metrics.finished(response.status)
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            rate.release(time.monotonic() - start, response.status, retry_after=retry_after)
+            if response.status in THROTTLE_CODES and attempt < hound.retries:
+                if not retry_after:
+                    await asyncio.sleep(0.5 * 2 ** attempt)
+                continue
+            size = len(content) if method == 'get' else content_length(response.headers)
+            return ProbeResult(response.status, content, len(content) if size is None else size,
+                               response.headers.get('Location'))
+        return None
+
+def read_targets(path):
+    """Reads a -U targets file: one target per line, blank lines and # comments skipped."""
+    try:
+        with open(path) as f:
+            targets = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    except OSError as e:
+        print(f"[-] Error reading targets file: {e}")
+        return None
+    if not targets:
+        print(f"[-] Error: no targets in '{path}'")
+    # Duplicates would only scan the same host twice
+    return list(dict.fromkeys(targets))
+
+def parse_dns_types(spec):
+    types = [rdtype.strip().upper() for rdtype in spec.split(',') if rdtype.strip()]
+    unknown = [rdtype for rdtype in types if rdtype not in DNS_TYPES]
+    if unknown or not types:
+        raise argparse.ArgumentTypeError(f"record types must be among {', '.join(DNS_TYPES)}")
+    return types
+
+def parse_nameservers(spec):
+    """Parses a comma-separated list (or a file, one per line) of ip[:port] nameservers."""
+    if os.path.isfile(spec):
+        with open(spec) as f:
+            entries = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    else:
+        entries = [entry.strip() for entry in spec.split(',') if entry.strip()]
+    nameservers = []
+    for entry in entries:
+        if entry.startswith('['):
+            host, _, port = entry[1:].partition(']')
+            port = port.lstrip(':')
+        elif entry.count(':') == 1:
+            host, port = entry.split(':')
+        else:
+            host, port = entry, ''
+        nameservers.append((host, int(port) if port else 53))
+    return nameservers
+
+# Outcome of resolving one name: the CNAME chain followed (without the name itself)
+# and the addresses found at its end
+DNSResult = collections.namedtuple('DNSResult', 'name chain addresses')
+
+class DNSCache:
+    """TTL-bounded, thread-safe cache of DNS answers, kept per owner name.
+
+    CNAMEs are stored as links (name -> target) and address sets under the name
+    that owns them, so once one subdomain has been resolved through a CDN
+    alias, every other subdomain pointing at the same alias only needs its own
+    CNAME link; the alias's addresses come from the cache. Negative answers
+    (NXDOMAIN, no data) are cached for the zone's SOA minimum. Least recently
+    used entries are evicted beyond `size`.
+    """
+
+    NEGATIVE_TTL = 60
+    MAX_CHAIN = 16
+
+    def __init__(self, size=100000):
+        self.size = size
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name, rdtype):
+        entry = self.entries.get((name, rdtype))
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self.entries[(name, rdtype)]
+            return None
+        self.entries.move_to_end((name, rdtype))
+        return entry[1]
+
+    def put(self, name, rdtype, value, ttl):
+        self.entries[(name, rdtype)] = (time.monotonic() + ttl, value)
+        self.entries.move_to_end((name, rdtype))
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def follow(self, name, rdtype):
+        # Walks cached CNAME links from name. Returns (chain, addresses), with
+        # addresses None when the end of the chain is not cached for rdtype yet
+        with self.lock:
+            chain = []
+            current = name
+            for _ in range(self.MAX_CHAIN):
+                target = self.get(current, 'CNAME')
+                if target is None:
+                    break
+                chain.append(target)
+                current = target
+            addresses = self.get(current, rdtype)
+            if addresses is None:
+                addresses = [] if self.get(current, 'NXDOMAIN') is not None else None
+            return chain, addresses
+
+    def counts(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def count(self, hit):
+        # One per (name, type) a resolution asked for, however many follow() calls it took
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def store(self, name, rdtype, response):
+        # Caches what a response says about name (and everything its CNAME chain passed through)
+        negative_ttl = self.NEGATIVE_TTL
+        for rrset in response.authority:
+            if rrset.rdtype == dns.rdatatype.SOA:
+                negative_ttl = min(rrset.ttl, rrset[0].minimum)
+        wanted = dns.rdatatype.from_text(rdtype)
+        with self.lock:
+            current = name
+            for _ in range(self.MAX_CHAIN):
+                link = next((rrset for rrset in response.answer if rrset.rdtype == dns.rdatatype.CNAME
+                             and rrset.name.to_text(omit_final_dot=True).lower() == current), None)
+                if link is None:
+                    break
+                target = link[0].target.to_text(omit_final_dot=True).lower()
+                self.put(current, 'CNAME', target, link.ttl)
+                current = target
+            if rdtype == 'CNAME':
+                if response.rcode() == dns.rcode.NXDOMAIN:
+                    self.put(current, 'NXDOMAIN', True, negative_ttl)
+                return
+            records = next((rrset for rrset in response.answer if rrset.rdtype == wanted
+                            and rrset.name.to_text(omit_final_dot=True).lower() == current), None)
+            if records is not None:
+                self.put(current, rdtype, [r.to_text() for r in records], records.ttl)
+            elif response.rcode() == dns.rcode.NXDOMAIN:
+                self.put(current, 'NXDOMAIN', True, negative_ttl)
+            else:
+                self.put(current, rdtype, [], negative_ttl)
+
+    def summary(self):
+        lookups = self.hits + self.misses
+        if not lookups:
+            return None
+        return f"{self.hits}/{lookups} DNS lookups answered from cache"
+
+def resolution_steps(cache, name, rdtypes):
+    """Generator behind both DNS engines: yields (qname, rdtype) for every query the
+    cache cannot answer, is sent back the response, and returns a DNSResult.
+
+    Only the first address type has to ask about `name` itself; later ones query
+    the end of its CNAME chain, which other names may already have resolved.
+    """
+    name = name.lower()
+    chain = []
+    addresses = []
+    for rdtype in rdtypes:
+        if rdtype == 'CNAME':
+            continue
+        queried = False
+        for _ in range(DNSCache.MAX_CHAIN):
+            chain, found = cache.follow(name, rdtype)
+            if found is not None:
+                addresses.extend(found)
+                break
+            qname = chain[-1] if chain else name
+            queried = True
+            response = yield qname, rdtype
+            cache.store(qname, rdtype, response)
+        cache.count(not queried)
+    if not any(rdtype != 'CNAME' for rdtype in rdtypes):
+        chain, _ = cache.follow(name, 'CNAME')
+        cache.count(bool(chain))
+        if not chain:
+            response = yield name, 'CNAME'
+            cache.store(name, 'CNAME', response)
+            chain, _ = cache.follow(name, 'CNAME')
+    return DNSResult(name, chain, addresses)
+
+def resolve_blocking(steps, query):
+    """Drives resolution_steps with a blocking query(qname, rdtype) -> response."""
+    try:
+        request = next(steps)
+        while True:
+            request = steps.send(query(*request))
+    except StopIteration as done:
+        return done.value
+
+async def resolve_async(steps, query):
+    """Drives resolution_steps with a coroutine query(qname, rdtype) -> response."""
+    try:
+        request = next(steps)
+        while True:
+            request = steps.send(await query(*request))
+    except StopIteration as done:
+        return done.value
+
+class WildcardProfile:
+    """What a wildcard DNS zone answers for names that don't exist.
+
+    Built from random probe names: the CNAME targets they end at and the pool
+    of addresses they resolve to. A wildcard that rotates its IPs between answers
+    is sampled until the pool stops growing, and a name that resolves to addresses
+    outside the pool is held against more random names before it counts, since
+    the calibration may have missed part of the pool.
+    """
+
+    def __init__(self, sample):
+        self.sample = sample  # resolves a batch of fresh random names to DNSResults
+        self.targets = set()
+        self.addresses = set()
+        self.answers = set()  # distinct address sets handed out
+        self.answered = 0
+        self.handed_out = 0
+        self.checked = set()  # addresses outside the pool that re-checks did not turn up
+        self.lock = threading.Lock()
+
+    def add(self, results):
+        # Returns whether the results showed any target or address not seen before
+        known = len(self.targets) + len(self.addresses)
+        for result in results:
+            if result.chain:
+                self.targets.add(result.chain[-1])
+            elif result.addresses:
+                self.addresses.update(result.addresses)
+                self.answers.add(frozenset(result.addresses))
+                self.answered += 1
+                self.handed_out += len(result.addresses)
+        return len(self.targets) + len(self.addresses) > known
+
+    def patience(self):
+        # Answers in a row without anything new before the pool counts as complete: a
+        # pool of n addresses handing out k per answer shows any one of them within
+        # 5n/k answers with 99% certainty
+        per_answer = self.handed_out / self.answered if self.answered else 1
+        return max(20, 5 * len(self.addresses) / per_answer)
+
+    def explore(self, wanted=frozenset(), rounds=100):
+        # Samples until patience() answers in a row add nothing, or every address in
+        # `wanted` has turned up
+        quiet = 0
+        for _ in range(rounds):
+            if quiet >= self.patience() or (wanted and wanted <= self.addresses):
+                return
+            results = self.sample()
+            if not results:
+                return  # the zone stopped answering; nothing more to learn
+            quiet = 0 if self.add(results) else quiet + len(results)
+
+    def needs_check(self, result):
+        # Whether matches() would sample the zone (and block) before deciding
+        if result.chain or len(self.answers) < 2:
+            return False
+        unseen = set(result.addresses) - self.addresses
+        return bool(unseen) and not unseen <= self.checked
+
+    def matches(self, result):
+        if result.chain:
+            return result.chain[-1] in self.targets
+        addresses = set(result.addresses)
+        if not addresses:
+            return False
+        if self.needs_check(result):
+            with self.lock:
+                unseen = addresses - self.addresses - self.checked
+                if unseen:
+                    self.explore(unseen)
+                    self.checked |= unseen - self.addresses
+        return addresses <= self.addresses
+
+    def describe(self):
+        parts = []
+        if self.targets:
+            parts.append(f"CNAME {', '.join(sorted(self.targets))}")
+        if self.addresses:
+            parts.append(f"{len(self.addresses)} addresses")
+        return '; '.join(parts)
+
+class TokenBucket:
+    """Asyncio token bucket allowing `rate` acquisitions per second."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+
+    async def take(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class NameserverProtocol(asyncio.DatagramProtocol):
+    """One UDP socket per nameserver; replies are matched to pending queries by DNS id."""
+
+    def __init__(self):
+        self.transport = None
+        self.pending = {}
+
+    def connection_made(self, transport):
+        self.transport = transport
+        # Thousands of replies can land at once; the default receive buffer drops them
+        sock = transport.get_extra_info('socket')
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        except OSError:
+            pass
+
+    def datagram_received(self, data, addr):
+        if len(data) < 12:
+            return
+        future = self.pending.pop(int.from_bytes(data[:2], 'big'), None)
+        if future is not None and not future.done():
+            future.set_result(data)
+
+    def error_received(self, exc):
+        pass
+
+class AsyncDNSResolver:
+    """Resolves names over raw UDP from one event loop, spreading queries across nameservers.
+
+    Each nameserver gets its own optional queries-per-second limit. Timeouts and
+    SERVFAIL/REFUSED answers are retried on the next nameserver with exponential backoff.
+    """
+
+    def __init__(self, nameservers, rate=None, retries=2, timeout=2.0, backoff=0.2, metrics=None):
+        self.nameservers = nameservers
+        self.metrics = metrics or ScanMetrics()
+        self.buckets = [TokenBucket(rate) if rate else None for _ in nameservers]
+        self.retries = retries
+        self.timeout = timeout
+        self.backoff = backoff
+        self.next_server = 0
+        self.endpoints = []
+
+    async def open(self):
+        loop = asyncio.get_running_loop()
+        for host, port in self.nameservers:
+            _, protocol = await loop.create_datagram_endpoint(NameserverProtocol, remote_addr=(host, port))
+            self.endpoints.append(protocol)
+
+    def close(self):
+        for protocol in self.endpoints:
+            protocol.transport.close()
+
+    async def exchange(self, request, index):
+        protocol = self.endpoints[index]
+        query_id = random.getrandbits(16)
+        while query_id in protocol.pending:
+            query_id = random.getrandbits(16)
+        request.id = query_id
+        loop = asyncio.get_running_loop()
+        future = protocol.pending[query_id] = loop.create_future()
+        timer = loop.call_later(self.timeout, lambda: future.done() or future.set_exception(dns.exception.Timeout()))
+        try:
+            protocol.transport.sendto(request.to_wire())
+            response = dns.message.from_wire(await future)
+        finally:
+            timer.cancel()
+            protocol.pending.pop(query_id, None)
+        if response.flags & dns.flags.TC:
+            host, port = self.nameservers[index]
+            response = await dns.asyncquery.tcp(request, host, timeout=self.timeout, port=port)
+        return response
+
+    async def query(self, name, rdtype='A'):
+        request = dns.message.make_query(name, rdtype)
+        for attempt in range(self.retries + 1):
+            index = self.next_server
+            self.next_server = (index + 1) % len(self.nameservers)
+            if self.buckets[index]:
+                await self.buckets[index].take()
+            self.metrics.started()
+            start = time.perf_counter()
+            try:
+                response = await self.exchange(request, index)
+            except (dns.exception.DNSException, OSError) as e:
+                self.metrics.finished(error=e)
+                response = None
+            else:
+                self.metrics.observe('dns', time.perf_counter() - start)
+                self.metrics.finished(dns.rcode.to_text(response.rcode()))
+            if response is not None and response.rcode() in (dns.rcode.NOERROR, dns.rcode.NXDOMAIN):
+                return response
+            if attempt < self.retries:
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+        raise dns.exception.Timeout()
+
+    async def resolve(self, name, rdtype='A'):
+        # Returns the record values of `rdtype` at the end of any CNAME chain, or [] if none exist
+        response = await self.query(name, rdtype)
+        wanted = dns.rdatatype.from_text(rdtype)
+        return [r.to_text() for rrset in response.answer if rrset.rdtype == wanted for r in rrset]
+
+class AsyncDNSEngine:
+    """Resolves subdomain candidates with thousands of queries in flight."""
+
+    def __init__(self, hound, nameservers, concurrency=1000, rate=None, retries=2, timeout=2.0):
+        self.hound = hound
+        self.nameservers = nameservers
+        self.concurrency = concurrency
+        self.rate = rate
+        self.retries = retries
+        self.timeout = timeout
+
+    def run(self, jobs):
+        asyncio.run(self._run(jobs))
+
+    async def _run(self, jobs):
+        resolver = AsyncDNSResolver(self.nameservers, self.rate, self.retries, self.timeout,
+                                    metrics=self.hound.metrics)
+        await resolver.open()
+        try:
+            workers = [asyncio.create_task(self._worker(resolver, jobs))
+                       for _ in range(self.concurrency)]
+            await asyncio.gather(*workers)
+        finally:
+            resolver.close()
+
+    async def _worker(self, resolver, jobs):
+        while self.hound.is_running:
+            job = await jobs.next_async()
+            if job is None:
+                return
+            hound, index, subdomain = job
+            current_word.set(index)
+            full_domain = f"{subdomain}.{hound.target}"
+            try:
+                steps = resolution_steps(hound.dns_cache, full_domain, hound.dns_types)
+                result = await resolve_async(steps, resolver.query)
+                if hound.wildcard and hound.wildcard.needs_check(result):
+                    # Re-checking against a rotating wildcard resolves more names; keep it off the loop
+                    await asyncio.to_thread(hound.handle_subdomain, result)
+                else:
+                    hound.handle_subdomain(result)
+            except dns.exception.DNSException:
+                pass
+            jobs.done(job)
 
 class ReconHound:
     def __init__(self):
@@ -32,67 +2489,137 @@ class ReconHound:
         self.found_paths = []
         self.found_subdomains = []
         self.found_vhosts = []
+        self.found_counts = {'paths': 0, 'subdomains': 0, 'vhosts': 0}
+        self.results_lock = threading.Lock()
+        self.sink = None  # streaming output; findings are not kept in memory when set
         self.is_running = True
         self.start_time = time.time()
         self.current_mode = None
         self.target = None
         self.wordlist = None
+        self.extra_wordlists = []  # further -w lists of a multi-placeholder fuzz scan
+        self.keywords = ['FUZZ']  # placeholder each wordlist fills, in -w order
+        self.attack = 'clusterbomb'  # how several wordlists are combined: clusterbomb or pitchfork
+        self.headers = []  # -H (name, value) pairs, which may contain placeholders
+        self.data = None  # --data request body; sent with POST when set
         self.threads = 10
+        self.engine = 'thread'
+        self.concurrency = 500
         self.extensions = None
         self.param = None
         self.output_file = None
-        self.wildcard_ips = None
-        self.vhost_wildcard_hashes = None  # for vhost wildcard detection
+        self.wildcard = None  # WildcardProfile of the target zone, if it has one
+        self.batch = []  # per-target hounds of a -U batch scan (and directories of a recursive one)
+        self.group = None  # target name findings are grouped under in batch output
+        self.max_depth = 0  # recursive dir scans: directory levels below -u to descend
+        self.depth = 0
+        self.bloom_size = None
+        self.frontier = None
+        self.per_target = 10
+        self.shard = None  # (index, count) in a --workers child process
+        self.merged = set()  # labels of findings merged from workers
+        self.merge_lock = threading.Lock()
+        self.calibration = True
+        self.fingerprints = None  # soft-404 / wildcard baselines from calibrate()
+        self.baselines = None  # (mode, target) -> calibration kept across a remote worker's chunks
+        self.template = None  # ProbeTemplate of the target, built by the first build_probes()
+        self.metrics = ScanMetrics()
+        self.profile = None  # --profile output path
+        self.http = HTTPSessionPool(metrics=self.metrics)
+        self.rate = RateController()
+        self.retries = 2
+        self.request_method = 'get'  # 'head' or 'partial' skip downloading full bodies
+        self.max_body = 65536
+        self.checkpoint = None
+        self.resumed_labels = set()  # findings restored from a checkpoint
+        self.nameservers = None
+        self.resolver = dns.resolver.get_default_resolver()
+        self.dns_rate = None
+        self.dns_retries = 2
+        self.dns_timeout = 2.0
+        self.dns_types = ['A', 'CNAME']
+        self.dns_cache = DNSCache()
         signal.signal(signal.SIGINT, self.signal_handler)
 
     def detect_subdomain_wildcard(self, domain, tests=10):
-        wildcard_ips = set()
-        for _ in range(tests):
-            test_sub = f"{random.randint(100000,999999)}.{domain}"
+        # Resolves random names in parallel; if they exist, the zone has a wildcard and
+        # its profile holds every CNAME target and address they came back with. A
+        # rotating wildcard is sampled again while new addresses keep turning up
+        if self.baselines is not None and ('sub', domain) in self.baselines:
+            return self.baselines[('sub', domain)]
+        profile = WildcardProfile(lambda: self.sample_names(domain, tests))
+        results = profile.sample()
+        # One stray answer can be a coincidence; two random names resolving is not
+        if len(results) >= 2:
+            profile.add(results)
+            profile.explore()
+        else:
+            profile = None
+        if self.baselines is not None:
+            self.baselines[('sub', domain)] = profile
+        return profile
+
+    def sample_names(self, domain, count):
+        # Resolves `count` random names under domain; returns those that exist
+        def probe(name):
             try:
-                answers = dns.resolver.resolve(test_sub, 'A')
-                if answers:
-                    ips = frozenset(r.to_text() for r in answers)
-                    wildcard_ips.add(ips)
-            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.resolver.Timeout):
-                   continue
-        # If all tests resolve to the same IPs, it's a wildcard
-        if len(wildcard_ips) == 1:
-              return list(wildcard_ips.pop())
-        return None
+                return self.resolve_subdomain(name)
+            except dns.exception.DNSException:
+                return None
+
+        names = [f"{random.randint(100000,999999)}.{domain}" for _ in range(count)]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=count) as executor:
+            return [result for result in executor.map(probe, names)
+                    if result is not None and (result.addresses or result.chain)]
     
-    def detect_vhost_wildcard(self, ip, base_domain, tests=10):
-        content_hashes = []
-        for _ in range(tests):
-            test_host = f"{random.randint(100000,999999)}.{base_domain}"
-            url = f"http://{ip}/"
-            headers = {'User-Agent': self.random_user_agent(), 'Host': test_host}
-            try:
-                response = requests.get(url, headers=headers, allow_redirects=False, timeout=5)
-                content_hashes.append(hashlib.md5(response.content).hexdigest())
-            except requests.RequestException:
-                   continue
-        if content_hashes and len(set(content_hashes)) == 1:
-            return set(content_hashes)
-        return None 
-        
     def print_banner(self):
         print("===============================================================")
         print(f" ReconHound on {self.current_mode} mode")
         print("===============================================================")
         print(f"[+] Target:         {self.target}")
-        print(f"[+] Wordlist:       {self.wordlist}")
-        print(f"[+] Threads:        {self.threads}")
+        if self.extra_wordlists:
+            for keyword, path in zip(self.keywords, [self.wordlist] + self.extra_wordlists):
+                print(f"[+] Wordlist:       {path} ({keyword})")
+            print(f"[+] Attack:         {self.attack}")
+        else:
+            print(f"[+] Wordlist:       {self.wordlist}")
+        if self.engine == 'async':
+            print(f"[+] Engine:         async (concurrency: {self.concurrency})")
+        else:
+            print(f"[+] Threads:        {self.threads}")
         if self.current_mode == 'dir' and self.extensions:
             print(f"[+] Extensions:     {self.extensions}")
         elif self.current_mode == 'fuzz':
             print(f"[+] Parameter:      {self.param}")
         elif self.current_mode == 'fuzzany':
-            print(f"[+] Fuzzing all 'FUZZ' tokens in URL")
+            print(f"[+] Fuzzing all {'/'.join(self.keywords)} tokens in URL")
+        elif self.current_mode == 'sub' and self.nameservers:
+            print(f"[+] Resolvers:      {', '.join(f'{host}:{port}' for host, port in self.nameservers)}")
+        if self.current_mode == 'sub':
+            print(f"[+] Record types:   {', '.join(self.dns_types)}")
+            if self.wildcard:
+                print(f"[+] Wildcard:       {self.wildcard.describe()} (filtered)")
         elif self.current_mode == 'vhost':
             print(f"[+] Base Domain:    {self.base_domain}")
             print(f"[+] IP Address:    {self.ip_address}")
         print(f"[+] Status codes:   200,204,301,302,307,401,403")
+        if self.shard:
+            print(f"[+] Workers:        {self.shard[1]} processes")
+        if self.frontier:
+            seen = f"Bloom filter for {self.bloom_size} URLs" if self.bloom_size else "exact set"
+            print(f"[+] Recursion:      {self.max_depth} levels (seen URLs: {seen})")
+        if self.batch:
+            print(f"[+] Per target:     {self.per_target} words in flight")
+            calibrated = sum(1 for hound in self.batch if hound.fingerprints or hound.wildcard)
+            print(f"[+] Calibration:    {calibrated}/{len(self.batch)} targets with wildcard or soft-404 baselines")
+        if self.data is not None:
+            print(f"[+] Method:         POST ({self.data})")
+        elif self.request_method != 'get' and self.current_mode != 'sub':
+            print(f"[+] Method:         {self.request_method}")
+        for name, value in self.headers:
+            print(f"[+] Header:         {name}: {value}")
+        if self.fingerprints:
+            print(f"[+] Calibration:    {self.fingerprints.count} soft-404 fingerprints")
         print("===============================================================")
         print("Developed By Sreeraj | GitHub: https://github.com/s-r-e-e-r-a-j")
         print("===============================================================\n")
@@ -102,12 +2629,23 @@ class ReconHound:
 
     def signal_handler(self, sig, frame):
         self.is_running = False
+        for hound in self.batch:
+            hound.is_running = False
         print("\n[!] Received interrupt signal. Shutting down...")
+        if self.checkpoint and self.checkpoint.hound is self:
+            self.checkpoint.save()
+            print(f"[+] Progress saved to {self.checkpoint.path} (resume with --resume)")
         self.save_partial_results()
         sys.exit(0)
 
     def save_partial_results(self):
-        if self.output_file:
+        if self.sink:
+            try:
+                if self.sink.close(final=self.checkpoint is None):
+                    print(f"[+] Partial results saved to {self.output_file}")
+            except IOError as e:
+                print(f"[-] Error saving partial results: {str(e)}")
+        elif self.output_file:
             try:
                 with open(self.output_file, 'w') as f:
                     if self.current_mode in ['dir', 'fuzz', 'fuzzany']:
@@ -120,118 +2658,382 @@ class ReconHound:
             except IOError as e:
                 print(f"[-] Error saving partial results: {str(e)}")
 
-    def check_url(self, url, word, extensions=None):
+    def send_probe(self, word, probe):
+        # Thread-engine work item: one request built for `word` by build_probes()
         if not self.is_running:
             return
-        try:
-            headers = {'User-Agent': self.random_user_agent()}
-
-            # Always check base word
-            test_url = f"{url.rstrip('/')}/{word}"
-            self.make_request(test_url, headers)
-
-            # Then check each word+extension if provided
-            if extensions:
-                for ext in extensions:
-                    test_url_ext = f"{url.rstrip('/')}/{word}{ext}"
-                    self.make_request(test_url_ext, headers)
-        except requests.RequestException:
-            pass
+        url, headers, label, data = probe
+        result = self.fetch(url, headers, data)
+        if result is not None:
+            self.handle_response(label, result, word)
+
+    def probe_items(self, word):
+        return [(word, probe) for probe in self.build_probes(word)]
+
+    def fetch(self, url, headers, data=None):
+        # Sends one probe through the rate controller and returns a ProbeResult. Throttled
+        # (429/503) and failed requests are retried with backoff instead of being dropped.
+        for attempt in range(self.retries + 1):
+            self.rate.acquire()
+            start = time.monotonic()
+            self.metrics.started()
+            try:
+                result, retry_after = self.send(url, headers, self.request_method, data)
+            except requests.RequestException as e:
+                self.metrics.finished(error=e)
+                self.rate.release(error=True)
+                if attempt < self.retries and self.is_running:
+                    time.sleep(0.5 * 2 ** attempt)
+                    continue
+                return None
+            except Exception as e:
+                # Not a network failure (e.g. a word that can't be encoded into a header), so a
+                # retry would fail the same way; the slot still has to go back to the controller
+                self.metrics.finished(error=e)
+                self.rate.release(error=True)
+                return None
+            self.metrics.finished(result.status)
+            self.rate.release(time.monotonic() - start, result.status, retry_after=retry_after)
+            if result.status in THROTTLE_CODES and attempt < self.retries and self.is_running:
+                if not retry_after:
+                    time.sleep(0.5 * 2 ** attempt)
+                continue
+            return result
+        return None
+
+    def send(self, url, headers, method='get', data=None):
+        # One request; 'head' reads no body and 'partial' at most max_body bytes,
+        # taking the size from Content-Length instead of downloading everything.
+        # A request with a body is a POST
+        start = time.perf_counter()
+        self.metrics.take_setup()
+        if data is not None:
+            response = self.http.request('POST', url, headers=headers, data=data, allow_redirects=False,
+                                         timeout=5, stream=method == 'partial')
+            with response:
+                content = response.raw.read(self.max_body, decode_content=True) if method == 'partial' else response.content
+            size = len(content) if method == 'get' else content_length(response.headers)
+        elif method == 'get':
+            response = self.http.get(url, headers=headers, allow_redirects=False, timeout=5)
+            content = response.content
+            size = len(content)
+        elif method == 'head':
+            response = self.http.request('HEAD', url, headers=headers, allow_redirects=False, timeout=5)
+            content = b''
+            size = content_length(response.headers)
+        else:
+            response = self.http.get(url, headers=headers, allow_redirects=False, timeout=5, stream=True)
+            with response:
+                content = response.raw.read(self.max_body, decode_content=True)
+            size = content_length(response.headers)
+        self.metrics.observe_request(start, start + response.elapsed.total_seconds(), time.perf_counter(),
+                                     self.metrics.take_setup())
+        result = ProbeResult(response.status_code, content, len(content) if size is None else size,
+                             response.headers.get('Location'))
+        return result, parse_retry_after(response.headers.get('Retry-After'))
+
+    def handle_response(self, label, result, word=None):
+        # Shared by the thread and async engines so both produce the same records
+        if result.status not in STATUS_CODES:
+            return
+        entry = {
+            'vhost' if self.current_mode == 'vhost' else 'url': label,
+            'status': result.status,
+            'size': result.size
+        }
+        payload = self.payload(word)
+        if payload:
+            entry['payload'] = payload
+        name = finding_label(entry)[1]
+        if name in self.resumed_labels:
+            return
+        if self.fingerprints and self.fingerprints.matches(result.status, result.content, word,
+                                                           result.location, result.size):
+            return
+        if self.frontier is not None and self.is_running:
+            self.frontier.discover(self, label, result)
+        self.record('vhosts' if self.current_mode == 'vhost' else 'paths', entry)
+        if self.shard is None:
+            print(f"[+] Found: {name} (Status: {result.status})")
+
+    def payload(self, word):
+        # Placeholder values a fuzz finding's URL does not show (those sent in headers or the body)
+        if self.current_mode not in ('fuzz', 'fuzzany') or word is None:
+            return None
+        values = self.placeholder_values(word)
+        hidden = {keyword: value for keyword, value in values.items() if keyword not in self.target}
+        return hidden or None
+
+    def calibrate(self, probes=8):
+        # Requests random words in the current mode to learn what soft-404 and
+        # wildcard responses look like before the real scan starts
+        key = (self.current_mode, self.target)
+        if self.baselines is not None and key in self.baselines:
+            self.fingerprints, self.request_method = self.baselines[key]
+            return
+        self.learn_fingerprints(probes)
+        if self.baselines is not None:
+            self.baselines[key] = (self.fingerprints, self.request_method)
+
+    def learn_fingerprints(self, probes):
+        self.fingerprints = None
+        alphabet = string.ascii_lowercase + string.digits
+        words = [''.join(random.choices(alphabet, k=8 + 3 * i)) for i in range(probes)]
+        if self.extra_wordlists:
+            words = [tuple(''.join(random.choices(alphabet, k=len(word))) for _ in self.keywords) for word in words]
+        if self.request_method == 'head':
+            self.check_head(words[:2])
+        if not self.calibration:
+            return
+        fingerprints = ResponseFingerprinter()
+        jobs = [(word, url, headers, data) for word in words for url, headers, _, data in self.build_probes(word)]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=probes) as executor:
+            results = executor.map(lambda job: self.fetch(*job[1:]), jobs)
+            for (word, *_), result in zip(jobs, results):
+                if result is not None and result.status in STATUS_CODES:
+                    fingerprints.add(result.status, result.content, word, result.location, result.size)
+        if fingerprints.count:
+            self.fingerprints = fingerprints
+
+    def check_head(self, words):
+        # Some servers answer HEAD differently from GET (405, or 200 for everything);
+        # fall back to partial GETs when any probe disagrees
+        jobs = [probe for word in words for probe in self.build_probes(word)[:1]]
+        if self.current_mode == 'dir':
+            jobs.append((self.target, {'User-Agent': self.random_user_agent()}, self.target, None))
+        for url, headers, _, data in jobs:
+            if data is not None:
+                continue  # POST probes never use HEAD
+            try:
+                head = self.send(url, headers, 'head')[0]
+                get = self.send(url, headers, 'partial')[0]
+            except requests.RequestException:
+                continue
+            if head.status != get.status:
+                print(f"[!] HEAD returned {head.status} but GET returned {get.status} for {url}; using partial GET requests")
+                self.request_method = 'partial'
+                return
+
+    def record(self, kind, entry):
+        # Every finding goes through here: streamed to the sink, or kept in found_* without one
+        self.metrics.count('findings')
+        with self.results_lock:
+            self.found_counts[kind] += 1
+            if self.sink and self.checkpoint and self.checkpoint.hound is self:
+                self.checkpoint.hold(kind, entry)
+            elif self.sink:
+                self.sink.write(entry if self.group is None else self.tag(entry))
+            else:
+                {'paths': self.found_paths, 'subdomains': self.found_subdomains,
+                 'vhosts': self.found_vhosts}[kind].append(entry)
+
+    def tag(self, entry):
+        # Batch scans share one output file, so every finding names its target
+        if not isinstance(entry, dict):
+            entry = {'subdomain': entry}
+        return {'target': self.group, **entry}
+
+    def placeholder_values(self, word):
+        # keyword -> value for one word, or for one tuple of a multi-wordlist scan
+        if isinstance(word, tuple):
+            return dict(zip(self.keywords, word))
+        return {self.keywords[0]: word}
 
-    def make_request(self, test_url, headers):
+    def build_probes(self, word):
+        # Returns the (url, headers, label, data) requests needed for one word in the current mode;
+        # data is the encoded --data body, or None for a body-less request
+        template = self.template
+        if template is None:
+            if self.current_mode == 'sub':
+                return []
+            template = self.template = ProbeTemplate(self)
+        probes = template.build(word)
+        if self.frontier:
+            # A URL reachable by two routes (e.g. 'a' + '.php' and 'a.php') is sent once
+            probes = [probe for probe in probes if self.frontier.seen.add(probe[0])]
+        return probes
+
+    def read_wordlist(self, wordlist):
+        # Opens the wordlist up front so a missing file is reported before scanning starts
         try:
-            response = requests.get(test_url, headers=headers, allow_redirects=False, timeout=5)
-            if response.status_code in [200, 204, 301, 302, 307, 401, 403]:
-                self.found_paths.append({
-                    'url': test_url,
-                    'status': response.status_code,
-                    'size': len(response.content)
-                })
-                print(f"[+] Found: {test_url} (Status: {response.status_code})")
-        except requests.RequestException:
-            pass
+            f = open_wordlist(wordlist)
+            for path in self.extra_wordlists:
+                open_wordlist(path).close()
+        except FileNotFoundError as e:
+            print(f"[-] Error: Wordlist file '{e.filename}' not found")
+            return None
+        except (OSError, ValueError) as e:
+            print(f"[-] Error reading wordlist: {e}")
+            return None
+        if not self.checkpoint:
+            self.open_sink()
+            return self.iter_payloads(f, self.shard)
+        if not self.resume_checkpoint(f):
+            f.close()
+            return None
+        return self.checkpoint.track(iter_entries(f))
+
+    def iter_payloads(self, f, shard=None):
+        # The words of the wordlist, or with several -w lists the tuples of the --attack combination
+        if not self.extra_wordlists:
+            return iter_words(f, shard)
+        return ATTACKS[self.attack](f, self.extra_wordlists, shard)
+
+    def open_sink(self, offset=None):
+        if self.sink:
+            self.sink.open(RESULT_KEYS[self.current_mode], offset)
+
+    def scan_params(self):
+        return {
+            'mode': self.current_mode,
+            'target': self.target,
+            'wordlist': os.path.abspath(self.wordlist),
+            'extensions': self.extensions,
+            'param': self.param,
+            # Lists, not tuples, so the params compare equal after a JSON round trip
+            **({'headers': [list(header) for header in self.headers], 'data': self.data}
+               if self.headers or self.data is not None else {}),
+        }
+
+    def resume_checkpoint(self, f):
+        # Restores findings and seeks the wordlist past completed words
+        checkpoint = self.checkpoint
+        params = self.scan_params()
+        state = checkpoint.load()
+        if state is not None and state['params'] != params:
+            print(f"[-] Error: checkpoint '{checkpoint.path}' belongs to a different scan: {state['params']}")
+            return False
+        if state is not None and state['complete']:
+            self.found_counts = state['counts']
+            print(f"[+] Checkpoint '{checkpoint.path}' is already complete; nothing to resume")
+            return False
+        checkpoint.hound = self
+        checkpoint.params = params
+        if state is None:
+            self.open_sink()
+            checkpoint.save()
+            return True
+        self.found_counts = dict(state['counts'])
+        if 'sink_offset' in state:
+            checkpoint.counts = state['counts']
+            # Findings after the checkpointed size belong to re-sent words and are cut off
+            self.open_sink(state['sink_offset'])
+        else:
+            self.open_sink()
+            self.found_paths = state['results']['paths']
+            self.found_subdomains = state['results']['subdomains']
+            self.found_vhosts = state['results']['vhosts']
+            # Words that were in flight when the scan stopped are sent again; don't record their hits twice
+            self.resumed_labels = ({finding_label(r)[1] for r in self.found_paths} | set(self.found_subdomains) |
+                                   {finding_label(r)[1] for r in self.found_vhosts})
+        checkpoint.offset = state['offset']
+        checkpoint.words_done = state['words_done']
+        self.metrics.count('words', checkpoint.words_done)
+        f.seek(checkpoint.offset)
+        print(f"[+] Resuming from {checkpoint.path}: skipping {checkpoint.words_done} completed words")
+        return True
+
+    def word_done(self, index):
+        self.metrics.count('words')
+        if self.checkpoint:
+            self.checkpoint.complete(index)
+
+    def finish_checkpoint(self):
+        if self.checkpoint and self.checkpoint.hound is self and self.is_running:
+            self.checkpoint.save(complete=True)
+
+    def run_workers(self, worker, jobs):
+        # jobs yields a list of argument tuples per word, each run as its own work item
+        # (so the extension variants of a word are sent side by side); the word is done
+        # once all of them are. Only a bounded number of items is queued ahead of the
+        # pool, so huge wordlists do not turn into millions of pending futures.
+        pending = threading.BoundedSemaphore(self.threads * 4)
+        progress = WordProgress(self.word_done)
+
+        def run_item(index, args):
+            current_word.set(index)
+            worker(*args)
+
+        def item_done(index):
+            pending.release()
+            progress.finish(index)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.threads) as executor:
+            for index, items in enumerate(jobs):
+                if not self.is_running:
+                    break
+                progress.start(index, len(items))
+                for args in items:
+                    pending.acquire()
+                    future = executor.submit(run_item, index, args)
+                    future.add_done_callback(lambda _, index=index: item_done(index))
+
+    def run_async(self, words):
+        if aiohttp is None:
+            print("[-] Error: the async engine requires aiohttp (pip3 install aiohttp)")
+            return
+        AsyncHTTPEngine(self, self.concurrency).run(WordJobs(self, words))
 
     def check_subdomain(self, domain, subdomain):
         if not self.is_running:
             return
         try:
             full_domain = f"{subdomain}.{domain}"
-            answers = dns.resolver.resolve(full_domain, 'A')
-            ips = [r.to_text() for r in answers]
-            if hasattr(self, 'wildcard_ips') and self.wildcard_ips:
-                # Skip only if all IPs exactly match the wildcard set
-                if set(ips) == set(self.wildcard_ips):
-                    return         
-            if answers:
-                self.found_subdomains.append(full_domain)
-                print(f"[+] Found: {full_domain}")
-        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.resolver.Timeout):
+            self.handle_subdomain(self.resolve_subdomain(full_domain))
+        except dns.exception.DNSException:
             pass
         except Exception as e:
             print(f"[-] Error resolving {subdomain}.{domain}: {str(e)}")
 
-    def fuzz_parameter(self, url, param, value):
-        if not self.is_running:
-            return
-        try:
-            parsed = urlparse(url)
-            base_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-            query = parsed.query.replace('FUZZ', value)
-            full_url = f"{base_url}?{query}"
-            headers = {'User-Agent': self.random_user_agent()}
-            response = requests.get(full_url, headers=headers, allow_redirects=False, timeout=5)
-            if response.status_code in [200, 204, 301, 302, 307, 401, 403]:
-                self.found_paths.append({
-                    'url': full_url,
-                    'status': response.status_code,
-                    'size': len(response.content)
-                })
-                print(f"[+] Found: {full_url} (Status: {response.status_code})")
-        except requests.RequestException:
-            pass
+    def resolve_subdomain(self, full_domain):
+        return resolve_blocking(resolution_steps(self.dns_cache, full_domain, self.dns_types), self.query_dns)
 
-    def fuzz_anywhere_worker(self, url, word):
-        if not self.is_running:
-            return
+    def query_dns(self, name, rdtype):
+        # Blocking query for resolution_steps; NXDOMAIN and empty answers are answers too
+        self.metrics.started()
+        start = time.perf_counter()
         try:
-            test_url = url.replace("FUZZ", word)
-            headers = {'User-Agent': self.random_user_agent()}
-            response = requests.get(test_url, headers=headers, allow_redirects=False, timeout=5)
-            if response.status_code in [200, 204, 301, 302, 307, 401, 403]:
-                self.found_paths.append({
-                    'url': test_url,
-                    'status': response.status_code,
-                    'size': len(response.content)
-                })
-                print(f"[+] Found: {test_url} (Status: {response.status_code})")
-        except requests.RequestException:
-            pass
+            response = self.resolver.resolve(name, rdtype, raise_on_no_answer=False).response
+        except dns.resolver.NXDOMAIN as e:
+            response = next(iter(e.responses().values()), None)
+            if response is None:
+                response = dns.message.make_response(dns.message.make_query(name, rdtype))
+                response.set_rcode(dns.rcode.NXDOMAIN)
+        except dns.exception.DNSException as e:
+            self.metrics.finished(error=e)
+            raise
+        self.metrics.observe('dns', time.perf_counter() - start)
+        self.metrics.finished(dns.rcode.to_text(response.rcode()))
+        return response
 
-    def check_vhost(self, ip, base_domain, word):
-        if not self.is_running:
+    def handle_subdomain(self, result):
+        # A name counts when it has addresses, or (with CNAME among --dns-types) any CNAME,
+        # even a dangling one
+        if not (result.addresses or ('CNAME' in self.dns_types and result.chain)):
             return
-        try:
-            test_host = f"{word}.{base_domain}"
-            url = f"http://{ip}/"
-            headers = {
-                'User-Agent': self.random_user_agent(),
-                'Host': test_host
-            }
-            response = requests.get(url, headers=headers, allow_redirects=False, timeout=5)
-            response_hash = hashlib.md5(response.content).hexdigest()
-            if self.vhost_wildcard_hashes and response_hash in self.vhost_wildcard_hashes:
-                return
-            if response.status_code in [200, 204, 301, 302, 307, 401, 403]:
-                self.found_vhosts.append({
-                    'vhost': test_host,
-                    'status': response.status_code,
-                    'size': len(response.content)
-                })
-                print(f"[+] Found: {test_host} (Status: {response.status_code})")
-        except requests.RequestException:
-            pass
+        if self.wildcard and self.wildcard.matches(result):
+            return
+        if result.name in self.resumed_labels:
+            return
+        self.record('subdomains', result.name)
+        if self.shard is None:
+            print(f"[+] Found: {result.name}")
+
+    def build_resolver(self):
+        # Blocking resolver for the thread engine, pointed at --resolvers when given
+        if not self.nameservers:
+            return dns.resolver.get_default_resolver()
+        resolver = dns.resolver.Resolver(configure=False)
+        resolver.nameservers = [dns.nameserver.Do53Nameserver(host, port) for host, port in self.nameservers]
+        resolver.timeout = self.dns_timeout
+        resolver.lifetime = self.dns_timeout * (self.dns_retries + 1)
+        return resolver
 
     def run_directory_buster(self, url, wordlist, extensions=None, threads=10):
+        if self.max_depth:
+            # Recursion needs the scheduler that lets directories join the running scan
+            self.run_batch('dir', [url], wordlist, threads, extensions, grouped=False)
+            return
         self.current_mode = 'dir'
         self.target = url
         self.wordlist = wordlist
@@ -241,51 +3043,37 @@ class ReconHound:
         else:
              self.extensions = None
 
+        self.calibrate()
         self.print_banner()
-        try:
-            with open(wordlist, 'r', encoding='utf-8') as f:
-                  words = [line.strip() for line in f if line.strip()]
-        except UnicodeDecodeError:
-               # fallback to latin-1 encoding if UTF-8 fails
-               try:
-                   with open(wordlist, 'r', encoding='latin-1') as f:
-                         words = [line.strip() for line in f if line.strip()]
-               except Exception as e:
-                      print(f"[-] Error reading wordlist with latin-1: {e}")
-                      return
-        except FileNotFoundError:
-               print(f"[-] Error: Wordlist file '{wordlist}' not found")
-               return
+        words = self.read_wordlist(wordlist)
+        if words is None:
+            return
+
+        if self.engine == 'async':
+            self.run_async(words)
+            return
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
-            for word in words:
-                executor.submit(self.check_url, url, word, self.extensions)
+        self.run_workers(self.send_probe, (self.probe_items(word) for word in words))
 
     def run_subdomain_buster(self, domain, wordlist, threads=10):
         self.current_mode = 'sub'
         self.target = domain
         self.wordlist = wordlist
         self.threads = threads
-        self.wildcard_ips = self.detect_subdomain_wildcard(domain)
+        self.resolver = self.build_resolver()
+        self.wildcard = self.detect_subdomain_wildcard(domain)
         self.print_banner()
-        try:
-            with open(wordlist, 'r', encoding='utf-8') as f:
-                 subdomains = [line.strip() for line in f if line.strip()]
-        except UnicodeDecodeError:
-             # Fallback to latin-1 encoding if UTF-8 fails
-              try:
-                  with open(wordlist, 'r', encoding='latin-1') as f:
-                       subdomains = [line.strip() for line in f if line.strip()]
-              except Exception as e:
-                     print(f"[-] Error reading wordlist with latin-1: {e}")
-                     return
-        except FileNotFoundError:
-              print(f"[-] Error: Wordlist file '{wordlist}' not found")
-              return
+        subdomains = self.read_wordlist(wordlist)
+        if subdomains is None:
+            return
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
-            for subdomain in subdomains:
-                executor.submit(self.check_subdomain, domain, subdomain)
+        if self.engine == 'async':
+            nameservers = self.nameservers or [(ns, 53) for ns in self.resolver.nameservers]
+            AsyncDNSEngine(self, nameservers, self.concurrency, self.dns_rate,
+                           self.dns_retries, self.dns_timeout).run(WordJobs(self, subdomains))
+            return
+
+        self.run_workers(self.check_subdomain, ([(domain, subdomain)] for subdomain in subdomains))
 
     def run_fuzzer(self, url, param, wordlist, threads=10):
         self.current_mode = 'fuzz'
@@ -293,81 +3081,299 @@ class ReconHound:
         self.wordlist = wordlist
         self.threads = threads
         self.param = param
+        self.calibrate()
         self.print_banner()
-        try:
-            with open(wordlist, 'r', encoding='utf-8') as f:
-                 values = [line.strip() for line in f if line.strip()]
-        except UnicodeDecodeError:
-               # Fallback to latin-1 encoding if UTF-8 fails
-               try:
-                   with open(wordlist, 'r', encoding='latin-1') as f:
-                        values = [line.strip() for line in f if line.strip()]
-               except Exception as e:
-                      print(f"[-] Error reading wordlist with latin-1: {e}")
-                      return
-        except FileNotFoundError:
-               print(f"[-] Error: Wordlist file '{wordlist}' not found")
-               return
+        values = self.read_wordlist(wordlist)
+        if values is None:
+            return
             
-        with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
-            for value in values:
-                executor.submit(self.fuzz_parameter, url, param, value)
+        if self.engine == 'async':
+            self.run_async(values)
+            return
+
+        self.run_workers(self.send_probe, (self.probe_items(value) for value in values))
 
     def run_fuzzer_anywhere(self, url, wordlist, threads=10):
         self.current_mode = 'fuzzany'
         self.target = url
         self.wordlist = wordlist
         self.threads = threads
+        self.calibrate()
         self.print_banner()
-        try:
-            with open(wordlist, 'r', encoding='utf-8') as f:
-                 values = [line.strip() for line in f if line.strip()]
-        except UnicodeDecodeError:
-               # Fallback to latin-1 encoding if UTF-8 fails
-               try:
-                   with open(wordlist, 'r', encoding='latin-1') as f:
-                        values = [line.strip() for line in f if line.strip()]
-               except Exception as e:
-                      print(f"[-] Error reading wordlist with latin-1: {e}")
-                      return
-        except FileNotFoundError:
-               print(f"[-] Error: Wordlist file '{wordlist}' not found")
-               return
+        values = self.read_wordlist(wordlist)
+        if values is None:
+            return
+
+        if self.engine == 'async':
+            self.run_async(values)
+            return
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
-            for value in values:
-                executor.submit(self.fuzz_anywhere_worker, url, value)
+        self.run_workers(self.send_probe, (self.probe_items(value) for value in values))
 
     def run_vhost_buster(self, ip, base_domain, wordlist, threads=10):
         self.current_mode = 'vhost'
         self.target = f"{base_domain} @ {ip}"
         self.wordlist = wordlist
         self.threads = threads
-        self.vhost_wildcard_hashes = self.detect_vhost_wildcard(ip, base_domain)
         self.base_domain = base_domain
         self.ip_address = ip
+        self.calibrate()
         self.print_banner()
-        try:
-            with open(wordlist, 'r', encoding='utf-8') as f:
-                 words = [line.strip() for line in f if line.strip()]
-        except UnicodeDecodeError:
-               # Fallback to latin-1 encoding if UTF-8 fails
-               try:
-                   with open(wordlist, 'r', encoding='latin-1') as f:
-                        words = [line.strip() for line in f if line.strip()]
-               except Exception as e:
-                      print(f"[-] Error reading wordlist with latin-1: {e}")
-                      return
-        except FileNotFoundError:
-               print(f"[-] Error: Wordlist file '{wordlist}' not found")
-               return
+        words = self.read_wordlist(wordlist)
+        if words is None:
+            return
    
-        with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
-            for word in words:
-                executor.submit(self.check_vhost, ip, base_domain, word)
+        if self.engine == 'async':
+            self.run_async(words)
+            return
+
+        self.run_workers(self.send_probe, (self.probe_items(word) for word in words))
+
+    def clone(self, target):
+        # Shares connections, rate control and the output sink with this hound,
+        # but starts with its own calibration and findings
+        hound = copy.copy(self)
+        hound.batch = []
+        hound.target = target
+        hound.found_paths = []
+        hound.found_subdomains = []
+        hound.found_vhosts = []
+        hound.found_counts = dict.fromkeys(self.found_counts, 0)
+        hound.results_lock = threading.Lock()
+        hound.fingerprints = None
+        hound.wildcard = None
+        hound.template = None
+        return hound
+
+    def spawn(self, target, grouped=True):
+        # Per-target hound for a batch scan
+        hound = self.clone(target)
+        if self.current_mode == 'vhost':
+            hound.ip_address = target
+            hound.target = f"{self.base_domain} @ {target}"
+        hound.group = hound.target if grouped else None
+        return hound
+
+    def descend(self, url):
+        # Hound for a directory found by a recursive scan; its hits stay in this target's group
+        hound = self.clone(url)
+        hound.depth = self.depth + 1
+        self.metrics.expect()
+        return hound
+
+    def calibrate_target(self):
+        if self.current_mode == 'sub':
+            self.wildcard = self.detect_subdomain_wildcard(self.target)
+        else:
+            self.calibrate()
+
+    def run_batch(self, mode, targets, wordlist, threads=10, extensions=None, param=None, base_domain=None,
+                  grouped=True):
+        # Scans every target with one worker pool; a TargetScheduler interleaves
+        # their words so no single host gets more than per_target at once
+        self.current_mode = mode
+        self.target = targets[0] if len(targets) == 1 and not grouped else f"{len(targets)} targets"
+        self.wordlist = wordlist
+        self.threads = threads
+        self.param = param
+        self.base_domain = base_domain
+        if extensions:
+            self.extensions = [ext if ext.startswith('.') else '.' + ext for ext in extensions.split(',')]
+        if mode == 'sub':
+            self.resolver = self.build_resolver()
+        if mode == 'dir' and self.max_depth:
+            seen = BloomFilter(self.bloom_size) if self.bloom_size else SeenSet()
+            self.frontier = DirectoryFrontier(self.max_depth, seen, self.batch, threads)
+            for target in targets:
+                seen.add(DirectoryFrontier.key(target))
+        self.batch[:] = [self.spawn(target, grouped) for target in targets]
+        if self.sink and grouped:
+            self.sink.grouped = True
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(threads, len(self.batch))) as executor:
+            list(executor.map(ReconHound.calibrate_target, self.batch))
+        self.print_banner()
+        words = self.read_wordlist(wordlist)
+        if words is None:
+            return
+        first = [words]
+
+        def open_words(hound):
+            # Directories found by a recursive --workers scan get the whole wordlist,
+            # since no other process will scan them
+            shard = self.shard if hound.depth == 0 else None
+            return first.pop() if first else self.iter_payloads(open_wordlist(wordlist), shard)
+
+        # Enough targets in play to keep every worker busy, without opening the wordlist for all of them
+        workers = self.concurrency if self.engine == 'async' else threads
+        window = max(1, 2 * -(-workers // self.per_target))
+        scheduler = TargetScheduler(self.batch, open_words, self.per_target, window)
+        if self.frontier:
+            self.frontier.scheduler = scheduler
+        if self.engine == 'async' and mode == 'sub':
+            nameservers = self.nameservers or [(ns, 53) for ns in self.resolver.nameservers]
+            AsyncDNSEngine(self, nameservers, self.concurrency, self.dns_rate,
+                           self.dns_retries, self.dns_timeout).run(scheduler)
+        elif self.engine == 'async':
+            if aiohttp is None:
+                print("[-] Error: the async engine requires aiohttp (pip3 install aiohttp)")
+                return
+            AsyncHTTPEngine(self, self.concurrency).run(scheduler)
+        else:
+            self.run_scheduled(scheduler)
+        if self.frontier:
+            self.frontier.close()
+        for kind in self.found_counts:
+            self.found_counts[kind] = sum(hound.found_counts[kind] for hound in self.batch)
+        self.found_paths = [entry for hound in self.batch for entry in hound.found_paths]
+        self.found_subdomains = [entry for hound in self.batch for entry in hound.found_subdomains]
+        self.found_vhosts = [entry for hound in self.batch for entry in hound.found_vhosts]
+
+    def run_scheduled(self, scheduler):
+        # Thread-engine counterpart of run_workers for jobs handed out by a TargetScheduler
+        pending = threading.BoundedSemaphore(self.threads * 4)
+        progress = WordProgress(scheduler.done)
+
+        def run_item(job, probe):
+            hound, index, word = job
+            current_word.set(index)
+            if probe is None:
+                hound.check_subdomain(hound.target, word)
+            else:
+                hound.send_probe(word, probe)
+
+        def item_done(job):
+            pending.release()
+            progress.finish(job)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.threads) as executor:
+            while self.is_running:
+                # Wait for room in the queue before taking the next word off the scheduler
+                pending.acquire()
+                pending.release()
+                job = scheduler.next()
+                if job is None:
+                    break
+                hound, _, word = job
+                probes = [None] if hound.current_mode == 'sub' else hound.build_probes(word)
+                progress.start(job, len(probes))
+                for probe in probes:
+                    pending.acquire()
+                    future = executor.submit(run_item, job, probe)
+                    future.add_done_callback(lambda _, job=job: item_done(job))
+
+    def run_sharded(self, workers, scan):
+        # --workers: forks one process per slice of the wordlist. Each runs scan(hound)
+        # with its own connections, engine and rate limit, and streams findings back
+        # here, where they are de-duplicated, printed and written to the output
+        context = multiprocessing.get_context('fork')
+        results = context.Queue(10000)
+        processes = [context.Process(target=self.run_shard, args=(scan, index, workers, results), daemon=True)
+                     for index in range(workers)]
+        for process in processes:
+            process.start()
+        self.open_sink()
+        limits = []
+        running = workers
+        while running:
+            try:
+                message = results.get(timeout=1)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes):
+                    break
+                continue
+            if message[0] == 'metrics':
+                _, index, snapshot = message
+                self.metrics.shards[index] = snapshot
+                continue
+            if message[0] == 'done':
+                _, index, connections, totals, lookups, limit, snapshot = message
+                self.merge_stats(connections, totals, lookups)
+                self.metrics.shards[index] = snapshot
+                limits.append(limit)
+                running -= 1
+                continue
+            _, kind, entry = message
+            self.merge(kind, entry)
+        for process in processes:
+            process.join()
+        if limits:
+            self.rate.limit = sum(limits)
+
+    def merge(self, kind, entry):
+        # Findings reported by --workers processes or remote workers. A chunk that is
+        # re-run after its worker died reports its hits again, so repeats are dropped
+        label = finding_label(entry)
+        with self.merge_lock:
+            if label in self.merged:
+                return
+            self.merged.add(label)
+        self.record(kind, entry)
+        print(finding_line(entry))
+
+    def merge_stats(self, connections, totals, lookups):
+        for name, count in connections.items():
+            self.http.stats.increment(name, count)
+        for name, count in totals.items():
+            self.rate.totals[name] += count
+        self.dns_cache.hits += lookups['hits']
+        self.dns_cache.misses += lookups['misses']
+
+    def run_coordinator(self, address, scan, token, chunk_size=2000, timeout=30.0):
+        # --listen: serves wordlist chunks to `reconhound.py worker` processes instead of scanning
+        words = self.read_wordlist(self.wordlist)
+        if words is None:
+            return
+        coordinator = Coordinator(self, address, scan, words, token, chunk_size, timeout)
+        host, port = coordinator.address
+        print(f"[+] Coordinator listening on {host}:{port}; start workers with: reconhound.py worker -C <this-host>:{port} "
+              f"(and the same --token or {TOKEN_ENV})")
+        coordinator.run()
+        for connections, totals, lookups in coordinator.stats.values():
+            self.merge_stats(connections, totals, lookups)
+
+    def run_shard(self, scan, index, count, results):
+        # Body of one --workers process; connections and rate limits are not shared after fork
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        if index:
+            # Only the first worker prints the banner and warnings
+            sys.stdout = open(os.devnull, 'w')
+        elif isinstance(sys.stdout, StatusLineStream):
+            # ...straight to the terminal; the parent's progress line is not redrawn from here
+            sys.stdout = sys.stdout.stream
+        rate = self.rate
+        reporting = self.metrics.reporting
+        self.shard = (index, count)
+        self.sink = ShardSink(results)
+        self.metrics = ScanMetrics()
+        self.http = HTTPSessionPool(self.http.pool_size, self.http.mode, self.metrics)
+        # Cached answers are kept, but only this process's lookups are counted and sent back
+        self.dns_cache.hits = self.dns_cache.misses = 0
+        self.rate = RateController(None if rate.max_concurrency == math.inf else rate.max_concurrency,
+                                   rate.adaptive, rate.max_rps and rate.max_rps / count)
+        stopped = threading.Event()
+
+        def report():
+            while not stopped.wait(1):
+                results.put(('metrics', index, self.metrics.snapshot()))
+        if reporting:
+            threading.Thread(target=report, daemon=True).start()
+        try:
+            with profiled(f"{self.profile}.{index + 1}") if self.profile else contextlib.nullcontext():
+                scan(self)
+        finally:
+            stopped.set()
+            results.put(('done', index, dict(self.http.stats.counts), dict(self.rate.totals),
+                         self.dns_cache.counts(), self.rate.limit, self.metrics.snapshot()))
 
     def save_results(self, output_file):
         self.output_file = output_file
+        if self.sink:
+            try:
+                if self.sink.close():
+                    print(f"[+] Results saved to {output_file}")
+            except IOError as e:
+                print(f"[-] Error saving results: {str(e)}")
+            return
         try:
             with open(output_file, 'w') as f:
                 if self.current_mode in ['dir', 'fuzz', 'fuzzany']:
@@ -380,74 +3386,390 @@ class ReconHound:
         except IOError as e:
             print(f"[-] Error saving results: {str(e)}")
 
-def main():
+def run_scan(hound, args, targets=None):
+    if targets:
+        hound.run_batch(args.mode, targets, args.wordlist, args.threads, getattr(args, 'extensions', None),
+                        getattr(args, 'param', None), getattr(args, 'domain', None))
+    elif args.mode == 'dir':
+        hound.run_directory_buster(args.url, args.wordlist, args.extensions, args.threads)
+    elif args.mode == 'sub':
+        hound.run_subdomain_buster(args.domain, args.wordlist, args.threads)
+    elif args.mode == 'fuzz':
+        hound.run_fuzzer(args.url, args.param, args.wordlist, args.threads)
+    elif args.mode == 'fuzzany':
+        hound.run_fuzzer_anywhere(args.url, args.wordlist, args.threads)
+    elif args.mode == 'vhost':
+        hound.run_vhost_buster(args.ip, args.domain, args.wordlist, args.threads)
+
+def run_remote_worker(address, token):
+    # `reconhound.py worker`: runs chunks handed out by a --listen coordinator until told to stop
+    host, _, port = address.rpartition(':')
+    try:
+        sock = socket.create_connection((host.strip('[]'), int(port)))
+        channel = MessageChannel(sock)
+        challenge = channel.receive()
+        if challenge is None or challenge.get('type') != 'challenge':
+            print(f"[-] {address} is not a ReconHound coordinator")
+            return
+        nonce = secrets.token_hex(16)
+        channel.send({'type': 'hello', 'name': socket.gethostname(), 'nonce': nonce,
+                      'proof': token_proof(token, 'worker', challenge.get('nonce'))})
+        scan = channel.receive()
+    except (OSError, ValueError) as e:
+        print(f"[-] Error connecting to coordinator {address}: {e}")
+        return
+    if scan is None:
+        print("[-] Coordinator closed the connection; check that both sides use the same token")
+        return
+    if not hmac.compare_digest(str(scan.get('proof')), token_proof(token, 'coordinator', nonce)):
+        print(f"[-] Coordinator {address} does not know the token; not running its scan")
+        channel.close()
+        return
+    args = build_parser().parse_args(scan['argv'])
+    targets = scan['targets']
+    print(f"[+] Connected to {address}: {args.mode} scan")
+    if scan['nameservers']:
+        # A --resolvers file only exists on the coordinator; it sent the parsed list
+        args.resolvers = None
+    # Progress, metrics export and profiling belong to the coordinator's run; it is sent our metrics
+    args.progress = False
+    args.metrics_file = args.metrics_port = args.profile = None
+    # Connections, rate limits, metrics, the DNS cache and the soft-404 and wildcard
+    # calibration of every target carry over from one chunk to the next
+    base = ReconHound()
+    configure(base, args)
+    base.baselines = {}
+    if scan['nameservers']:
+        base.nameservers = [tuple(ns) for ns in scan['nameservers']]
+    stopped = threading.Event()
+
+    def chunk_hound():
+        hound = ReconHound()
+        configure(hound, args)
+        hound.http = base.http
+        hound.rate = base.rate
+        hound.metrics = base.metrics
+        hound.nameservers = base.nameservers
+        hound.baselines = base.baselines
+        if args.mode == 'sub':
+            hound.dns_cache = base.dns_cache
+        hound.sink = RemoteSink(channel)
+        return hound
+
+    def run_chunk(words, scan=run_with_workers):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write('\n'.join(words))
+            chunk_args = argparse.Namespace(**vars(args))
+            chunk_args.wordlist = f.name
+        hound = chunk_hound()
+        try:
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                scan(hound, chunk_args, targets)
+        finally:
+            os.unlink(f.name)
+        return hound
+
+    def heartbeat():
+        while not stopped.wait(scan['heartbeat']):
+            try:
+                channel.send({'type': 'ping', 'metrics': base.metrics.snapshot()})
+            except OSError:
+                return
+    threading.Thread(target=heartbeat, daemon=True).start()
+
+    try:
+        if args.workers > 1:
+            # Forked --workers processes can't hand their calibration back, so calibrate
+            # here, in-process on an empty chunk, first; every later fork inherits it
+            run_chunk([], run_scan)
+        while base.is_running:
+            message = channel.receive()
+            if message is None or message['type'] == 'stop':
+                break
+            hound = run_chunk(message['words'])
+            channel.send({'type': 'done', 'id': message['id'], 'connections': dict(base.http.stats.counts),
+                          'totals': dict(base.rate.totals), 'lookups': base.dns_cache.counts(),
+                          'metrics': base.metrics.snapshot()})
+            print(f"[+] Chunk {message['id']}: {len(message['words'])} words, {sum(hound.found_counts.values())} found")
+    except (OSError, ValueError) as e:
+        print(f"[-] Lost connection to coordinator: {e}")
+    finally:
+        stopped.set()
+        channel.close()
+
+def run_wordlist_command(args):
+    # `reconhound.py wordlist compile SOURCE -o OUTPUT`
+    start = time.time()
+    try:
+        read, written = compile_wordlist(args.source, args.output)
+    except FileNotFoundError as e:
+        print(f"[-] Error: Wordlist file '{e.filename}' not found")
+        return
+    except (OSError, ValueError) as e:
+        print(f"[-] Error compiling wordlist: {e}")
+        return
+    print(f"[+] Compiled {args.source}: {read} words, {read - written} duplicates dropped")
+    print(f"[+] Wrote {written} words to {args.output} ({os.path.getsize(args.output)} bytes) "
+          f"in {time.time() - start:.2f} seconds")
+
+def run_with_workers(hound, args, targets=None):
+    if args.workers > 1:
+        hound.current_mode = args.mode
+        if targets and hound.sink:
+            hound.sink.grouped = True
+        hound.run_sharded(args.workers, lambda shard_hound: run_scan(shard_hound, args, targets))
+    else:
+        run_scan(hound, args, targets)
+
+def configure(hound, args):
+    # Applies the engine, connection, rate and resolver options of a parsed command line
+    hound.per_target = args.per_target
+    hound.engine = getattr(args, 'engine', 'thread')
+    hound.concurrency = getattr(args, 'concurrency', 500)
+    if getattr(args, 'wordlists', None):
+        bound = bind_wordlists(args.wordlists)
+        hound.keywords = [keyword for keyword, _ in bound]
+        hound.extra_wordlists = [path for _, path in bound[1:]]
+        hound.attack = args.attack
+    if hasattr(args, 'session_mode'):
+        hound.headers = args.headers or []
+        hound.data = args.data
+        if args.data is not None and not any(name.lower() == 'content-type' for name, _ in hound.headers):
+            hound.headers = hound.headers + [('Content-Type', 'application/x-www-form-urlencoded')]
+        hound.http = HTTPSessionPool(args.pool_size or args.threads, args.session_mode, hound.metrics)
+        hound.rate = RateController(args.concurrency if args.engine == 'async' else args.threads,
+                                    args.adaptive, args.max_rps)
+        hound.retries = args.retries
+        hound.calibration = not args.no_calibrate
+        hound.request_method = args.method
+        hound.max_body = args.max_body * 1024
+    if getattr(args, 'recursive', False):
+        hound.max_depth = args.depth
+        hound.bloom_size = args.bloom
+    if args.mode == 'sub':
+        hound.nameservers = parse_nameservers(args.resolvers) if args.resolvers else None
+        hound.dns_rate = args.dns_rate
+        hound.dns_retries = args.dns_retries
+        hound.dns_timeout = args.dns_timeout
+        hound.dns_types = args.dns_types
+        hound.dns_cache = DNSCache(args.dns_cache)
+
+def build_parser():
     parser = argparse.ArgumentParser(description="ReconHound - Advanced Web Reconnaissance Tool")
     subparsers = parser.add_subparsers(dest='mode', required=True, help="Select a mode of operation")
 
     dir_parser = subparsers.add_parser('dir', help='Directory busting mode')
-    dir_parser.add_argument('-u', '--url', required=True, help="Target URL to scan for directories")
+    dir_target = dir_parser.add_mutually_exclusive_group(required=True)
+    dir_target.add_argument('-u', '--url', help="Target URL to scan for directories")
+    dir_target.add_argument('-U', '--targets', help="File with one target URL per line, scanned together")
     dir_parser.add_argument('-w', '--wordlist', required=True, help="Path to the wordlist file")
     dir_parser.add_argument('-e', '--extensions', help="Comma-seperated list of file extensions to try (e.g., .php,.db,.txt,.js)")
+    dir_parser.add_argument('-R', '--recursive', action='store_true', help="Scan directories found along the way (redirects to 'path/') with the same wordlist")
+    dir_parser.add_argument('--depth', type=int, default=3, help="Directory levels below the target to descend with -R (default: 3)")
+    dir_parser.add_argument('--bloom', type=int, metavar='N', help="Track requested URLs with a Bloom filter sized for N URLs instead of an exact set (-R)")
     dir_parser.add_argument('-t', '--threads', type=int, default=10, help="Number of threads to use (default: 10)")
     dir_parser.add_argument('-o', '--output', help="Path to save results as a JSON file (e.g.,/home/kali/Desktop/output.json)")
 
     sub_parser = subparsers.add_parser('sub', help='Subdomain enumeration mode')
-    sub_parser.add_argument('-d', '--domain', required=True, help="Target domain to enumerate subdomains")
+    sub_target = sub_parser.add_mutually_exclusive_group(required=True)
+    sub_target.add_argument('-d', '--domain', help="Target domain to enumerate subdomains")
+    sub_target.add_argument('-U', '--targets', help="File with one target domain per line, scanned together")
     sub_parser.add_argument('-w', '--wordlist', required=True, help="Path to the wordlist file")
     sub_parser.add_argument('-t', '--threads', type=int, default=10, help="Number of threads to use (default: 10)")
     sub_parser.add_argument('-o', '--output', help="Path to save results as a JSON file (e.g.,/home/kali/Desktop/output.json)")
 
     fuzz_parser = subparsers.add_parser('fuzz', help='Parameter fuzzing mode')
-    fuzz_parser.add_argument('-u', '--url', required=True, help="Target URL with the query parameter to fuzz (e,g., https://example.com/page.php?id=1)")
+    fuzz_target = fuzz_parser.add_mutually_exclusive_group(required=True)
+    fuzz_target.add_argument('-u', '--url', help="Target URL with the query parameter to fuzz (e,g., https://example.com/page.php?id=1)")
+    fuzz_target.add_argument('-U', '--targets', help="File with one target URL per line, scanned together")
     fuzz_parser.add_argument('-p', '--param', required=True, help="Parameter name to fuzz (e.g., id)")
-    fuzz_parser.add_argument('-w', '--wordlist', required=True, help="Path to the wordlist file")
+    fuzz_parser.add_argument('-w', '--wordlist', required=True, action=WordlistAction, metavar='PATH[:KEYWORD]', help="Path to the wordlist file; repeat with PATH:FUZZ1, PATH:FUZZ2, ... to fill several placeholders")
+    fuzz_parser.add_argument('--attack', choices=sorted(ATTACKS), default='clusterbomb', help="With several wordlists: every combination (clusterbomb) or the n-th word of each together (pitchfork) (default: clusterbomb)")
     fuzz_parser.add_argument('-t', '--threads', type=int, default=10, help="Number of threads to use (default: 10)")
     fuzz_parser.add_argument('-o', '--output', help="Path to save results as a JSON file (e.g.,/home/kali/Desktop/output.json)")
 
     fuzzany_parser = subparsers.add_parser('fuzzany', help="Fuzz all 'FUZZ' placeholders anywhere in the URL")
-    fuzzany_parser.add_argument('-u', '--url', required=True, help="URL with one or more 'FUZZ' placeholders")
-    fuzzany_parser.add_argument('-w', '--wordlist', required=True, help="Path to the wordlist file")
+    fuzzany_target = fuzzany_parser.add_mutually_exclusive_group(required=True)
+    fuzzany_target.add_argument('-u', '--url', help="URL with one or more 'FUZZ' placeholders")
+    fuzzany_target.add_argument('-U', '--targets', help="File with one 'FUZZ' URL per line, scanned together")
+    fuzzany_parser.add_argument('-w', '--wordlist', required=True, action=WordlistAction, metavar='PATH[:KEYWORD]', help="Path to the wordlist file; repeat with PATH:FUZZ1, PATH:FUZZ2, ... to fill several placeholders")
+    fuzzany_parser.add_argument('--attack', choices=sorted(ATTACKS), default='clusterbomb', help="With several wordlists: every combination (clusterbomb) or the n-th word of each together (pitchfork) (default: clusterbomb)")
     fuzzany_parser.add_argument('-t', '--threads', type=int, default=10, help="Number of threads to use (default: 10)")
     fuzzany_parser.add_argument('-o', '--output', help="Path to save results as a JSON file (e.g.,/home/kali/Desktop/output.json)")
 
     vhost_parser = subparsers.add_parser('vhost', help='Virtual host brute-forcing mode')
-    vhost_parser.add_argument('-i', '--ip', required=True, help="IP address of the target server")
+    vhost_target = vhost_parser.add_mutually_exclusive_group(required=True)
+    vhost_target.add_argument('-i', '--ip', help="IP address of the target server")
+    vhost_target.add_argument('-U', '--targets', help="File with one target server IP per line, scanned together")
     vhost_parser.add_argument('-d', '--domain', required=True, help="Original base domain")
     vhost_parser.add_argument('-w', '--wordlist', required=True, help="Wordlist file with virtual host words")
     vhost_parser.add_argument('-t', '--threads', type=int, default=10, help="Number of threads to use (default: 10)")
     vhost_parser.add_argument('-o', '--output', help="Path to save results as a JSON file (e.g.,/home/kali/Desktop/output.json)")
 
+    for http_parser in (dir_parser, fuzz_parser, fuzzany_parser, vhost_parser):
+        http_parser.add_argument('--engine', choices=['thread', 'async'], default='thread', help="Request engine: thread pool or asyncio event loop (default: thread)")
+        http_parser.add_argument('-c', '--concurrency', type=int, default=500, help="Maximum in-flight requests for the async engine (default: 500)")
+        http_parser.add_argument('--session-mode', choices=['thread', 'shared'], default='thread', help="Keep-alive session per worker thread or one shared connection pool (default: thread)")
+        http_parser.add_argument('--pool-size', type=int, help="Connections kept alive per host in shared session mode (default: number of threads)")
+        http_parser.add_argument('--adaptive', action='store_true', help="Ramp concurrency up while the target stays healthy and back off on 429/503, errors or rising latency")
+        http_parser.add_argument('--max-rps', type=float, help="Maximum requests per second across all workers")
+        http_parser.add_argument('--no-calibrate', action='store_true', help="Skip the random-probe calibration that filters soft-404 and wildcard responses")
+        http_parser.add_argument('--retries', type=int, default=2, help="Retries for throttled (429/503) or failed requests (default: 2)")
+        http_parser.add_argument('--method', choices=REQUEST_METHODS, default='get', help="get downloads full bodies, head sends HEAD requests (checked against GET first), partial reads at most --max-body of each body (default: get)")
+        http_parser.add_argument('--max-body', type=int, default=64, help="Kilobytes of body read per response in partial mode (default: 64)")
+        http_parser.add_argument('-H', '--header', dest='headers', action='append', type=parse_header, metavar="'NAME: VALUE'", help="Extra request header; may be repeated and may contain placeholders")
+        http_parser.add_argument('--data', help="Request body, sent with POST; may contain placeholders (default Content-Type: application/x-www-form-urlencoded)")
+
+    sub_parser.add_argument('--engine', choices=['thread', 'async'], default='thread', help="Resolution engine: thread pool or asyncio UDP resolver pool (default: thread)")
+    sub_parser.add_argument('-c', '--concurrency', type=int, default=1000, help="Maximum in-flight queries for the async engine (default: 1000)")
+    sub_parser.add_argument('-r', '--resolvers', help="Comma-separated nameservers (ip[:port]) or a file with one per line (default: system resolvers)")
+    sub_parser.add_argument('--dns-rate', type=float, help="Maximum queries per second sent to each nameserver (async engine)")
+    sub_parser.add_argument('--dns-retries', type=int, default=2, help="Retries on another nameserver after a timeout or SERVFAIL (default: 2)")
+    sub_parser.add_argument('--dns-timeout', type=float, default=2.0, help="Per-query timeout in seconds (default: 2.0)")
+    sub_parser.add_argument('--dns-types', type=parse_dns_types, default=['A', 'CNAME'], help="Comma-separated record types that make a name count as found: A, AAAA, CNAME (default: A,CNAME)")
+    sub_parser.add_argument('--dns-cache', type=int, default=100000, help="DNS answers kept in the in-process cache (default: 100000)")
+
+    for mode_parser in (dir_parser, sub_parser, fuzz_parser, fuzzany_parser, vhost_parser):
+        mode_parser.add_argument('--resume', metavar='STATEFILE', help="Checkpoint progress to STATEFILE and resume from it if it already exists")
+        mode_parser.add_argument('--checkpoint-interval', type=float, default=10.0, help="Seconds between checkpoint saves (default: 10)")
+        mode_parser.add_argument('--format', choices=sorted(SINKS), default='json', help="Output format for -o: json, jsonl or csv (default: json)")
+        mode_parser.add_argument('--flush-interval', type=float, default=1.0, help="Seconds between flushes of the output file (default: 1)")
+        mode_parser.add_argument('--workers', type=int, default=1, help="Processes to split the wordlist across, each with its own threads or event loop (default: 1)")
+        mode_parser.add_argument('--per-target', type=int, default=10, help="Maximum words in flight per target with -U (default: 10)")
+        mode_parser.add_argument('--listen', metavar='HOST:PORT', help="Coordinate a distributed scan: hand wordlist chunks to 'reconhound.py worker' processes connecting here (HOST defaults to 127.0.0.1)")
+        mode_parser.add_argument('--token', default=os.environ.get(TOKEN_ENV), help=f"Shared secret workers must prove they know with --listen (default: ${TOKEN_ENV})")
+        mode_parser.add_argument('--chunk-size', type=int, default=2000, help="Words per chunk handed to a worker with --listen (default: 2000)")
+        mode_parser.add_argument('--worker-timeout', type=float, default=30.0, help="Seconds of silence before a worker's chunk is given to another worker (default: 30)")
+        mode_parser.add_argument('--progress', action='store_true', help="Show a status line with words done, req/s, ETA, requests in flight and errors")
+        mode_parser.add_argument('--stats-interval', type=float, default=2.0, help="Seconds between progress updates and metrics file writes (default: 2)")
+        mode_parser.add_argument('--metrics-file', metavar='PATH', help="Keep Prometheus text-format metrics (per-phase latency, status codes, errors) in PATH during the scan")
+        mode_parser.add_argument('--metrics-port', type=int, metavar='PORT', help="Serve the same metrics at http://127.0.0.1:PORT/metrics during the scan")
+        mode_parser.add_argument('--profile', metavar='PATH', help="Profile the run with cProfile: pstats data to PATH, a text report to PATH.txt")
+
+    worker_parser = subparsers.add_parser('worker', help="Run chunks of a distributed scan for a --listen coordinator")
+    worker_parser.add_argument('-C', '--connect', required=True, metavar='HOST:PORT', help="Address of the coordinator")
+    worker_parser.add_argument('--token', default=os.environ.get(TOKEN_ENV), help=f"Shared secret of the coordinator (default: ${TOKEN_ENV})")
+
+    wordlist_parser = subparsers.add_parser('wordlist', help="Prepare wordlists for repeated scans")
+    wordlist_commands = wordlist_parser.add_subparsers(dest='command', required=True)
+    compile_parser = wordlist_commands.add_parser('compile', help="De-duplicate and normalize a wordlist into an indexed binary file that -w memory-maps")
+    compile_parser.add_argument('source', help="Text wordlist to compile")
+    compile_parser.add_argument('-o', '--output', required=True, help="Path of the compiled wordlist")
+    return parser
+
+def main():
+    parser = build_parser()
     args = parser.parse_args()
+    if args.mode == 'worker':
+        if not args.token:
+            parser.error(f"worker needs the coordinator's --token (or {TOKEN_ENV})")
+        run_remote_worker(args.connect, args.token)
+        return
+    if args.mode == 'wordlist':
+        run_wordlist_command(args)
+        return
+    targets = None
+    if args.workers > 1 and args.resume:
+        parser.error("--resume is not supported with --workers")
+    if args.listen:
+        if args.resume:
+            parser.error("--resume is not supported with --listen")
+        if getattr(args, 'recursive', False):
+            parser.error("-R is not supported with --listen")
+        host, _, port = args.listen.rpartition(':')
+        if not port.isdigit():
+            parser.error(f"--listen expects HOST:PORT, got '{args.listen}'")
+        # Only reachable from this machine unless a host is given
+        listen = (host.strip('[]') or '127.0.0.1', int(port))
+        if not args.token:
+            parser.error(f"--listen needs a --token (or {TOKEN_ENV}) that workers must know")
+    if getattr(args, 'recursive', False) and args.resume:
+        parser.error("--resume is not supported with -R")
+    if getattr(args, 'data', None) is not None and args.method == 'head':
+        parser.error("--data is sent with POST and cannot be combined with --method head")
+    if len(getattr(args, 'wordlists', None) or []) > 1:
+        keywords = [keyword for keyword, _ in bind_wordlists(args.wordlists)]
+        if len(set(keywords)) < len(keywords):
+            parser.error(f"every -w wordlist needs its own placeholder, got {', '.join(keywords)}")
+        if args.resume:
+            parser.error("--resume is not supported with several wordlists")
+        if args.listen:
+            parser.error("--listen is not supported with several wordlists")
+        if args.url:
+            template = ' '.join([args.url, args.data or ''] + [f"{name} {value}" for name, value in args.headers or []])
+            missing = [keyword for keyword in keywords if keyword not in template]
+            if missing:
+                parser.error(f"placeholder {', '.join(missing)} appears nowhere in the URL, headers or --data")
+    if args.targets:
+        if args.resume:
+            parser.error("--resume is not supported with -U")
+        targets = read_targets(args.targets)
+        if not targets:
+            return
     hound = ReconHound()
+    if args.resume:
+        hound.checkpoint = ScanCheckpoint(args.resume, args.checkpoint_interval)
+    if args.output:
+        hound.sink = SINKS[args.format](args.output, args.flush_interval)
+    configure(hound, args)
+    hound.profile = args.profile
+    reporter = None
+    if args.progress or args.metrics_file or args.metrics_port is not None:
+        reporter = MetricsReporter(hound.metrics, args.stats_interval, args.progress,
+                                   args.metrics_file, args.metrics_port)
+        try:
+            reporter.start()
+        except OSError as e:
+            parser.error(f"--metrics-port {args.metrics_port}: {e}")
+        hound.metrics.expect(len(targets) if targets else 1)
+        hound.metrics.count_wordlist([args.wordlist] + hound.extra_wordlists,
+                                     min if hound.attack == 'pitchfork' else math.prod)
 
     try:
-        if args.mode == 'dir':
-            hound.output_file=args.output
-            hound.run_directory_buster(args.url, args.wordlist, args.extensions, args.threads)
-        elif args.mode == 'sub':
-            hound.output_file=args.output
-            hound.run_subdomain_buster(args.domain, args.wordlist, args.threads)
-        elif args.mode == 'fuzz':
-            hound.output_file=args.output
-            hound.run_fuzzer(args.url, args.param, args.wordlist, args.threads)
-        elif args.mode == 'fuzzany':
-            hound.output_file=args.output
-            hound.run_fuzzer_anywhere(args.url, args.wordlist, args.threads)
-        elif args.mode == 'vhost':
-            hound.output_file=args.output
-            hound.run_vhost_buster(args.ip, args.domain, args.wordlist, args.threads)
+        hound.output_file=args.output
+        with profiled(args.profile) if args.profile else contextlib.nullcontext():
+            if args.listen:
+                hound.current_mode = args.mode
+                hound.wordlist = args.wordlist
+                if targets and hound.sink:
+                    hound.sink.grouped = True
+                scan = {'argv': sys.argv[1:], 'targets': targets, 'nameservers': hound.nameservers}
+                hound.run_coordinator(listen, scan, args.token, args.chunk_size, args.worker_timeout)
+            else:
+                run_with_workers(hound, args, targets)
+        if reporter:
+            reporter.stop()
+        hound.finish_checkpoint()
 
         if args.output:
             hound.save_results(args.output)
 
         print("\n[+] Scan completed!")
-        print(f"[+] Total paths found: {len(hound.found_paths)}")
-        print(f"[+] Total subdomains found: {len(hound.found_subdomains)}")
-        print(f"[+] Total virtual hosts found: {len(hound.found_vhosts)}")
+        print(f"[+] Total paths found: {hound.found_counts['paths']}")
+        print(f"[+] Total subdomains found: {hound.found_counts['subdomains']}")
+        print(f"[+] Total virtual hosts found: {hound.found_counts['vhosts']}")
+        for target_hound in hound.batch:
+            found = sum(target_hound.found_counts.values())
+            if found:
+                print(f"[+]   {target_hound.target}: {found}")
+        connection_summary = hound.http.stats.summary()
+        if connection_summary:
+            print(f"[+] Connections: {connection_summary}")
+        dns_summary = hound.dns_cache.summary()
+        if dns_summary:
+            print(f"[+] DNS cache: {dns_summary}")
+        rate_summary = hound.rate.summary()
+        if rate_summary:
+            print(f"[+] Rate control: {rate_summary}")
+        for line in hound.metrics.summary():
+            print(f"[+] {line}")
         print(f"[+] Duration: {time.time() - hound.start_time:.2f} seconds")
 
     except KeyboardInterrupt:
         hound.signal_handler(None, None)
+    finally:
+        if reporter:
+            reporter.stop()
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,31 @@
+# Shared setup for the ReconHound tests: makes reconhound.py and the stand-in
+# servers in benchmarks/ importable, and provides small helpers for running
+# scans in-process.
+
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+RECONHOUND = os.path.join(ROOT, 'reconhound.py')
+
+@pytest.fixture
+def wordlist(tmp_path):
+    # Writes the given words to a wordlist file and returns its path
+    def write(words, name='words.txt'):
+        path = tmp_path / name
+        path.write_text('\n'.join(words), encoding='utf-8')
+        return str(path)
+    return write
+
+def quiet(function, *args):
+    # Runs a scan without its banner and findings cluttering the test output
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        function(*args)
+    return out.getvalue()
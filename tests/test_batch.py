@@ -0,0 +1,169 @@
+# -U batch scans: one worker pool shared by every target through the
+# TargetScheduler, per-target concurrency, grouped output, and per-target
+# settings such as a HEAD fallback reaching the engine that sends the probes.
+
+import collections
+import json
+import subprocess
+import sys
+import threading
+from urllib.parse import urlsplit
+
+import pytest
+
+from conftest import RECONHOUND, quiet
+from mock_http import MockHTTPServer
+from reconhound import ReconHound, TargetScheduler
+
+WORDS = [f"w{i}" for i in range(200)]
+HITS = WORDS[::20]
+
+class NoHead(MockHTTPServer):
+    # Refuses HEAD with 405, so a head scan has to fall back to partial GETs
+    def respond(self, method, path, headers):
+        if method == 'HEAD':
+            return 405, b''
+        return super().respond(method, path, headers)
+
+class Tree(NoHead):
+    # Two directories (answered with a redirect to 'dir/') holding a few pages
+    DIRS = {'/admin', '/admin/users'}
+    PAGES = {'/w0', '/admin/w20', '/admin/users/w40'}
+
+    def respond(self, method, path, headers):
+        if method == 'HEAD':
+            return 405, b''
+        if path in self.DIRS:
+            return 301, b'', {'Location': path + '/'}
+        if path.rstrip('/') in self.DIRS or path in self.PAGES:
+            return 200, b'found'
+        return 404, b'not found'
+
+def scheduler(count, words, **kwargs):
+    hounds = [ReconHound() for _ in range(count)]
+    return hounds, TargetScheduler(hounds, lambda hound: iter(words), **kwargs)
+
+def test_scheduler_round_robin_with_cap():
+    hounds, jobs = scheduler(3, ['a', 'b', 'c'], per_target=2)
+    taken = [jobs.take() for _ in range(6)]
+    assert [(hounds.index(job[0]), job[2]) for job in taken] == [
+        (0, 'a'), (1, 'a'), (2, 'a'), (0, 'b'), (1, 'b'), (2, 'b')]
+    # Every target has two words in flight
+    assert jobs.take() is None and not jobs.finished
+    jobs.done(taken[1])
+    assert jobs.take()[:3] == (hounds[1], 2, 'c')
+    for job in taken:
+        jobs.done(job)
+    rest = [jobs.take() for _ in range(2)]
+    assert sorted(hounds.index(job[0]) for job in rest) == [0, 2]
+    assert jobs.take() is None and not jobs.finished
+    for job in rest:
+        jobs.done(job)
+    assert jobs.take() is None and jobs.finished
+
+def test_scheduler_window_and_priority():
+    hounds, jobs = scheduler(1, ['a'], window=1)
+    deep, shallow = ReconHound(), ReconHound()
+    jobs.expect()
+    jobs.expect()
+    jobs.add(deep, 2)
+    jobs.add(shallow, 1)
+    # One target at a time; queued targets start shallowest first
+    order = []
+    while True:
+        job = jobs.next()
+        if job is None:
+            break
+        order.append(job[0])
+        jobs.done(job)
+    assert order == [hounds[0], shallow, deep]
+
+def test_scheduler_waits_for_expected_targets():
+    hounds, jobs = scheduler(1, ['a'])
+    late = ReconHound()
+    jobs.expect()
+    job = jobs.take()
+    jobs.done(job)
+    # A target still calibrating keeps the scan open
+    assert jobs.take() is None and not jobs.finished
+    jobs.add(late)
+    assert jobs.take()[0] is late
+
+@pytest.fixture
+def servers():
+    started = [MockHTTPServer(latency=0.002, hits=HITS).start() for _ in range(3)]
+    yield started
+    for server in started:
+        server.stop()
+
+@pytest.mark.parametrize('engine', ['thread', 'async'])
+@pytest.mark.parametrize('output_format', ['json', 'jsonl'])
+def test_batch_output_grouped_by_target(tmp_path, wordlist, servers, engine, output_format):
+    targets = tmp_path / 'targets.txt'
+    # Blank lines, comments and repeats are skipped
+    targets.write_text('\n'.join([server.url for server in servers] + ['', '# comment', servers[0].url]))
+    output = tmp_path / f"found.{output_format}"
+    subprocess.run([sys.executable, RECONHOUND, 'dir', '-U', str(targets), '-w', wordlist(WORDS), '-t', '8',
+                    '--per-target', '2', '--engine', engine, '-o', str(output), '--format', output_format],
+                   check=True, capture_output=True, text=True, timeout=60)
+    if output_format == 'json':
+        grouped = {target: [entry['url'] for entry in found['paths']]
+                   for target, found in json.loads(output.read_text())['targets'].items()}
+    else:
+        grouped = collections.defaultdict(list)
+        for line in output.read_text().splitlines():
+            entry = json.loads(line)
+            grouped[entry['target']].append(entry['url'])
+    assert {target: sorted(urls) for target, urls in grouped.items()} == {
+        server.url: sorted(f"{server.url}/{word}" for word in HITS) for server in servers}
+    assert all(server.requests >= len(WORDS) for server in servers)
+
+def test_per_target_limit(wordlist, servers, monkeypatch):
+    in_flight = collections.Counter()
+    peak = collections.Counter()
+    lock = threading.Lock()
+    send = ReconHound.send
+
+    def counted(self, url, *args, **kwargs):
+        host = urlsplit(url).netloc
+        with lock:
+            in_flight[host] += 1
+            peak[host] = max(peak[host], in_flight[host])
+        try:
+            return send(self, url, *args, **kwargs)
+        finally:
+            with lock:
+                in_flight[host] -= 1
+
+    monkeypatch.setattr(ReconHound, 'send', counted)
+    hound = ReconHound()
+    hound.per_target = 2
+    hound.calibration = False
+    quiet(hound.run_batch, 'dir', [server.url for server in servers], wordlist(WORDS), 12)
+    # Twelve threads, but never more than two requests at one host
+    assert set(peak.values()) == {2}
+    assert [hound.found_counts['paths'] for hound in hound.batch] == [len(HITS)] * 3
+
+@pytest.mark.parametrize('engine', ['thread', 'async'])
+def test_batch_head_fallback(wordlist, engine):
+    # Each target's hound falls back to partial GETs on its own; the engine must send
+    # that target's probes with its method, not the batch's
+    with NoHead(hits=HITS) as first, NoHead(hits=HITS) as second:
+        hound = ReconHound()
+        hound.engine = engine
+        hound.request_method = 'head'
+        quiet(hound.run_batch, 'dir', [first.url, second.url], wordlist(WORDS), 4)
+    assert [target.request_method for target in hound.batch] == ['partial', 'partial']
+    assert hound.found_counts['paths'] == 2 * len(HITS)
+
+@pytest.mark.parametrize('engine', ['thread', 'async'])
+def test_recursive_head_fallback(wordlist, engine):
+    # -R runs through the batch scheduler too, and so do the directories it finds
+    with Tree() as server:
+        hound = ReconHound()
+        hound.engine = engine
+        hound.request_method = 'head'
+        hound.max_depth = 3
+        quiet(hound.run_directory_buster, server.url, wordlist(['admin', 'users'] + WORDS), None, 4)
+    found = sorted(urlsplit(entry['url']).path for entry in hound.found_paths)
+    assert found == ['/admin', '/admin/users', '/admin/users/w40', '/admin/w20', '/w0']
@@ -0,0 +1,56 @@
+# Soft-404 filtering: after calibration, a target that answers every miss with
+# the same 200 page must report only the paths that really exist, with every
+# --method and engine.
+
+import pytest
+
+from conftest import quiet
+from mock_http import MockHTTPServer
+from reconhound import ReconHound, ResponseFingerprinter
+
+PAGE = ('<div class="content"><p>Sorry, the page you are looking for is not on this server. '
+        'Please check the address and try again, or go back to the home page.</p></div>\n') * 22
+
+class SoftNotFound(MockHTTPServer):
+    # A 4 KB soft-404 that reflects the requested path, and one real page
+    def respond(self, method, path, headers):
+        if path == '/secret':
+            return 200, ('<html><h1>Secret</h1>' + 'confidential record\n' * 240).encode()
+        return 200, f"<html><title>Not found: {path}</title>\n{PAGE}</html>".encode()
+
+class ShortNotFound(MockHTTPServer):
+    # A soft-404 far smaller than the real page
+    def respond(self, method, path, headers):
+        if path == '/secret':
+            return 200, b'x' * 4800
+        return 200, b'<html>nothing here</html>'
+
+# Short and common words occur in the soft-404 text itself
+WORDS = ['a', 'on', 'page', 'class', 'the', 'e', 'div', 'secret'] + [f"w{i}" for i in range(40)]
+
+@pytest.mark.parametrize('engine', ['thread', 'async'])
+@pytest.mark.parametrize('method', ['get', 'partial', 'head'])
+@pytest.mark.parametrize('server_class', [SoftNotFound, ShortNotFound])
+def test_soft_404_filtered(wordlist, server_class, method, engine):
+    with server_class() as server:
+        hound = ReconHound()
+        hound.engine = engine
+        hound.request_method = method
+        quiet(hound.run_directory_buster, server.url, wordlist(WORDS), None, 5)
+    assert hound.fingerprints is not None
+    assert [entry['url'].rsplit('/', 1)[1] for entry in hound.found_paths] == ['secret']
+
+def test_bodiless_responses_match_on_size_only():
+    fingerprints = ResponseFingerprinter()
+    for _ in range(4):
+        fingerprints.add(200, b'', size=26)
+    assert fingerprints.matches(200, b'', size=26)
+    assert not fingerprints.matches(200, b'', size=4800)
+    assert not fingerprints.matches(404, b'', size=26)
+
+def test_reflection_of_short_word_still_matches():
+    fingerprints = ResponseFingerprinter()
+    for word in ('kq3jx81m', 'zz09plqa4e', 'u7ty2mmw1x0q'):
+        fingerprints.add(200, f"<p>No page at /{word} on this site</p>".encode(), word)
+    assert fingerprints.matches(200, b"<p>No page at /on on this site</p>", 'on')
+    assert fingerprints.matches(200, b"<p>No page at /a on this site</p>", 'a')
@@ -0,0 +1,88 @@
+# --resume round trips: a scan interrupted part-way and resumed must end up
+# with every finding exactly once, without re-sending the finished words.
+
+import json
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+from conftest import RECONHOUND
+from mock_http import MockHTTPServer
+
+WORDS = [f"word{i}" for i in range(300)]
+HITS = WORDS[::25]
+
+def interrupt_after(command, server, requests):
+    # Starts a scan and sends it Ctrl-C once the server has seen `requests` requests
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    deadline = time.time() + 30
+    while server.requests < requests and process.poll() is None and time.time() < deadline:
+        time.sleep(0.01)
+    process.send_signal(signal.SIGINT)
+    return process.communicate(timeout=30)[0]
+
+def found_paths(output):
+    with open(output) as f:
+        return [json.loads(line)['url'].rsplit('/', 1)[1] for line in f]
+
+@pytest.mark.parametrize('extra', [
+    [],
+    ['-H', 'X-Token: abc'],
+    ['--data', 'q=1'],
+    ['--method', 'head'],
+], ids=['plain', 'header', 'data', 'head'])
+def test_resume_finishes_interrupted_scan(tmp_path, wordlist, extra):
+    state = str(tmp_path / 'state.json')
+    output = str(tmp_path / 'found.jsonl')
+    with MockHTTPServer(latency=0.005, hits=HITS) as server:
+        command = [sys.executable, RECONHOUND, 'dir', '-u', server.url, '-w', wordlist(WORDS), '-t', '2',
+                   '--no-calibrate', '--resume', state, '--checkpoint-interval', '0.1',
+                   '-o', output, '--format', 'jsonl'] + extra
+        interrupt_after(command, server, 100)
+        checkpoint = json.load(open(state))
+        assert not checkpoint['complete']
+        assert 0 < checkpoint['words_done'] < len(WORDS)
+
+        sent = server.requests
+        result = subprocess.run(command, capture_output=True, text=True, timeout=60)
+        assert 'belongs to a different scan' not in result.stdout
+        assert f"skipping {checkpoint['words_done']} completed words" in result.stdout
+        assert json.load(open(state))['complete']
+        # Only the words in flight at the interrupt are sent twice
+        assert server.requests - sent <= len(WORDS) - checkpoint['words_done'] + 2 * 2 + 4
+
+    paths = found_paths(output)
+    assert sorted(paths) == sorted(HITS)
+
+def test_resume_compiled_wordlist(tmp_path, wordlist):
+    compiled = str(tmp_path / 'words.rhw')
+    subprocess.run([sys.executable, RECONHOUND, 'wordlist', 'compile', wordlist(WORDS), '-o', compiled],
+                   check=True, capture_output=True)
+    state = str(tmp_path / 'state.json')
+    output = str(tmp_path / 'found.jsonl')
+    with MockHTTPServer(latency=0.005, hits=HITS) as server:
+        command = [sys.executable, RECONHOUND, 'dir', '-u', server.url, '-w', compiled, '-t', '2',
+                   '--no-calibrate', '--resume', state, '--checkpoint-interval', '0.1',
+                   '-o', output, '--format', 'jsonl']
+        interrupt_after(command, server, 100)
+        subprocess.run(command, capture_output=True, text=True, timeout=60)
+    assert json.load(open(state))['complete']
+    assert sorted(found_paths(output)) == sorted(HITS)
+
+@pytest.mark.parametrize('first, second', [
+    (['-e', '.php'], ['-e', '.html']),
+    (['-H', 'X-Token: abc'], ['-H', 'X-Token: other']),
+    (['--data', 'q=1'], []),
+], ids=['extensions', 'header', 'data'])
+def test_resume_rejects_checkpoint_of_another_scan(tmp_path, wordlist, first, second):
+    state = str(tmp_path / 'state.json')
+    words = wordlist(WORDS)
+    with MockHTTPServer(latency=0.005, hits=HITS) as server:
+        command = [sys.executable, RECONHOUND, 'dir', '-u', server.url, '-w', words, '-t', '2',
+                   '--no-calibrate', '--resume', state, '--checkpoint-interval', '0.1']
+        interrupt_after(command + first, server, 50)
+        result = subprocess.run(command + second, capture_output=True, text=True, timeout=60)
+    assert 'belongs to a different scan' in result.stdout
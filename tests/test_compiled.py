@@ -0,0 +1,78 @@
+# Compiled wordlists: `wordlist compile` normalizes and de-duplicates a list
+# into an indexed file that scans memory-map and slice by word number.
+
+import random
+
+import pytest
+
+from reconhound import CompiledWordlist, compile_wordlist, count_lines, iter_entries, iter_words, open_wordlist
+
+def compile_words(tmp_path, data, **kwargs):
+    source = tmp_path / 'words.txt'
+    source.write_bytes(data)
+    destination = str(tmp_path / 'words.rhw')
+    counts = compile_wordlist(str(source), destination, **kwargs)
+    return destination, counts
+
+def read(path, shard=None):
+    return list(iter_words(open_wordlist(path), shard))
+
+def test_round_trip_normalizes_and_keeps_first_copies(tmp_path):
+    # 'bäckup' in latin-1 and in UTF-8 is one word once decoded
+    path, counts = compile_words(tmp_path, b'admin\r\n login\n\nb\xe4ckup\nadmin\nb\xc3\xa4ckup\n\tlogin\t\nlast')
+    assert counts == (7, 4)
+    with open_wordlist(path) as f:
+        assert isinstance(f, CompiledWordlist)
+    assert read(path) == ['admin', 'login', 'bäckup', 'last']
+    assert count_lines(path) == 4
+
+def test_many_buckets_keep_wordlist_order(tmp_path):
+    rng = random.Random(1)
+    words = [f"{rng.randrange(3000):x}" for _ in range(20000)]
+    # A tiny bucket size spreads the words over the maximum number of buckets
+    path, counts = compile_words(tmp_path, '\n'.join(words).encode(), bucket_size=64)
+    expected = list(dict.fromkeys(words))
+    assert counts == (len(words), len(expected))
+    assert read(path) == expected
+
+@pytest.mark.parametrize('data', [b'', b'\n \n\t\n'], ids=['empty', 'blank'])
+def test_empty_list(tmp_path, data):
+    path, counts = compile_words(tmp_path, data)
+    assert counts == (0, 0)
+    assert read(path) == []
+    assert [read(path, (index, 3)) for index in range(3)] == [[], [], []]
+    assert count_lines(path) == 0
+
+@pytest.mark.parametrize('count', [1, 2, 3, 7, 64])
+def test_shards_are_exact(tmp_path, count):
+    # Spans several decode blocks, so shard starts fall inside blocks
+    words = [f"word{i}" for i in range(CompiledWordlist.BLOCK * 2 + 37)]
+    path, _ = compile_words(tmp_path, '\n'.join(words).encode())
+    shards = [read(path, (index, count)) for index in range(count)]
+    assert [word for shard in shards for word in shard] == words
+    assert max(map(len, shards)) - min(map(len, shards)) <= 1
+
+def test_resume_seeks_by_word_number(tmp_path):
+    words = [f"w{i}" for i in range(CompiledWordlist.BLOCK + 100)]
+    path, _ = compile_words(tmp_path, '\n'.join(words).encode())
+    # Positions handed out for checkpoints are word numbers, one past each word
+    entries = list(iter_entries(open_wordlist(path)))
+    assert entries[:2] == [(1, 'w0'), (2, 'w1')] and entries[-1] == (len(words), words[-1])
+    for position in (0, 1, CompiledWordlist.BLOCK - 1, CompiledWordlist.BLOCK + 5, len(words), len(words) + 10):
+        f = open_wordlist(path)
+        f.seek(position)
+        assert [word for _, word in iter_entries(f)] == words[position:]
+
+@pytest.mark.parametrize('damage', ['truncated', 'index'])
+def test_damaged_file_rejected(tmp_path, damage):
+    path, _ = compile_words(tmp_path, b'one\ntwo\nthree\n')
+    with open(path, 'rb') as f:
+        data = f.read()
+    if damage == 'truncated':
+        data = data[:CompiledWordlist.HEADER.size - 4]
+    else:
+        data = data[:-8]
+    with open(path, 'wb') as f:
+        f.write(data)
+    with pytest.raises(ValueError, match='not a valid compiled wordlist'):
+        open_wordlist(path)
@@ -0,0 +1,141 @@
+# --listen coordinator and remote workers: the shared-token handshake, chunks
+# of a worker that drops out going to another worker, and a full scan split
+# between real worker processes.
+
+import contextlib
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from conftest import RECONHOUND
+from mock_http import MockHTTPServer
+from reconhound import Coordinator, MessageChannel, ReconHound, run_remote_worker, token_proof
+
+TOKEN = 'correct horse'
+WORDS = [f"w{i}" for i in range(10)]
+
+@pytest.fixture
+def coordinator():
+    hound = ReconHound()
+    hound.current_mode = 'dir'
+    scan = {'argv': ['dir', '-u', 'http://t', '-w', 'words.txt', '-H', 'Authorization: secret'],
+            'targets': None, 'nameservers': []}
+    started = Coordinator(hound, ('127.0.0.1', 0), scan, iter(WORDS), TOKEN, chunk_size=4, timeout=5)
+    thread = threading.Thread(target=started.run, daemon=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        thread.start()
+        yield started
+        hound.is_running = False
+        thread.join(5)
+
+def connect(coordinator, token=TOKEN):
+    # Does a worker's side of the handshake; returns the channel and what came back
+    channel = MessageChannel(socket.create_connection(coordinator.address))
+    challenge = channel.receive()
+    assert challenge['type'] == 'challenge'
+    channel.send({'type': 'hello', 'name': 'test', 'nonce': 'n1',
+                  'proof': token_proof(token, 'worker', challenge['nonce'])})
+    return channel, channel.receive()
+
+def done(channel, chunk):
+    channel.send({'type': 'done', 'id': chunk['id'], 'connections': {}, 'totals': {},
+                  'lookups': {'hits': 0, 'misses': 0}, 'metrics': {}})
+
+def test_wrong_token_gets_no_scan(coordinator):
+    channel, reply = connect(coordinator, 'guess')
+    # Closed before the scan's command line (and its -H value) is sent
+    assert reply is None
+    channel.close()
+    channel, scan = connect(coordinator)
+    assert scan['type'] == 'scan' and scan['argv'][-1] == 'Authorization: secret'
+    assert scan['proof'] == token_proof(TOKEN, 'coordinator', 'n1')
+    channel.close()
+
+def test_findings_only_after_handshake(coordinator):
+    channel = MessageChannel(socket.create_connection(coordinator.address))
+    channel.receive()
+    channel.send({'type': 'found', 'kind': 'paths', 'entry': {'url': 'http://t/forged', 'status': 200, 'size': 1}})
+    assert channel.receive() is None
+    channel.close()
+    assert coordinator.hound.found_counts['paths'] == 0
+
+def test_chunk_of_lost_worker_is_reassigned(coordinator):
+    first, _ = connect(coordinator)
+    lost = first.receive()
+    assert lost['words'] == WORDS[:4]
+    second, _ = connect(coordinator)
+    chunk = second.receive()
+    assert chunk['words'] == WORDS[4:8]
+    # The first worker dies with its chunk unfinished; it is handed out again
+    first.close()
+    deadline = time.time() + 5
+    while not coordinator.requeued and time.time() < deadline:
+        time.sleep(0.01)
+    second.send({'type': 'found', 'kind': 'paths', 'entry': {'url': 'http://t/w5', 'status': 200, 'size': 1}})
+    done(second, chunk)
+    assert second.receive()['words'] == WORDS[:4]
+    second.send({'type': 'found', 'kind': 'paths', 'entry': {'url': 'http://t/w5', 'status': 200, 'size': 1}})
+    done(second, {'id': lost['id']})
+    chunk = second.receive()
+    assert chunk['words'] == WORDS[8:]
+    done(second, chunk)
+    assert second.receive() == {'type': 'stop'}
+    second.close()
+    # A hit reported twice (by a re-run chunk) is recorded once
+    assert [entry['url'] for entry in coordinator.hound.found_paths] == ['http://t/w5']
+    assert coordinator.finished()
+
+def test_worker_refuses_coordinator_without_token():
+    server = socket.create_server(('127.0.0.1', 0))
+
+    def impostor():
+        sock, _ = server.accept()
+        channel = MessageChannel(sock)
+        channel.send({'type': 'challenge', 'nonce': 'abc'})
+        channel.receive()
+        channel.send({'type': 'scan', 'proof': 'forged', 'argv': ['dir', '-u', 'http://victim', '-w', '/etc/passwd'],
+                      'targets': None, 'nameservers': [], 'heartbeat': 1})
+        channel.receive()
+        channel.close()
+    threading.Thread(target=impostor, daemon=True).start()
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        run_remote_worker('127.0.0.1:%d' % server.getsockname()[1], TOKEN)
+    server.close()
+    assert 'does not know the token' in out.getvalue()
+
+def test_listen_requires_token(wordlist):
+    env = dict(os.environ)
+    env.pop('RECONHOUND_TOKEN', None)
+    result = subprocess.run([sys.executable, RECONHOUND, 'dir', '-u', 'http://127.0.0.1:1', '-w', wordlist(WORDS),
+                             '--listen', ':0'], capture_output=True, text=True, env=env, timeout=30)
+    assert result.returncode == 2 and '--token' in result.stderr
+
+def test_distributed_scan(tmp_path, wordlist):
+    words = [f"w{i}" for i in range(600)]
+    hits = words[::50]
+    output = tmp_path / 'found.jsonl'
+    # Unbuffered, so the coordinator's address can be read while it runs
+    env = dict(os.environ, RECONHOUND_TOKEN=TOKEN, PYTHONUNBUFFERED='1')
+    with MockHTTPServer(hits=hits) as server:
+        coordinator = subprocess.Popen(
+            [sys.executable, RECONHOUND, 'dir', '-u', server.url, '-w', wordlist(words), '--listen', ':0',
+             '--chunk-size', '100', '-o', str(output), '--format', 'jsonl'],
+            stdout=subprocess.PIPE, text=True, env=env)
+        line = next(line for line in coordinator.stdout if 'Coordinator listening' in line)
+        # Bound to the loopback address, since no host was given
+        address = line.split(' on ', 1)[1].split(';', 1)[0]
+        assert address.startswith('127.0.0.1:')
+        workers = [subprocess.Popen([sys.executable, RECONHOUND, 'worker', '-C', address],
+                                    stdout=subprocess.DEVNULL, env=env) for _ in range(2)]
+        coordinator.communicate(timeout=60)
+        for worker in workers:
+            worker.wait(30)
+    found = [json.loads(line)['url'] for line in output.read_text().splitlines()]
+    assert sorted(found) == sorted(f"{server.url}/{word}" for word in hits)
@@ -0,0 +1,69 @@
+# Subdomain resolution against a stub DNS server: CNAME-aware caching, its
+# hit counting, and wildcard zones (fixed, rotating and CNAME) being filtered.
+
+import random
+
+import pytest
+
+from conftest import quiet
+from mock_dns import MockDNSServer
+from reconhound import DNSCache, ReconHound, resolution_steps, resolve_blocking
+
+RECORDS = {'www.ex.test': ['1.1.1.1'], 'mail.ex.test': ['10.0.0.200'], 'api.ex.test': ['10.0.0.5', '1.1.1.1'],
+           'edge.cdn.test': ['9.9.9.9']}
+CNAMES = {'shop.ex.test': 'edge.cdn.test', 'cdn.ex.test': 'edge.cdn.test'}
+REAL = ['api.ex.test', 'cdn.ex.test', 'mail.ex.test', 'shop.ex.test', 'www.ex.test']
+
+def scan(server, wordlist, engine, words):
+    hound = ReconHound()
+    hound.engine = engine
+    hound.nameservers = [server.nameserver]
+    hound.dns_types = ['A']
+    quiet(hound.run_subdomain_buster, 'ex.test', wordlist(words), 10)
+    return hound
+
+def random_words(count):
+    return [f"x{random.getrandbits(40):x}" for _ in range(count)]
+
+@pytest.mark.parametrize('engine', ['thread', 'async'])
+def test_rotating_wildcard_filtered(wordlist, engine):
+    # One address of a 29-address pool per answer; mail.ex.test sits in the same /24
+    pool = [f"10.0.0.{i}" for i in range(1, 30)]
+    with MockDNSServer(records=RECORDS, cnames=CNAMES, wildcard=pool, rotate=True) as server:
+        hound = scan(server, wordlist, engine, random_words(1000) + ['www', 'mail', 'api', 'shop', 'cdn'])
+    assert sorted(hound.found_subdomains) == REAL
+
+@pytest.mark.parametrize('engine', ['thread', 'async'])
+def test_fixed_wildcard_filtered(wordlist, engine):
+    with MockDNSServer(records=RECORDS, cnames=CNAMES, wildcard=['10.0.0.1', '10.0.0.2']) as server:
+        hound = scan(server, wordlist, engine, random_words(300) + ['www', 'mail', 'api', 'shop', 'cdn'])
+        queries = server.queries
+    assert sorted(hound.found_subdomains) == REAL
+    # A wildcard that never changes its answer needs no re-checks
+    assert queries < 300 + 5 + 50
+
+def test_cname_wildcard_filtered(wordlist):
+    with MockDNSServer(records=dict(RECORDS, **{'parking.cdn.test': ['7.7.7.7']}), cnames=CNAMES,
+                       wildcard_cname='parking.cdn.test') as server:
+        hound = scan(server, wordlist, 'thread', random_words(100) + ['www', 'mail', 'api', 'shop', 'cdn'])
+    assert sorted(hound.found_subdomains) == REAL
+
+def test_cache_counts_each_lookup_once():
+    with MockDNSServer(records=RECORDS, cnames=CNAMES) as server:
+        hound = ReconHound()
+        hound.nameservers = [server.nameserver]
+        resolver = hound.build_resolver()
+        cache = DNSCache()
+
+        def resolve(name, rdtypes):
+            return resolve_blocking(resolution_steps(cache, name, rdtypes),
+                                    lambda qname, rdtype: resolver.resolve(qname, rdtype, raise_on_no_answer=False).response)
+
+        assert resolve('shop.ex.test', ['A']).addresses == ['9.9.9.9']
+        assert (cache.hits, cache.misses) == (0, 1)
+        assert resolve('shop.ex.test', ['A']).addresses == ['9.9.9.9']
+        assert (cache.hits, cache.misses) == (1, 1)
+        # cdn.ex.test needs its own CNAME link, then finds edge.cdn.test cached
+        assert resolve('cdn.ex.test', ['A']).chain == ['edge.cdn.test']
+        assert (cache.hits, cache.misses) == (1, 2)
+        assert server.queries == 2
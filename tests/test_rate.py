@@ -0,0 +1,129 @@
+# RateController bookkeeping: every slot a request takes must be given back,
+# whatever way the request fails, and async waiters must be woken by release().
+
+import asyncio
+import math
+import threading
+import time
+
+import aiohttp
+import pytest
+import requests
+
+from conftest import quiet
+from mock_http import MockHTTPServer
+from reconhound import HTTPSessionPool, RateController, ReconHound
+
+def scan_hound(engine, adaptive):
+    hound = ReconHound()
+    hound.engine = engine
+    hound.concurrency = 2
+    hound.http = HTTPSessionPool(2)
+    hound.rate = RateController(2, adaptive)
+    hound.calibration = False
+    hound.retries = 0
+    return hound
+
+def run_scan(hound, function, *args, timeout=10):
+    thread = threading.Thread(target=quiet, args=(function, *args), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        # Let whatever waits on a leaked slot through, so the test fails instead of hanging
+        hound.is_running = False
+        with hound.rate.cond:
+            hound.rate.limit = math.inf
+            hound.rate.cond.notify_all()
+        thread.join(timeout)
+        pytest.fail("scan hung")
+
+@pytest.mark.parametrize('adaptive', [False, True])
+def test_unencodable_vhost_releases_slots(wordlist, adaptive):
+    # A word that can't go into a Host header fails before the request is sent;
+    # with --adaptive -t 2 a leaked slot used to hang the scan
+    words = wordlist(['a', '日本', 'b', '日本2', 'c'] * 10)
+    with MockHTTPServer(hits=['b']) as server:
+        hound = scan_hound('thread', adaptive)
+        run_scan(hound, hound.run_vhost_buster, server.url.split('://', 1)[1], 'example.test', words, 2)
+    assert hound.rate.in_flight == 0
+    assert hound.metrics.in_flight == 0
+    assert hound.rate.totals['errors'] == 20
+    assert hound.metrics.errors['other'] == 20
+
+ERRORS = {
+    'network': {'thread': requests.ConnectionError('refused'), 'async': aiohttp.ClientConnectionError('refused')},
+    'encode': UnicodeEncodeError('latin-1', '日本', 0, 1, 'ordinal not in range(256)'),
+    'other': RuntimeError('unexpected'),
+}
+
+@pytest.mark.parametrize('engine', ['thread', 'async'])
+@pytest.mark.parametrize('kind', sorted(ERRORS))
+def test_send_errors_release_slots(wordlist, monkeypatch, engine, kind):
+    error = ERRORS[kind][engine] if isinstance(ERRORS[kind], dict) else ERRORS[kind]
+
+    def fail(*args, **kwargs):
+        raise error
+
+    # The thread engine sends through ReconHound.send, the async one through aiohttp
+    monkeypatch.setattr(ReconHound, 'send', fail)
+    monkeypatch.setattr(aiohttp.ClientSession, 'request', fail)
+    with MockHTTPServer() as server:
+        hound = scan_hound(engine, True)
+        run_scan(hound, hound.run_directory_buster, server.url, wordlist([f"w{i}" for i in range(20)]), None, 2)
+    assert hound.rate.in_flight == 0
+    assert hound.metrics.in_flight == 0
+    assert hound.rate.totals['errors'] == 20
+    assert server.requests == 0
+
+def test_async_waiters_woken_by_release():
+    rate = RateController(1, adaptive=True)
+    rate.limit = 1
+
+    async def scenario():
+        await rate.acquire_async()
+        waiter = asyncio.create_task(rate.acquire_async())
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        start = time.monotonic()
+        rate.release(0.01, 200)
+        await asyncio.wait_for(waiter, 1)
+        return time.monotonic() - start
+
+    assert asyncio.run(scenario()) < 0.05
+    assert rate.in_flight == 1
+
+def test_async_waiters_do_not_spin():
+    # Tasks held back by the limit sleep until a slot frees up instead of polling
+    rate = RateController(1, adaptive=True)
+    rate.limit = 1
+
+    async def scenario():
+        await rate.acquire_async()
+        waiters = [asyncio.create_task(rate.acquire_async()) for _ in range(1000)]
+        cpu = time.process_time()
+        await asyncio.sleep(0.5)
+        spent = time.process_time() - cpu
+        for _ in waiters:
+            rate.release(0.01, 200)
+            await asyncio.sleep(0)
+        await asyncio.wait_for(asyncio.gather(*waiters), 5)
+        return spent
+
+    assert asyncio.run(scenario()) < 0.1
+    assert rate.in_flight == 1
+
+def test_cancelled_waiter_passes_slot_on():
+    rate = RateController(1, adaptive=True)
+    rate.limit = 1
+
+    async def scenario():
+        await rate.acquire_async()
+        first = asyncio.create_task(rate.acquire_async())
+        second = asyncio.create_task(rate.acquire_async())
+        await asyncio.sleep(0.01)
+        first.cancel()
+        rate.release(0.01, 200)
+        await asyncio.wait_for(second, 1)
+
+    asyncio.run(scenario())
+    assert rate.in_flight == 1
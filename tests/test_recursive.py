@@ -0,0 +1,73 @@
+# dir -R: directories found during the scan are queued into it once each, no
+# deeper than --depth, and no URL is ever requested twice.
+
+import collections
+
+import pytest
+
+from conftest import quiet
+from mock_http import MockHTTPServer
+from reconhound import BloomFilter, ReconHound, SeenSet
+
+class Tree(MockHTTPServer):
+    # admin/ holds users/, which holds logs/; directories answer with a redirect to 'dir/'
+    DIRS = {'/admin', '/admin/users', '/admin/users/logs'}
+    PAGES = {'/index', '/admin/index', '/admin/users/index', '/admin/users/logs/index'}
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.paths = collections.Counter()
+
+    def respond(self, method, path, headers):
+        self.paths[path] += 1
+        if path in self.DIRS:
+            return 301, b'', {'Location': path + '/'}
+        if path.rstrip('/') in self.DIRS or path in self.PAGES:
+            return 200, b'found'
+        return 404, b'not found'
+
+# 'admin/' names the same directory the 'admin' redirect leads to, and 'index' is listed twice
+WORDS = ['admin', 'admin/', 'users', 'logs', 'index', 'index'] + [f"w{i}" for i in range(30)]
+
+def scan(wordlist, depth, bloom=None):
+    with Tree() as server:
+        hound = ReconHound()
+        hound.max_depth = depth
+        hound.bloom_size = bloom
+        quiet(hound.run_directory_buster, server.url, wordlist(WORDS), None, 4)
+    found = sorted(entry['url'][len(server.url):] for entry in hound.found_paths)
+    return found, server.paths
+
+@pytest.mark.parametrize('bloom', [None, 1000], ids=['set', 'bloom'])
+def test_every_url_requested_once(wordlist, bloom):
+    found, paths = scan(wordlist, 3, bloom)
+    assert found == ['/admin', '/admin/', '/admin/index', '/admin/users', '/admin/users/index',
+                     '/admin/users/logs', '/admin/users/logs/index', '/index']
+    assert [path for path, count in paths.items() if count > 1] == []
+    # Each directory was scanned once, with the whole wordlist
+    for directory in ('/', '/admin/', '/admin/users/', '/admin/users/logs/'):
+        assert paths[directory + 'w29'] == 1
+
+@pytest.mark.parametrize('depth', [1, 2])
+def test_depth_limit(wordlist, depth):
+    found, paths = scan(wordlist, depth)
+    levels = ['/', '/admin/', '/admin/users/', '/admin/users/logs/']
+    # The target itself is level 0; directories down to --depth are scanned...
+    assert [directory for directory in levels if paths[directory + 'w29']] == levels[:depth + 1]
+    # ...and the ones found one level further down are reported, but not scanned
+    assert [directory for directory in levels[1:] if directory.rstrip('/') in found] == levels[1:depth + 2]
+
+def test_bloom_filter_never_forgets():
+    bloom = BloomFilter(1000)
+    items = [f"http://t/{i}" for i in range(1000)]
+    assert bloom.add(items[0]) and not bloom.add(items[0])
+    for item in items[1:]:
+        bloom.add(item)
+    assert not any(bloom.add(item) for item in items)
+    # New items are only rarely taken for seen ones at capacity
+    wrongly_seen = sum(not bloom.add(f"http://u/{i}") for i in range(200))
+    assert wrongly_seen < 10
+
+def test_seen_set():
+    seen = SeenSet()
+    assert seen.add('a') and not seen.add('a') and seen.add('b')
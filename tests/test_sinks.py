@@ -0,0 +1,110 @@
+# Output sinks: findings streamed to JSON Lines or CSV as they are found, the
+# classic JSON file assembled from its .part file on close, and a resumed scan
+# cutting the output back to the last checkpointed size.
+
+import csv
+import json
+import os
+
+import pytest
+
+from reconhound import CSVSink, JSONLSink, JSONSink
+
+PATHS = [
+    {'url': 'http://t/admin', 'status': 200, 'size': 12},
+    {'url': 'http://t/login', 'status': 403, 'size': 0, 'payload': {'FUZZ2': 'secret'}},
+    {'url': 'http://t/backup', 'status': 301, 'size': 5},
+]
+
+def write(sink, kind, entries, offset=None, final=True):
+    sink.open(kind, offset)
+    for entry in entries:
+        sink.write(entry)
+    position = sink.position()
+    sink.close(final)
+    return position
+
+def test_jsonl_one_line_per_finding(tmp_path):
+    path = str(tmp_path / 'found.jsonl')
+    write(JSONLSink(path), 'paths', PATHS)
+    with open(path) as f:
+        assert [json.loads(line) for line in f] == PATHS
+
+def test_jsonl_subdomains_wrapped(tmp_path):
+    path = str(tmp_path / 'found.jsonl')
+    write(JSONLSink(path), 'subdomains', ['www.ex.test', 'api.ex.test'])
+    with open(path) as f:
+        assert [json.loads(line) for line in f] == [{'subdomain': 'www.ex.test'}, {'subdomain': 'api.ex.test'}]
+
+@pytest.mark.parametrize('first', [0, 1], ids=['plain-first', 'payload-first'])
+def test_csv_columns_fixed_per_kind(tmp_path, first):
+    # Whether or not the first row has a payload, every row lines up under the same header
+    path = str(tmp_path / 'found.csv')
+    entries = PATHS[first:] + PATHS[:first]
+    write(CSVSink(path), 'paths', entries)
+    with open(path, newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ['url', 'status', 'size', 'payload']
+    assert rows[1:] == [[entry['url'], str(entry['status']), str(entry['size']),
+                         json.dumps(entry['payload']) if 'payload' in entry else ''] for entry in entries]
+
+def test_csv_grouped_and_subdomains(tmp_path):
+    path = str(tmp_path / 'found.csv')
+    sink = CSVSink(path)
+    sink.grouped = True
+    write(sink, 'subdomains', [{'target': 'ex.test', 'subdomain': 'www.ex.test'}])
+    with open(path, newline='') as f:
+        assert list(csv.reader(f)) == [['target', 'subdomain'], ['ex.test', 'www.ex.test']]
+
+def test_csv_resume_keeps_single_header(tmp_path):
+    path = str(tmp_path / 'found.csv')
+    offset = write(CSVSink(path), 'paths', PATHS[:2], final=False)
+    write(CSVSink(path), 'paths', PATHS[2:], offset)
+    with open(path, newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ['url', 'status', 'size', 'payload']
+    assert [row[0] for row in rows[1:]] == [entry['url'] for entry in PATHS]
+
+@pytest.mark.parametrize('entries', [PATHS, []], ids=['findings', 'empty'])
+def test_json_part_finalised(tmp_path, entries):
+    path = str(tmp_path / 'found.json')
+    write(JSONSink(path), 'paths', entries)
+    assert not os.path.exists(path + '.part')
+    with open(path) as f:
+        text = f.read()
+    # Byte for byte what json.dump(..., indent=2) writes for the whole list
+    assert text == json.dumps({'paths': entries}, indent=2)
+
+def test_json_subdomains_and_groups(tmp_path):
+    path = str(tmp_path / 'found.json')
+    write(JSONSink(path), 'subdomains', ['www.ex.test'])
+    with open(path) as f:
+        assert json.load(f) == {'subdomains': ['www.ex.test']}
+    sink = JSONSink(path)
+    sink.grouped = True
+    write(sink, 'paths', [dict(PATHS[0], target='http://a'), dict(PATHS[1], target='http://b'),
+                          dict(PATHS[2], target='http://a')])
+    with open(path) as f:
+        assert json.load(f) == {'targets': {'http://a': {'paths': [PATHS[0], PATHS[2]]},
+                                            'http://b': {'paths': [PATHS[1]]}}}
+
+def test_json_part_kept_after_interrupt(tmp_path):
+    # An interrupted scan still writes the JSON file, but keeps the .part for --resume
+    path = str(tmp_path / 'found.json')
+    write(JSONSink(path), 'paths', PATHS[:1], final=False)
+    assert os.path.exists(path + '.part')
+    with open(path) as f:
+        assert json.load(f) == {'paths': PATHS[:1]}
+
+def test_resume_truncates_to_checkpoint(tmp_path):
+    # Findings written after the last checkpoint belong to words that are sent again
+    path = str(tmp_path / 'found.json')
+    sink = JSONSink(path)
+    sink.open('paths')
+    sink.write(PATHS[0])
+    offset = sink.position()
+    sink.write(PATHS[1])
+    sink.close(final=False)
+    write(JSONSink(path), 'paths', PATHS[1:], offset)
+    with open(path) as f:
+        assert json.load(f) == {'paths': PATHS}
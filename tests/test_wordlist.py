@@ -0,0 +1,58 @@
+# Streaming wordlists: words are read lazily, one line at a time, --workers
+# shards split a file into exact, disjoint slices, and the worker pool only
+# ever holds a bounded number of words ahead of the requests.
+
+import random
+import threading
+
+import pytest
+
+from reconhound import ReconHound, iter_words, open_wordlist
+
+def read(path, shard=None):
+    return list(iter_words(open_wordlist(path), shard))
+
+def test_words_are_stripped_and_blank_lines_skipped(tmp_path):
+    path = tmp_path / 'words.txt'
+    path.write_bytes(b'admin\r\n  login \n\n\t\nb\xe4ckup\ncaf\xc3\xa9\nlast')
+    # Lines that aren't UTF-8 are read as latin-1
+    assert read(str(path)) == ['admin', 'login', 'bäckup', 'café', 'last']
+
+@pytest.mark.parametrize('count', [1, 2, 3, 5, 8, 13])
+def test_shards_split_the_file_exactly(tmp_path, count):
+    rng = random.Random(count)
+    words = [''.join(rng.choices('abcdefghij', k=rng.randint(1, 40))) for _ in range(997)]
+    path = tmp_path / 'words.txt'
+    path.write_text('\n'.join(words) + '\n')
+    shards = [read(str(path), (index, count)) for index in range(count)]
+    assert [word for shard in shards for word in shard] == words
+
+def test_more_shards_than_lines(tmp_path):
+    path = tmp_path / 'words.txt'
+    path.write_text('one\ntwo\n')
+    assert [word for index in range(8) for word in read(str(path), (index, 8))] == ['one', 'two']
+
+def test_worker_pool_reads_ahead_a_bounded_number_of_words():
+    hound = ReconHound()
+    hound.threads = 4
+    pulled = 0
+    release = threading.Event()
+
+    def jobs():
+        nonlocal pulled
+        for index in range(100000):
+            pulled += 1
+            yield [(index,)]
+
+    def worker(index):
+        release.wait(5)
+
+    thread = threading.Thread(target=hound.run_workers, args=(worker, jobs()))
+    thread.start()
+    # Every worker is blocked; the queue in front of them is bounded at threads * 4 items
+    threading.Event().wait(0.3)
+    waiting = pulled
+    release.set()
+    thread.join(30)
+    assert waiting <= hound.threads * 4 + 1
+    assert pulled == 100000
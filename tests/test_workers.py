@@ -0,0 +1,48 @@
+# --workers: the wordlist is split between processes whose findings and
+# statistics are merged back into one output and one summary.
+
+import json
+import re
+import subprocess
+import sys
+
+import pytest
+
+from conftest import RECONHOUND
+from mock_dns import MockDNSServer
+from mock_http import MockHTTPServer
+
+WORDS = [f"w{i}" for i in range(300)]
+HITS = WORDS[::30]
+
+def scan(tmp_path, *args):
+    output = tmp_path / 'found.jsonl'
+    result = subprocess.run([sys.executable, RECONHOUND, *args, '-o', str(output), '--format', 'jsonl'],
+                            check=True, capture_output=True, text=True, timeout=60)
+    return result.stdout, [json.loads(line) for line in output.read_text().splitlines()]
+
+@pytest.mark.parametrize('engine', ['thread', 'async'])
+def test_workers_split_and_merge(tmp_path, wordlist, engine):
+    with MockHTTPServer(hits=HITS) as server:
+        out, found = scan(tmp_path, 'dir', '-u', server.url, '-w', wordlist(WORDS), '-t', '4', '--no-calibrate',
+                          '--engine', engine, '--workers', '3')
+        requests = server.requests
+    # Each word is sent by exactly one process, and each hit written once
+    assert requests == len(WORDS)
+    assert sorted(entry['url'] for entry in found) == sorted(f"{server.url}/{word}" for word in HITS)
+    assert f"Total paths found: {len(HITS)}" in out
+    # Only the first process prints the banner
+    assert out.count('ReconHound on') == 1
+
+@pytest.mark.parametrize('engine', ['thread', 'async'])
+def test_workers_merge_dns_cache_stats(tmp_path, wordlist, engine):
+    records = {'edge.cdn.test': ['9.9.9.9']}
+    cnames = {f"{word}.ex.test": 'edge.cdn.test' for word in HITS}
+    with MockDNSServer(records=records, cnames=cnames) as server:
+        host, port = server.nameserver
+        out, found = scan(tmp_path, 'sub', '-d', 'ex.test', '-w', wordlist(WORDS), '-r', f"{host}:{port}",
+                          '--engine', engine, '--workers', '2')
+    assert sorted(entry['subdomain'] for entry in found) == sorted(f"{word}.ex.test" for word in HITS)
+    # The summary counts the lookups of both processes: one per word, plus their calibration probes
+    lookups = int(re.search(r'DNS cache: \d+/(\d+) DNS lookups', out).group(1))
+    assert lookups >= len(WORDS)